@@ -0,0 +1,20 @@
+"""
+    Фонові задачі аналітики (виконуються воркером manage.py run_jobs).
+"""
+
+from django.core.cache import cache
+
+# Назва задачі в черзі apps.jobs
+COLLECT_STATS = "apps.analytics.jobs.collect_stats"
+
+
+def collect_stats():
+    """
+        Створює графіки аналітики та позначає, що вони існують.
+    """
+    # Імпорт тут: модуль тягне pandas, seaborn та matplotlib, які потрібні
+    # лише воркеру, а не веб-процесу, що ставить задачу в чергу
+    from ml.analytics.analytics_creator import get_analytics
+
+    get_analytics()
+    cache.set("graphics_exists", True, None)
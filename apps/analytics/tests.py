@@ -1,3 +1,73 @@
-from django.test import TestCase
+import os
+import tempfile
 
-# Create your tests here.
+import pandas as pd
+from django.conf import settings
+from django.test import TestCase, override_settings
+
+from ml.analytics import cache
+from ml.analytics.rendering import GRAPHS, render_graphs
+from ml.cleaning import clean_applications
+
+from .models import AnalyticGraph
+
+
+def load_dataset():
+    df = clean_applications(
+        pd.read_csv(os.path.join(settings.BASE_DIR, "ml", "loan_data.csv"))
+    )
+    df["Loan_Status_Binary"] = df["Loan_Status"].map({"Y": 1, "N": 0})
+    df["Total_Income"] = df["ApplicantIncome"] + df["CoapplicantIncome"]
+    return df
+
+
+class RenderGraphsTests(TestCase):
+    """
+        Паралельний рендеринг графіків аналітики та кеш результатів.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.output_dir = os.path.join(self.directory.name, "plots")
+        os.makedirs(self.output_dir)
+
+    @override_settings(ANALYTICS_CACHE_DIR="")
+    def test_pool_renders_all_graphs_and_saves_rows_in_parent(self):
+        timings = render_graphs(load_dataset(), self.output_dir, "plots", processes=2)
+
+        self.assertEqual(set(timings), set(GRAPHS))
+        self.assertEqual(len(os.listdir(self.output_dir)), len(GRAPHS))
+        self.assertEqual(AnalyticGraph.objects.count(), len(GRAPHS))
+        self.assertTrue(
+            AnalyticGraph.objects.get(name="correlation_bar").image_path.startswith(
+                "plots/"
+            )
+        )
+
+    def test_cache_rerenders_only_graphs_with_changed_inputs(self):
+        df = load_dataset()
+        with self.settings(
+            ANALYTICS_CACHE_DIR=os.path.join(self.directory.name, "cache")
+        ):
+            render_graphs(df, self.output_dir, "plots", processes=2)
+            os.remove(os.path.join(self.output_dir, "05_property_area.png"))
+            AnalyticGraph.objects.all().delete()
+
+            self.assertEqual(render_graphs(df, self.output_dir, "plots"), {})
+            self.assertEqual(len(os.listdir(self.output_dir)), len(GRAPHS))
+            self.assertEqual(AnalyticGraph.objects.count(), len(GRAPHS))
+
+            df.loc[0, "Property_Area"] = (
+                "Semiurban" if df.loc[0, "Property_Area"] != "Semiurban" else "Urban"
+            )
+            timings = render_graphs(df, self.output_dir, "plots", processes=1)
+            self.assertEqual(
+                set(timings),
+                {"property_area_graph", "chi_square_graph", "mutual_score_graph"},
+            )
+            key = cache.graph_key("chi_square_graph", df)
+            self.assertEqual(
+                list(cache.load_stats("chi_square_graph", key).columns),
+                ["Feature", "Chi2", "P-value"],
+            )
@@ -6,5 +6,6 @@ app_name = "analytics"
 urlpatterns = [
     path("", views.analytics, name="main"),
     path("collect-stats/", views.collect_stats_view, name="collect_stats"),
+    path("jobs/<int:job_id>/", views.job_status_view, name="job_status"),
     path("<slug:graph>/", views.AnalyticGraphDetailView.as_view(), name="graph-detail"),
 ]
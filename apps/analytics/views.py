@@ -1,11 +1,14 @@
-from django.core.cache import cache
-from django.shortcuts import render
+from django.shortcuts import get_object_or_404, render
 from django.http import JsonResponse
+from django.urls import reverse
 from django.views.generic import DetailView
 
+from . import jobs
 from . import models
 
-from ml.analytics.analytics_creator import get_analytics
+from apps.jobs import queue
+from apps.jobs.models import Job
+from core import db_router
 
 
 def analytics(request):
@@ -40,34 +43,73 @@ class AnalyticGraphDetailView(DetailView):
     slug_field = "name"
     slug_url_kwarg = "graph"
 
+    def get_queryset(self):
+        """
+            Читає графіки з репліки бази (див. core.db_router).
+
+            Returns:
+                QuerySet: Набір графіків аналітики
+        """
+        return models.AnalyticGraph.objects.using(db_router.reporting_db())
+
 
 def collect_stats_view(request):
     """
-        Представлення для збору статистики та генерації графіків аналітики.
+        Представлення для запуску збору статистики та генерації графіків аналітики.
 
-        Обробляє POST-запити для створення графіків аналітики через функцію get_analytics().
-        При успішному створенні оновлює кеш та повертає JSON-відповідь.
+        Обробляє POST-запити: ставить задачу collect_stats у чергу фонових
+        задач (apps.jobs) і одразу повертає її ідентифікатор. Графіки
+        створює воркер manage.py run_jobs, а сторінка опитує job_status_view.
+        Повторний запуск під час виконання повертає ту саму задачу.
 
         Args:
             request: HTTP-запит
 
         Returns:
             JsonResponse: JSON-відповідь зі статусом операції:
-                - success: Графіки успішно створені
-                - error: Виникла помилка при створенні або невірний тип запиту
+                - queued/running: Задача в черзі або виконується (поля job та status_url)
+                - error: Невірний тип запиту
     """
     if request.method == "POST":
-        try:
-            get_analytics()
-            cache.set("graphics_exists", True, None)
-            return JsonResponse(
-                {"status": "success", "message": "Графіки аналітики успішно створені!"}
-            )
-        except:
-            return JsonResponse(
-                {
-                    "status": "error",
-                    "message": "Щось пішло не так при створенні графіків!",
-                }
-            )
+        job, _ = queue.enqueue(jobs.COLLECT_STATS)
+        return JsonResponse(
+            {
+                "status": job.status,
+                "job": job.id,
+                "status_url": reverse("analytics:job_status", args=[job.id]),
+            },
+            status=202,
+        )
     return JsonResponse({"status": "error", "message": "Невірний запит"})
+
+
+def job_status_view(request, job_id):
+    """
+        Повертає статус задачі створення графіків аналітики.
+
+        Args:
+            request: HTTP-запит
+            job_id (int): Ідентифікатор задачі
+
+        Returns:
+            JsonResponse: JSON-відповідь зі статусом задачі:
+                - queued/running: Задача ще не завершена
+                - success: Графіки аналітики успішно створені
+                - error: Виникла помилка при створенні графіків
+
+        Raises:
+            Http404: Якщо задачу не знайдено
+    """
+    job = get_object_or_404(Job, id=job_id)
+    if job.status == Job.SUCCEEDED:
+        return JsonResponse(
+            {"status": "success", "message": "Графіки аналітики успішно створені!"}
+        )
+    if job.status == Job.FAILED:
+        return JsonResponse(
+            {
+                "status": "error",
+                "message": "Щось пішло не так при створенні графіків!",
+            }
+        )
+    return JsonResponse({"status": job.status, "job": job.id})
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.api"
+
+    def ready(self):
+        from core import db_pool
+        from ml import metrics
+
+        metrics.register(db_pool.PoolMetrics())
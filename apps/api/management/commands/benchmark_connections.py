@@ -0,0 +1,71 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.signals import request_finished, request_started
+from django.db import connections
+
+from apps.credits.models import PredictionConfig
+
+from .benchmark_predictions import measure
+
+# Параметри бази для кожного способу отримання з'єднання (поверх DATABASES[alias])
+MODES = {
+    "connect": {"CONN_MAX_AGE": 0, "OPTIONS": {}},
+    "persistent": {"CONN_MAX_AGE": 600, "OPTIONS": {}},
+    "pool": {"CONN_MAX_AGE": 0, "OPTIONS": {"pool": {"min_size": 1, "max_size": 2}}},
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare per-request database latency with a new connection per "
+        "request, persistent connections and the psycopg connection pool"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default")
+        parser.add_argument("--iterations", type=int, default=500)
+        parser.add_argument("--output", help="JSON file for results")
+
+    def handle(self, *args, **options):
+        database = options["database"]
+        if connections[database].vendor != "postgresql":
+            raise CommandError("Connection pooling requires PostgreSQL")
+
+        results = {}
+        for mode, overrides in MODES.items():
+            alias = f"benchmark_{mode}"
+            connections.settings[alias] = {
+                **connections.settings[database],
+                **overrides,
+            }
+            try:
+                results[mode] = measure(
+                    lambda: self.request(alias), options["iterations"]
+                )
+            finally:
+                connections[alias].close()
+                if mode == "pool":
+                    connections[alias].close_pool()
+                del connections[alias]
+                del connections.settings[alias]
+
+        self.stdout.write(f"{'mode':<16}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        for mode, result in results.items():
+            self.stdout.write(
+                f"{mode:<16}{result['p50_ms']:>10.3f}"
+                f"{result['p95_ms']:>10.3f}{result['p99_ms']:>10.3f}"
+            )
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(results, f, indent=2)
+
+    @staticmethod
+    def request(alias: str):
+        """
+            Один цикл запиту Django: отримання з'єднання, запит конфігурації
+            прогнозування та повернення (закриття) з'єднання.
+        """
+        request_started.send(sender=None)
+        PredictionConfig.objects.using(alias).filter(id=1).exists()
+        request_finished.send(sender=None)
@@ -0,0 +1,461 @@
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from itertools import cycle
+
+import joblib
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import (
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+from apps.credits.common import FORMS
+from apps.credits.models import PredictionConfig
+from ml import codes, services
+from ml.compiled import export_compiled
+from ml.data_transform import transform_input
+from ml.prediction import (
+    MODEL_WITH_CH,
+    MODEL_WITHOUT_CH,
+    THRESHOLDS,
+    EnsemblePredictor,
+)
+
+CSV_PATH = os.path.join(settings.BASE_DIR, "ml", "loan_data.csv")
+
+PERCENTILES = (50, 90, 95, 99)
+
+# Кеш для запитів до тестової бази: версія конфігурації (bump_config_version)
+# не потрапляє в спільний файловий кеш воркерів
+LOCAL_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
+
+# Відповідність колонок loan_data.csv полям форм та API
+CSV_FIELDS = {
+    "Gender": "gender",
+    "Married": "married",
+    "Dependents": "dependents",
+    "Education": "education",
+    "Self_Employed": "self_employed",
+    "ApplicantIncome": "applicant_income",
+    "CoapplicantIncome": "coapplicant_income",
+    "LoanAmount": "loan_amount",
+    "Loan_Amount_Term": "loan_amount_term",
+    "Credit_History": "credit_history",
+    "Property_Area": "property_area",
+}
+
+
+def load_records(path: str = CSV_PATH) -> list:
+    """
+        Читає заявки з loan_data.csv у форматі даних форм.
+
+        Рядки з пропущеними значеннями відкидаються, "3+" утриманців
+        перетворюється на 3, категоріальні значення - на коди ml.codes.
+
+        Args:
+            path (str, optional): Шлях до CSV файлу
+
+        Returns:
+            list: Словники з полями заявки (як після валідації форм)
+    """
+    df = pd.read_csv(path).dropna(subset=list(CSV_FIELDS))
+    df["Dependents"] = df["Dependents"].replace("3+", "3").astype(int)
+    df["Loan_Amount_Term"] = df["Loan_Amount_Term"].astype(int)
+    df["Credit_History"] = df["Credit_History"].astype(int)
+    for column, field in codes.FEATURES.items():
+        df[column] = df[column].map(lambda value: codes.encode(field, value))
+    return [
+        {field: row[column] for column, field in CSV_FIELDS.items()}
+        for row in df.to_dict("records")
+    ]
+
+
+def train_models(directory: str) -> tuple:
+    """
+        Навчає пару RandomForest моделей на loan_data.csv.
+
+        Ознаки та препроцесинг повторюють ml/create_models.py, але без
+        підбору гіперпараметрів, тому навчання займає кілька секунд.
+
+        Args:
+            directory (str): Директорія для pkl файлів і скомпільованих масивів
+
+        Returns:
+            tuple: (шлях до моделі з кредитною історією, шлях до моделі без неї)
+    """
+    df = pd.read_csv(CSV_PATH)
+    for col in ("Gender", "Married", "Dependents", "Self_Employed"):
+        df[col] = df[col].fillna(df[col].mode()[0])
+    for col in ("LoanAmount", "Loan_Amount_Term", "Credit_History"):
+        df[col] = df[col].fillna(df[col].median())
+    df["Dependents"] = df["Dependents"].replace("3+", "3").astype(int)
+    y = df["Loan_Status"].map({"Y": 1, "N": 0})
+
+    categorical = ["Gender", "Married", "Education", "Self_Employed", "Property_Area"]
+    numerical = [
+        "ApplicantIncome",
+        "CoapplicantIncome",
+        "LoanAmount",
+        "Loan_Amount_Term",
+        "Dependents",
+    ]
+
+    df["Total_Income"] = df["ApplicantIncome"] + df["CoapplicantIncome"]
+    df["Income_to_Loan"] = df["Total_Income"] / (df["LoanAmount"] + 1)
+    df["Loan_per_Term"] = df["LoanAmount"] / (df["Loan_Amount_Term"] + 1)
+    df["Is_Graduate_and_Employed"] = np.where(
+        (df["Education"] == "Graduate") & (df["Self_Employed"] == "No"), 1, 0
+    )
+    engineered = [
+        "Total_Income",
+        "Income_to_Loan",
+        "Loan_per_Term",
+        "Is_Graduate_and_Employed",
+    ]
+
+    paths = []
+    for name, numeric in (
+        (MODEL_WITH_CH, numerical + ["Credit_History"]),
+        (MODEL_WITHOUT_CH, numerical + engineered),
+    ):
+        pipeline = Pipeline(
+            [
+                (
+                    "preprocessor",
+                    ColumnTransformer(
+                        [
+                            ("num", StandardScaler(), numeric),
+                            (
+                                "cat",
+                                OneHotEncoder(drop="first", sparse_output=False),
+                                categorical,
+                            ),
+                        ]
+                    ),
+                ),
+                ("classifier", RandomForestClassifier(random_state=42)),
+            ]
+        )
+        pipeline.fit(df[numeric + categorical], y)
+        path = os.path.join(directory, os.path.basename(name))
+        joblib.dump(pipeline, path)
+        export_compiled(path, pipeline)
+        paths.append(path)
+    return tuple(paths)
+
+
+def measure(func, iterations: int, warmup: int = 5) -> dict:
+    """
+        Вимірює затримку виклику func.
+
+        Args:
+            func (callable): Функція без аргументів
+            iterations (int): Кількість вимірюваних викликів
+            warmup (int, optional): Кількість прогрівних викликів
+
+        Returns:
+            dict: Кількість викликів, mean/min/max та перцентилі в мілісекундах
+    """
+    for _ in range(warmup):
+        func()
+
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return summarize(samples)
+
+
+def summarize(samples: list) -> dict:
+    """
+        Обчислює статистику затримок.
+
+        Args:
+            samples (list): Тривалості в секундах
+
+        Returns:
+            dict: Кількість вимірів, mean/min/max та перцентилі в мілісекундах
+    """
+    samples = np.asarray(samples) * 1000
+    result = {
+        "iterations": len(samples),
+        "mean_ms": float(samples.mean()),
+        "min_ms": float(samples.min()),
+        "max_ms": float(samples.max()),
+    }
+    for percentile in PERCENTILES:
+        result[f"p{percentile}_ms"] = float(np.percentile(samples, percentile))
+    return result
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark EnsemblePredictor, transform_input and the prediction "
+        "endpoints and write latency percentiles as JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            help="JSON file for results (default: benchmark-<commit>.json)",
+        )
+        parser.add_argument("--iterations", type=int, default=300)
+        parser.add_argument(
+            "--batch-sizes", type=int, nargs="+", default=[1, 10, 100, 1000]
+        )
+        parser.add_argument(
+            "--train",
+            action="store_true",
+            help="Train fresh models on ml/loan_data.csv instead of ml_data",
+        )
+        parser.add_argument(
+            "--skip-endpoints",
+            action="store_true",
+            help="Do not benchmark /api/get_predict/ and the credit wizard",
+        )
+        parser.add_argument(
+            "--compare",
+            help="Previous results; fail if any p50/p95 regressed beyond --tolerance",
+        )
+        parser.add_argument("--tolerance", type=float, default=0.2)
+
+    def handle(self, *args, **options):
+        records = load_records()
+        iterations = options["iterations"]
+
+        with tempfile.TemporaryDirectory() as directory:
+            if options["train"]:
+                started = time.perf_counter()
+                paths = train_models(directory)
+                self.stdout.write(
+                    f"Trained models in {time.perf_counter() - started:.1f}s"
+                )
+            else:
+                paths = (MODEL_WITH_CH, MODEL_WITHOUT_CH)
+            predictor = EnsemblePredictor(*paths)
+
+            results = {}
+            rows = cycle(records)
+            results["transform_input"] = measure(
+                lambda: transform_input(next(rows)), iterations
+            )
+            for mode in THRESHOLDS:
+                results[f"predict.{mode}"] = measure(
+                    lambda: predictor.predict(next(rows), mode), iterations
+                )
+            results["predict.all_modes"] = measure(
+                lambda: predictor.predict(next(rows), all_modes=True), iterations
+            )
+
+            for size in options["batch_sizes"]:
+                batch = [next(rows) for _ in range(size)]
+                result = measure(
+                    lambda: predictor.predict_batch(batch, "mode3"),
+                    max(10, iterations * 10 // (size + 10)),
+                )
+                result["rows_per_second"] = size / (result["p50_ms"] / 1000)
+                results[f"predict_batch.mode3.{size}"] = result
+
+            if not options["skip_endpoints"]:
+                results.update(
+                    self.benchmark_endpoints(predictor, records, iterations)
+                )
+
+        report = {
+            "meta": {
+                "commit": git_commit(),
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "cpu_count": os.cpu_count(),
+                "models": "trained" if options["train"] else predictor.version,
+                "compiled": predictor.fast_B is not None,
+                "debug": settings.DEBUG,
+                "iterations": iterations,
+            },
+            "results": results,
+        }
+
+        output = options["output"]
+        if output is None:
+            output = f"benchmark-{report['meta']['commit'] or 'local'}.json"
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+
+        self.stdout.write(
+            f"{'benchmark':<32}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<32}{result['p50_ms']:>10.3f}"
+                f"{result['p95_ms']:>10.3f}{result['p99_ms']:>10.3f}"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Results written to {output}"))
+
+        if options["compare"]:
+            self.compare(options["compare"], results, options["tolerance"])
+
+    def benchmark_endpoints(self, predictor, records: list, iterations: int) -> dict:
+        """
+            Вимірює повні запити через тестовий клієнт Django.
+
+            Запити виконуються на окремій тестовій базі (як у manage.py test)
+            з локальним кешем, тому робоча база та спільна версія
+            конфігурації в кеші не змінюються.
+
+            Args:
+                predictor (EnsemblePredictor): Предиктор для запитів
+                records (list): Заявки з loan_data.csv
+                iterations (int): Кількість запитів на кожен вимір
+
+            Returns:
+                dict: Результати для /api/get_predict/ та кроку done майстра
+        """
+        results = {}
+        previous = services.ensemble
+        services.ensemble = predictor
+        old_name = connection.settings_dict["NAME"]
+        setup_test_environment(debug=False)
+        try:
+            connection.creation.create_test_db(verbosity=0, autoclobber=True)
+            with override_settings(
+                MODEL_RELOAD_INTERVAL=0, DATABASE_REPLICA="", CACHES=LOCAL_CACHES
+            ):
+                config, _ = PredictionConfig.objects.get_or_create(id=1)
+                user = get_user_model().objects.create_user(
+                    email="benchmark@example.com", username="benchmark"
+                )
+                client = Client()
+                client.force_login(user)
+
+                for mode in THRESHOLDS:
+                    config.active_mode = mode
+                    config.save()
+                    payloads = cycle([self.api_payload(r) for r in records])
+                    results[f"api.get_predict.{mode}"] = measure(
+                        lambda: self.post_api(client, next(payloads)), iterations
+                    )
+                    results[f"wizard.done.{mode}"] = self.measure_wizard(
+                        client, records, mode, max(10, iterations // 10)
+                    )
+        finally:
+            if connection.settings_dict["NAME"] != old_name:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+            services.ensemble = previous
+        return results
+
+    @staticmethod
+    def api_payload(record: dict) -> str:
+        payload = {
+            field: codes.decode(field, value) if field in codes.CODES else value
+            for field, value in record.items()
+        }
+        return json.dumps(payload)
+
+    @staticmethod
+    def post_api(client: Client, payload: str):
+        response = client.post(
+            "/api/get_predict/", payload, content_type="application/json"
+        )
+        if response.status_code != 200:
+            raise CommandError(f"/api/get_predict/ returned {response.status_code}")
+
+    @staticmethod
+    def measure_wizard(
+        client: Client, records: list, mode: str, iterations: int
+    ) -> dict:
+        """
+            Проходить майстер заявки і вимірює лише останній POST (done).
+
+            Args:
+                client (Client): Авторизований тестовий клієнт
+                records (list): Заявки з loan_data.csv
+                mode (str): Активний режим прогнозування
+                iterations (int): Кількість заявок
+
+            Returns:
+                dict: Результат measure для кроку done
+        """
+        steps = [step for step, _ in FORMS]
+        if mode == "mode2":
+            steps.remove("credit_history")
+
+        samples = []
+        for record in cycle(records):
+            if len(samples) == iterations:
+                break
+            client.get("/make_predict/")
+            for i, step in enumerate(steps):
+                data = {
+                    "credit_wizard-current_step": step,
+                    f"{step}-{step}": record[step],
+                }
+                started = time.perf_counter()
+                response = client.post("/make_predict/", data)
+                if i == len(steps) - 1:
+                    samples.append(time.perf_counter() - started)
+            if response.status_code != 200 or "X-Model-Version" not in response:
+                raise CommandError(f"Credit wizard did not finish in {mode}")
+
+        return summarize(samples)
+
+    def compare(self, path: str, results: dict, tolerance: float):
+        """
+            Порівнює результати з попереднім запуском.
+
+            Args:
+                path (str): JSON файл попереднього запуску
+                results (dict): Поточні результати
+                tolerance (float): Допустиме відносне погіршення p50/p95
+
+            Raises:
+                CommandError: Якщо хоча б один вимір погіршився понад tolerance
+        """
+        with open(path) as f:
+            baseline = json.load(f)["results"]
+
+        regressions = []
+        for name, result in results.items():
+            if name not in baseline:
+                continue
+            for key in ("p50_ms", "p95_ms"):
+                change = result[key] / baseline[name][key] - 1
+                if change > tolerance:
+                    regressions.append(f"{name} {key}: {change:+.0%}")
+
+        if regressions:
+            raise CommandError("Regressions:\n" + "\n".join(regressions))
+        self.stdout.write(self.style.SUCCESS(f"No regressions against {path}"))
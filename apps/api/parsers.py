@@ -0,0 +1,28 @@
+from rest_framework.parsers import BaseParser
+
+
+class NDJSONParser(BaseParser):
+    """
+        Парсер для потоку NDJSON (один JSON-об'єкт на рядок).
+
+        Не декодує тіло запиту одразу: повертає лінивий генератор непорожніх
+        рядків, тому великі пакети читаються з потоку поступово, а кожен рядок
+        декодується та валідується незалежно від інших.
+    """
+    media_type = "application/x-ndjson"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """
+            Повертає генератор непорожніх рядків тіла запиту.
+
+            Args:
+                stream: Потік тіла запиту (може бути None для порожнього тіла)
+                media_type (str, optional): Тип вмісту запиту
+                parser_context (dict, optional): Контекст парсера DRF
+
+            Returns:
+                generator: Рядки запиту у вигляді bytes без пробілів по краях
+        """
+        if stream is None:
+            return iter(())
+        return (line.strip() for line in stream if line.strip())
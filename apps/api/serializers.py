@@ -1,7 +1,34 @@
 from rest_framework import serializers
+from ml import codes
 from ml.data_transform import transform_input
 
 
+class CodeChoiceField(serializers.ChoiceField):
+    """
+    Поле вибору категоріального значення заявки з таблиці ml.codes.
+
+    Приймає та повертає текстові значення ("Male", "Urban", ...), а в
+    validated_data передає їх коди, які зберігаються в CreditApplication
+    та використовуються ML моделями без перетворення.
+
+    Example:
+        >>> CodeChoiceField("property_area").to_internal_value("Urban")
+        2
+    """
+
+    def __init__(self, field: str, **kwargs):
+        self.code_field = field
+        super().__init__(choices=codes.CODES[field], **kwargs)
+
+    def to_internal_value(self, data):
+        return codes.encode(self.code_field, super().to_internal_value(data))
+
+    def to_representation(self, value):
+        if isinstance(value, int):
+            value = codes.decode(self.code_field, value)
+        return super().to_representation(value)
+
+
 class UserInfoWithoutCreditHistorySerializer(serializers.Serializer):
     """
     Серіалізатор для даних користувача без кредитної історії (mode2).
@@ -21,37 +48,11 @@ class UserInfoWithoutCreditHistorySerializer(serializers.Serializer):
         loan_amount_term: Термін кредиту в місяцях (мінімум 1)
         property_area: Тип місцевості (Міська/Напівміська/Сільська)
     """
-    GENDER_CHOICES = [
-        ("Male", "Male"),
-        ("Female", "Female"),
-    ]
-
-    MARRIED_CHOICES = [
-        ("Yes", "Yes"),
-        ("No", "No"),
-    ]
-
-    EDUCATION_CHOICES = [
-        ("Graduate", "Graduate"),
-        ("Not Graduate", "Not Graduate"),
-    ]
-
-    SELF_EMPLOYED_CHOICES = [
-        ("Yes", "Yes"),
-        ("No", "No"),
-    ]
-
-    PROPERTY_AREA_CHOICES = [
-        ("Urban", "Urban"),
-        ("Semiurban", "Semiurban"),
-        ("Rural", "Rural"),
-    ]
-
-    gender = serializers.ChoiceField(choices=GENDER_CHOICES)
-    married = serializers.ChoiceField(choices=MARRIED_CHOICES)
+    gender = CodeChoiceField("gender")
+    married = CodeChoiceField("married")
     dependents = serializers.IntegerField(min_value=0)
-    education = serializers.ChoiceField(choices=EDUCATION_CHOICES)
-    self_employed = serializers.ChoiceField(choices=SELF_EMPLOYED_CHOICES)
+    education = CodeChoiceField("education")
+    self_employed = CodeChoiceField("self_employed")
     applicant_income = serializers.DecimalField(
         max_digits=12, decimal_places=2, min_value=0
     )
@@ -60,7 +61,7 @@ class UserInfoWithoutCreditHistorySerializer(serializers.Serializer):
     )
     loan_amount = serializers.DecimalField(max_digits=12, decimal_places=2, min_value=0)
     loan_amount_term = serializers.IntegerField(min_value=1)
-    property_area = serializers.ChoiceField(choices=PROPERTY_AREA_CHOICES)
+    property_area = CodeChoiceField("property_area")
 
     class Meta:
         fields = (
@@ -85,31 +86,11 @@ class UserInfoWithCreditHistorySerializer(UserInfoWithoutCreditHistorySerializer
        з урахуванням кредитної історії.
 
        Додаткові поля:
-           credit_history: Наявність кредитної історії (Так/Ні)
+           credit_history: Наявність кредитної історії (Так/Ні, код 1/0)
     """
-    CREDIT_HISTORY_CHOICES = [
-        ("Yes", "Yes"),
-        ("No", "No"),
-    ]
-    credit_history = serializers.ChoiceField(choices=CREDIT_HISTORY_CHOICES)
+    credit_history = CodeChoiceField("credit_history")
 
     class Meta(UserInfoWithoutCreditHistorySerializer.Meta):
         fields = UserInfoWithoutCreditHistorySerializer.Meta.fields + (
             "credit_history",
         )
-
-    def validate_credit_history(self, value):
-        """
-            Перетворює текстове значення кредитної історії на числове.
-
-            Args:
-                value (str): Значення кредитної історії ("Yes" або "No")
-
-            Returns:
-                float: 1.0 для "Yes", 0.0 для "No"
-        """
-        mapping = {
-            "Yes": 1.0,
-            "No": 0.0,
-        }
-        return mapping[value]
@@ -1,3 +1,1011 @@
-from django.test import TestCase
+import gc
+import json
+import os
+import re
+import runpy
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import joblib
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.db import connection
+from django.test import (
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.urls import reverse
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from sklearn.svm import SVC
+
+from apps.api import serializers
+from core import db_pool
+from ml import (
+    batching,
+    codes,
+    compiled,
+    data_transform,
+    inference_client,
+    metrics,
+    prediction,
+    registry,
+    services,
+)
+from ml.cleaning import clean_applications
+from ml.inference_server import InferenceServer
+from ml.prediction import EnsemblePredictor
+
+ROW = {
+    "gender": "Male",
+    "married": "Yes",
+    "dependents": 0,
+    "education": "Graduate",
+    "self_employed": "No",
+    "applicant_income": "5000.00",
+    "coapplicant_income": "0.00",
+    "loan_amount": "100.00",
+    "loan_amount_term": 360,
+    "credit_history": "Yes",
+    "property_area": "Urban",
+}
+
+
+class FakePredictor:
+    """
+        Схвалює заявки з кредитною історією та запам'ятовує розміри пакетів.
+    """
+
+    version = "test"
+
+    def __init__(self):
+        self.batches = []
+
+    def predict_batch(self, records, method="mode3"):
+        self.batches.append(len(records))
+        predictions = [int(record["credit_history"] == 1) for record in records]
+        return predictions, [float(p) for p in predictions]
+
+
+@override_settings(PREDICTION_BATCH_CHUNK_SIZE=2)
+class PredictBatchTests(TestCase):
+    """
+        Пакетне прогнозування /api/get_predict_batch/.
+    """
+
+    def setUp(self):
+        self.predictor = FakePredictor()
+        for target, value in (
+            ("get_ensemble", self.predictor),
+            ("get_active_mode", "mode1"),
+        ):
+            patcher = mock.patch(f"apps.api.views.{target}", return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.rows = [
+            ROW,
+            {**ROW, "credit_history": "No"},
+            {**ROW, "loan_amount": "-1"},
+            ROW,
+            {**ROW, "credit_history": "No"},
+        ]
+
+    def post(self, body, content_type):
+        response = self.client.post(
+            reverse("api:get_predict_batch"), body, content_type=content_type
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Model-Version"], "test")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        return [json.loads(line) for line in lines]
+
+    def assert_results(self, results):
+        self.assertEqual([result["index"] for result in results], [0, 1, 2, 3, 4])
+        self.assertEqual(
+            [result.get("prediction") for result in results], [1, 0, None, 1, 0]
+        )
+        self.assertIn("errors", results[2])
+        # Невалідний рядок не потрапляє в пакет, чанки не перевищують 2 рядки
+        self.assertEqual(self.predictor.batches, [2, 1, 1])
+
+    def test_json_array(self):
+        results = self.post(json.dumps(self.rows), "application/json")
+        self.assert_results(results)
+        self.assertIn("loan_amount", results[2]["errors"])
+
+    def test_ndjson_stream(self):
+        body = "\n".join(json.dumps(row) for row in self.rows[:2])
+        body += "\n{not json}\n\n"
+        body += "\n".join(json.dumps(row) for row in self.rows[3:])
+        results = self.post(body, "application/x-ndjson")
+        self.assert_results(results)
+        self.assertIn("Invalid JSON", results[2]["errors"]["non_field_errors"][0])
+
+    def test_object_body_is_rejected(self):
+        response = self.client.post(
+            reverse("api:get_predict_batch"), ROW, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+FEATURES = [
+    "Gender",
+    "Married",
+    "Dependents",
+    "Education",
+    "Self_Employed",
+    "ApplicantIncome",
+    "CoapplicantIncome",
+    "LoanAmount",
+    "Loan_Amount_Term",
+    "Credit_History",
+    "Property_Area",
+]
+CATEGORICAL = ["Gender", "Married", "Education", "Self_Employed", "Property_Area"]
+
+
+def load_dataset():
+    df = clean_applications(
+        pd.read_csv(os.path.join(settings.BASE_DIR, "ml", "loan_data.csv"))
+    )
+    return df[FEATURES], df["Loan_Status"].map({"Y": 1, "N": 0})
+
+
+def make_pipeline(classifier, features=FEATURES):
+    """
+        Повертає Pipeline тієї ж структури, що й у ml/create_models.py.
+    """
+    numerical = [f for f in features if f not in CATEGORICAL]
+    preprocessor = ColumnTransformer(
+        transformers=[
+            ("num", StandardScaler(), numerical),
+            ("cat", OneHotEncoder(drop="first", sparse_output=False), CATEGORICAL),
+        ]
+    )
+    return Pipeline([("preprocessor", preprocessor), ("classifier", classifier)])
+
+
+def train_models(directory):
+    """
+        Навчає model_B та model_A на loan_data.csv і зберігає їх у directory.
+
+        Returns:
+            tuple: Шляхи до pkl файлів (model_B, model_A) для EnsemblePredictor
+    """
+    X, y = load_dataset()
+    # Модель A: ознаки без кредитної історії та одна з інженерних ознак
+    features_A = [f for f in FEATURES if f != "Credit_History"]
+    features_A.append("Total_Income")
+    X_A = X.assign(Total_Income=X["ApplicantIncome"] + X["CoapplicantIncome"])
+    paths = []
+    for name, data, features in (("B", X, FEATURES), ("A", X_A, features_A)):
+        pipeline = make_pipeline(LogisticRegression(max_iter=1000), features)
+        paths.append(os.path.join(directory, f"model_{name}.pkl"))
+        joblib.dump(pipeline.fit(data, y), paths[-1])
+    return tuple(paths)
+
+
+def load_records():
+    """
+        Повертає заявки loan_data.csv у форматі форм Django (для predict).
+    """
+    X, _ = load_dataset()
+    return [
+        {field: row[column] for field, column in data_transform.FIELD_COLUMNS.items()}
+        for row in X.to_dict("records")
+    ]
+
+
+class CompiledPipelineTests(SimpleTestCase):
+    """
+        Скомпільовані моделі ml.compiled збігаються з sklearn Pipeline.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.X, cls.y = load_dataset()
+        # Колонки з кодами ml.codes, як після transform_input
+        cls.columns = {col: cls.X[col].to_numpy() for col in FEATURES}
+        for col in CATEGORICAL:
+            field = codes.FEATURES[col]
+            cls.columns[col] = np.array([codes.encode(field, v) for v in cls.X[col]])
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def fit(self, classifier):
+        return make_pipeline(classifier).fit(self.X, self.y)
+
+    def save(self, pipeline, name="model.pkl"):
+        path = os.path.join(self.directory, name)
+        joblib.dump(pipeline, path)
+        return path
+
+    def assert_matches(self, fast, pipeline):
+        expected = pipeline.predict_proba(self.X)
+        self.assertLess(np.abs(fast.predict_proba(self.X) - expected).max(), 1e-9)
+        self.assertLess(np.abs(fast.predict_proba(self.columns) - expected).max(), 1e-9)
+
+    def test_probabilities_match_sklearn(self):
+        classifiers = [
+            LogisticRegression(random_state=42, max_iter=1000),
+            RandomForestClassifier(n_estimators=50, random_state=42),
+            GradientBoostingClassifier(random_state=42),
+            SVC(random_state=42, probability=True),
+        ]
+        for classifier in classifiers:
+            with self.subTest(type(classifier).__name__):
+                pipeline = self.fit(classifier)
+                self.assert_matches(compiled.compile_pipeline(pipeline), pipeline)
+
+                # Масиви, збережені на диск і відкриті через mmap
+                path = self.save(pipeline)
+                self.assertTrue(compiled.export_compiled(path, pipeline))
+                loaded = compiled.load_compiled(
+                    compiled.compiled_path(path),
+                    source=compiled.artifact_version(path),
+                )
+                self.assert_matches(loaded, pipeline)
+
+    def test_stale_arrays_are_recompiled_in_memory(self):
+        pipeline = self.fit(LogisticRegression(random_state=42, max_iter=1000))
+        path = self.save(pipeline)
+        arrays = compiled.compiled_path(path)
+        compiled.save_compiled(
+            compiled.compile_pipeline(pipeline), arrays, source="stale"
+        )
+        source = compiled.artifact_version(path)
+        self.assertIsNone(compiled.load_compiled(arrays, source=source))
+
+        predictor = EnsemblePredictor(path, path)
+        self.assertNotIsInstance(predictor.fast_B.preprocessor.mean, np.memmap)
+        self.assert_matches(predictor.fast_B, pipeline)
+
+        compiled.export_compiled(path, pipeline)
+        predictor = EnsemblePredictor(path, path)
+        self.assertIsInstance(predictor.fast_B.preprocessor.mean, np.memmap)
+
+    def test_uncompilable_model_falls_back_to_sklearn(self):
+        pipeline = self.fit(KNeighborsClassifier())
+        path = self.save(pipeline)
+        with self.assertRaises(ValueError):
+            compiled.compile_pipeline(pipeline)
+        self.assertFalse(compiled.export_compiled(path, pipeline))
+
+        with self.assertLogs("ml.prediction", "WARNING"):
+            predictor = EnsemblePredictor(path, path)
+        self.assertIsNone(predictor.fast_B)
+        np.testing.assert_allclose(
+            predictor._score("B", self.columns),
+            pipeline.predict_proba(self.X)[:, 1],
+        )
+
+
+class EnsemblePredictorTests(SimpleTestCase):
+    """
+        Пакетне прогнозування EnsemblePredictor на навчених моделях.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.directory = tempfile.mkdtemp()
+        cls.paths = train_models(cls.directory)
+        # Масиви поруч з pkl, як у ml.registry.publish: sklearn моделі не
+        # завантажуються для компіляції
+        for path in cls.paths:
+            compiled.export_compiled(path)
+        cls.records = load_records()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+        super().tearDownClass()
+
+    def test_batch_matches_sequential_predict(self):
+        predictor = EnsemblePredictor(*self.paths)
+        # Пакет більший за COMPILED_MAX_ROWS оцінюється sklearn моделями
+        self.assertGreater(len(self.records), prediction.COMPILED_MAX_ROWS)
+        for mode in prediction.THRESHOLDS:
+            for records in (self.records[:10], self.records):
+                with self.subTest(mode=mode, rows=len(records)):
+                    preds, probs = predictor.predict_batch(records, mode)
+                    self.assertEqual(
+                        preds.tolist(), [predictor.predict(r, mode) for r in records]
+                    )
+                    expected = [
+                        predictor.predict(r, all_modes=True)[mode]["probability"]
+                        for r in records
+                    ]
+                    np.testing.assert_allclose(probs, expected, rtol=0, atol=1e-9)
+
+
+    @override_settings(INFERENCE_SOCKET="", PREDICTION_CACHE_SIZE=0)
+    def test_preload_loads_sklearn_models(self):
+        self.addCleanup(setattr, services, "ensemble", None)
+        self.addCleanup(gc.unfreeze)
+        services.ensemble = None
+        with (
+            mock.patch("ml.registry.resolve", return_value=("v-test", *self.paths)),
+            self.assertLogs("ml.services", "INFO"),
+        ):
+            predictor = services.preload_ensemble()
+        self.assertEqual(set(predictor._models), {"A", "B"})
+
+        # Пакети понад COMPILED_MAX_ROWS не завантажують моделі у воркері
+        with mock.patch("ml.prediction.joblib.load") as load:
+            for mode in prediction.THRESHOLDS:
+                predictor.predict_batch(self.records, mode)
+        load.assert_not_called()
+
+
+@override_settings(PREDICTION_CACHE_SIZE=0, PREDICTION_BATCH_WAIT_MS=0)
+class GetPredictTests(TestCase):
+    """
+        Ендпоінт /api/get_predict/ з навченими моделями.
+    """
+
+    STAGES = (
+        "parse",
+        "config",
+        "validate",
+        "predict",
+        "total",
+        "transform",
+        "frame",
+        "model_B",
+    )
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.directory = tempfile.mkdtemp()
+        cls.predictor = EnsemblePredictor(
+            *train_models(cls.directory), version="v-test"
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.mode = "mode1"
+        patcher = mock.patch("apps.api.views.get_ensemble", return_value=self.predictor)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch(
+            "apps.api.views.get_active_mode", side_effect=lambda: self.mode
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post(self, data=ROW, query=""):
+        return self.client.post(
+            reverse("api:get_predict") + query,
+            json.dumps(data),
+            content_type="application/json",
+        )
+
+    def stage_counts(self, mode):
+        body = self.client.get(reverse("api:metrics")).content.decode()
+        counts = {}
+        for stage in self.STAGES:
+            series = "prediction_stage_seconds_count{" + ",".join(
+                [metrics.label("stage", stage), metrics.label("mode", mode)]
+            )
+            match = re.search(rf"^{re.escape(series)}}} (\d+)$", body, re.MULTILINE)
+            counts[stage] = int(match[1]) if match else 0
+        return counts
+
+    def test_stage_latency_is_exported(self):
+        before = self.stage_counts("mode1")
+        self.assertEqual(self.post().status_code, 200)
+        after = self.stage_counts("mode1")
+        self.assertEqual(after, {stage: before[stage] + 1 for stage in self.STAGES})
+
+        body = self.client.get(reverse("api:metrics")).content.decode()
+        self.assertIn("# TYPE prediction_stage_seconds histogram\n", body)
+        self.assertIn(
+            'prediction_stage_seconds_bucket{stage="parse",mode="mode1",le="+Inf"}',
+            body,
+        )
+
+    def test_invalid_request_records_stages_before_predict(self):
+        before = self.stage_counts("mode1")
+        self.assertEqual(self.post({**ROW, "loan_amount": "-1"}).status_code, 400)
+        after = self.stage_counts("mode1")
+        for stage in ("parse", "config", "validate", "total"):
+            self.assertEqual(after[stage], before[stage] + 1)
+        self.assertEqual(after["predict"], before["predict"])
+
+
+    def validated(self, serializer_class=None):
+        serializer_class = (
+            serializer_class or serializers.UserInfoWithCreditHistorySerializer
+        )
+        serializer = serializer_class(data=ROW)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        return serializer.validated_data
+
+    def test_default_response_has_active_mode_only(self):
+        for mode, serializer_class in (
+            ("mode1", serializers.UserInfoWithCreditHistorySerializer),
+            ("mode2", serializers.UserInfoWithoutCreditHistorySerializer),
+        ):
+            with self.subTest(mode=mode):
+                self.mode = mode
+                response = self.post()
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(
+                    response.json(),
+                    {
+                        "prediction": self.predictor.predict(
+                            self.validated(serializer_class), mode
+                        ),
+                        "model_version": "v-test",
+                    },
+                )
+                self.assertEqual(response["X-Model-Version"], "v-test")
+
+        # Без кредитної історії mode2 приймає заявку
+        no_history = {k: v for k, v in ROW.items() if k != "credit_history"}
+        self.assertEqual(self.post(no_history).status_code, 200)
+
+    def test_all_modes_response(self):
+        expected = self.predictor.predict(self.validated(), all_modes=True)
+        for mode in prediction.THRESHOLDS:
+            with self.subTest(mode=mode):
+                self.mode = mode
+                response = self.post(query="?all_modes=true")
+                self.assertEqual(response.status_code, 200)
+                body = response.json()
+                self.assertEqual(set(body), {"prediction", "model_version", "modes"})
+                self.assertEqual(set(body["modes"]), set(prediction.THRESHOLDS))
+                for name, result in body["modes"].items():
+                    self.assertEqual(result, expected[name])
+                    self.assertEqual(
+                        result["prediction"],
+                        int(result["probability"] >= prediction.THRESHOLDS[name]),
+                    )
+                self.assertEqual(body["prediction"], body["modes"][mode]["prediction"])
+                self.assertEqual(body["model_version"], "v-test")
+
+        # Прогноз усіх режимів потребує кредитної історії навіть у mode2
+        self.mode = "mode2"
+        no_history = {k: v for k, v in ROW.items() if k != "credit_history"}
+        response = self.post(no_history, query="?all_modes=true")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("credit_history", response.json())
+
+
+class MetricsFormatTests(SimpleTestCase):
+    """
+        Текстовий формат Prometheus у ml.metrics.
+    """
+
+    def test_label_values_are_escaped(self):
+        self.assertEqual(
+            metrics.label("path", 'C:\\tmp\n"x"'), 'path="C:\\\\tmp\\n\\"x\\""'
+        )
+        histogram = metrics.Histogram("test_seconds", "Test", ("stage",))
+        self.addCleanup(metrics.REGISTRY.remove, histogram)
+        histogram.observe(0.01, 'a"b\n')
+        self.assertIn('test_seconds_count{stage="a\\"b\\n"} 1', histogram.render())
+
+
+class PredictionCacheMetricsTests(TestCase):
+    """
+        Статистика кешу прогнозування на ендпоінті метрик.
+    """
+
+    def setUp(self):
+        # Колектор кешу реєструється при створенні singleton
+        self.addCleanup(
+            metrics.REGISTRY.__setitem__, slice(None), list(metrics.REGISTRY)
+        )
+        self.addCleanup(setattr, services, "prediction_cache", None)
+        services.prediction_cache = None
+
+    @override_settings(PREDICTION_CACHE_SIZE=1, PREDICTION_CACHE_TTL=60)
+    def test_cache_stats_are_exported(self):
+        cache = services.get_prediction_cache()
+        cache.get({"a": 1}, "mode1", "v1")
+        cache.set({"a": 1}, "mode1", "v1", 1)
+        cache.get({"a": 1}, "mode1", "v1")
+        cache.set({"a": 2}, "mode1", "v1", 0)
+
+        body = self.client.get(reverse("api:metrics")).content.decode()
+        for line in (
+            "# TYPE prediction_cache_hits_total counter",
+            "prediction_cache_hits_total 1",
+            "prediction_cache_misses_total 1",
+            "prediction_cache_evictions_total 1",
+            "# TYPE prediction_cache_size gauge",
+            "prediction_cache_size 1",
+            "prediction_cache_max_size 1",
+        ):
+            self.assertIn(line + "\n", body)
+
+
+class PoolMetricsTests(SimpleTestCase):
+    """
+        Реєстрація метрик пулів з'єднань (ApiConfig.ready).
+    """
+
+    def test_registered_once(self):
+        collectors = [c for c in metrics.REGISTRY if isinstance(c, db_pool.PoolMetrics)]
+        self.assertEqual(len(collectors), 1)
+
+
+@skipUnless(settings.DB_POOL and hasattr(os, "fork"), "psycopg pool and os.fork")
+class ConnectionPoolForkTests(TransactionTestCase):
+    """
+        Пули з'єднань у воркерах gunicorn (core/db_pool.py, gunicorn.conf.py).
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.hooks = runpy.run_path(os.path.join(settings.BASE_DIR, "gunicorn.conf.py"))
+
+    def backend_pid(self) -> int:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_backend_pid()")
+            return cursor.fetchone()[0]
+
+    def fork(self, check) -> dict:
+        """
+            Виконує post_fork та check у дочірньому процесі.
+
+            Args:
+                check (callable): Повертає словник, який серіалізується в JSON
+
+            Returns:
+                dict: Результат check або {"error": ...}
+        """
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            try:
+                self.hooks["post_fork"](None, None)
+                result = check()
+            except BaseException as e:
+                result = {"error": repr(e)}
+            with os.fdopen(write_fd, "w") as pipe:
+                json.dump(result, pipe)
+            os._exit(0)
+        os.close(write_fd)
+        with os.fdopen(read_fd) as pipe:
+            result = json.load(pipe)
+        os.waitpid(pid, 0)
+        self.assertNotIn("error", result)
+        return result
+
+    def test_get_stats_reports_pool(self):
+        parent_pid = self.backend_pid()
+        stats = db_pool.get_stats()["default"]
+        self.assertEqual(stats["pool_min"], settings.DB_POOL_MIN_SIZE)
+        self.assertEqual(stats["pool_max"], settings.DB_POOL_MAX_SIZE)
+        self.assertGreaterEqual(stats["pool_size"], 1)
+        self.assertGreaterEqual(stats["requests_num"], 1)
+
+        lines = db_pool.PoolMetrics().render()
+        self.assertIn("# TYPE db_pool_pool_max gauge", lines)
+        self.assertIn(
+            f'db_pool_pool_max{{alias="default"}} {settings.DB_POOL_MAX_SIZE}', lines
+        )
+        self.assertIn("# TYPE db_pool_requests_num_total counter", lines)
+        self.assertEqual(self.backend_pid(), parent_pid)
+
+    def test_pre_fork_closes_pools(self):
+        self.backend_pid()
+        self.assertIn("default", db_pool.get_pools())
+
+        self.hooks["pre_fork"](None, None)
+        self.assertEqual(db_pool.get_pools(), {})
+        self.assertIsNone(connection.connection)
+        # Наступний запит відкриває новий пул
+        self.backend_pid()
+        self.assertIn("default", db_pool.get_pools())
+
+    def test_child_discards_inherited_pool(self):
+        parent_pid = self.backend_pid()
+        parent_pool = db_pool.get_pools()["default"]
+
+        def check():
+            inherited = dict(db_pool.get_pools())
+            pid = self.backend_pid()
+            return {
+                "inherited": list(inherited),
+                "new_pool": db_pool.get_pools()["default"] is not parent_pool,
+                "backend_pid": pid,
+                "requests_num": db_pool.get_stats()["default"]["requests_num"],
+            }
+
+        result = self.fork(check)
+        self.assertEqual(result["inherited"], [])
+        self.assertTrue(result["new_pool"])
+        self.assertNotEqual(result["backend_pid"], parent_pid)
+        self.assertEqual(result["requests_num"], 1)
+
+        # Дочірній процес не закрив з'єднання батьківського
+        self.assertIs(db_pool.get_pools()["default"], parent_pool)
+        self.assertEqual(self.backend_pid(), parent_pid)
+
+
+class GatedPredictor:
+    """
+        Повертає значення заявки; перший виклик у потоці батчера чекає на gate.
+    """
+
+    def __init__(self, fail=False):
+        self.calls = []
+        self.entered = threading.Event()
+        self.gate = threading.Event()
+        self.fail = fail
+
+    def predict_rows(self, rows, method="mode3"):
+        thread = threading.current_thread().name
+        self.calls.append((thread, [row["value"] for row in rows]))
+        if thread == "prediction-batcher" and not self.entered.is_set():
+            self.entered.set()
+            self.gate.wait(5)
+        if self.fail and len(rows) > 1:
+            raise ValueError("model failed")
+        return [row["value"] for row in rows], [row["value"] / 10 for row in rows]
+
+
+class MicroBatcherTests(SimpleTestCase):
+    """
+        Об'єднання одночасних запитів у MicroBatcher.
+    """
+
+    def wait_for(self, condition):
+        deadline = time.monotonic() + 5
+        while not condition():
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.001)
+
+    def run_concurrently(self, batcher, predictor, values):
+        """
+            Перша заявка займає потік батчера, решта стають у чергу.
+
+            Returns:
+                list: Результат або виняток кожної заявки
+        """
+        results = [None] * len(values)
+
+        def call(i):
+            try:
+                row = {"value": values[i]}
+                results[i] = batcher.predict_row(predictor, row, "mode1")
+            except Exception as e:
+                results[i] = e
+
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(len(values))]
+        threads[0].start()
+        self.assertTrue(predictor.entered.wait(5))
+        for thread in threads[1:]:
+            thread.start()
+        self.wait_for(lambda: batcher._queue.qsize() == len(values) - 1)
+        predictor.gate.set()
+        for thread in threads:
+            thread.join(5)
+        return results
+
+    def test_concurrent_calls_share_one_predict_rows_call(self):
+        batcher = batching.MicroBatcher(8, max_wait=0.5, max_queue_size=16)
+        predictor = GatedPredictor()
+        results = self.run_concurrently(batcher, predictor, [1, 0, 1, 1, 0])
+
+        self.assertEqual(results, [(1, 0.1), (0, 0.0), (1, 0.1), (1, 0.1), (0, 0.0)])
+        calls = [sorted(values) for _, values in predictor.calls]
+        self.assertEqual(calls, [[1], [0, 0, 1, 1]])
+
+    def test_exception_reaches_every_request_in_the_group(self):
+        batcher = batching.MicroBatcher(8, max_wait=0.5, max_queue_size=16)
+        results = self.run_concurrently(batcher, GatedPredictor(fail=True), [1, 0, 1])
+
+        self.assertEqual(results[0], (1, 0.1))
+        for result in results[1:]:
+            self.assertIsInstance(result, ValueError)
+
+    def test_full_queue_scores_inline(self):
+        batcher = batching.MicroBatcher(8, max_wait=0.5, max_queue_size=1)
+        predictor = GatedPredictor()
+        overflow = batching.BATCH_OVERFLOW.value
+
+        args = (predictor, {"value": 1})
+        first = threading.Thread(target=batcher.predict_row, args=args)
+        first.start()
+        self.assertTrue(predictor.entered.wait(5))
+        queued = threading.Thread(target=batcher.predict_row, args=args)
+        queued.start()
+        self.wait_for(lambda: batcher._queue.full())
+
+        self.assertEqual(batcher.predict_row(predictor, {"value": 0}), (0, 0.0))
+        self.assertEqual(batching.BATCH_OVERFLOW.value, overflow + 1)
+        self.assertEqual(predictor.calls[-1], (threading.current_thread().name, [0]))
+
+        predictor.gate.set()
+        first.join(5)
+        queued.join(5)
+
+    def test_new_worker_after_fork(self):
+        batcher = batching.MicroBatcher(8, max_wait=0.01, max_queue_size=16)
+        predictor = GatedPredictor()
+        predictor.entered.set()
+        self.assertEqual(batcher.predict_row(predictor, {"value": 1}), (1, 0.1))
+        inherited = batcher._queue
+
+        with mock.patch("ml.batching.os.getpid", return_value=os.getpid() + 1):
+            self.assertEqual(batcher.predict_row(predictor, {"value": 0}), (0, 0.0))
+        self.assertIsNot(batcher._queue, inherited)
+        self.assertEqual(batcher._pid, os.getpid() + 1)
+
+
+class InferenceServerTests(SimpleTestCase):
+    """
+        Клієнт і сервер інференсу через тимчасовий Unix сокет.
+    """
+
+    RECORDS = [
+        services.WARMUP_RECORD,
+        {**services.WARMUP_RECORD, "credit_history": 0.0, "property_area": "Rural"},
+        {**services.WARMUP_RECORD, "self_employed": "Yes", "loan_amount": 600.0},
+    ]
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.directory = tempfile.mkdtemp()
+        cls.predictor = EnsemblePredictor(
+            *train_models(cls.directory), version="v-test"
+        )
+        socket_path = os.path.join(cls.directory, "inference.sock")
+        cls.server = InferenceServer(
+            socket_path,
+            SimpleNamespace(predictor=cls.predictor),
+            batching.MicroBatcher(8, max_wait=0.001, max_queue_size=64),
+        )
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.inference = inference_client.InferenceClient(socket_path, timeout=5)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.inference._close()
+        cls.server.shutdown()
+        cls.server.server_close()
+        shutil.rmtree(cls.directory)
+        super().tearDownClass()
+
+    def test_request_framing_round_trip(self):
+        rows = [
+            {"Gender": 1, "Dependents": None, "LoanAmount": 150.5},
+            {"Property_Area": "Напівміська", "Loan_Amount_Term": -360},
+            {},
+        ]
+        body = inference_client.encode_request(
+            inference_client.OP_PREDICT, "mode2", rows
+        )
+        opcode, mode, decoded = inference_client.decode_request(body)
+        self.assertEqual((opcode, mode), (inference_client.OP_PREDICT, "mode2"))
+        expected = [{f: row.get(f) for f in inference_client.FEATURES} for row in rows]
+        self.assertEqual(decoded, expected)
+
+    def test_results_match_local_predictor(self):
+        self.assertEqual(self.inference.version, "v-test")
+        for mode in inference_client.MODES:
+            with self.subTest(mode):
+                for record in self.RECORDS:
+                    self.assertEqual(
+                        self.inference.predict(record, mode),
+                        self.predictor.predict(record, mode),
+                    )
+                preds, probs = self.inference.predict_batch(self.RECORDS, mode)
+                expected_preds, expected_probs = self.predictor.predict_batch(
+                    self.RECORDS, mode
+                )
+                np.testing.assert_array_equal(preds, expected_preds)
+                np.testing.assert_array_equal(probs, expected_probs)
+
+        for record in self.RECORDS:
+            self.assertEqual(
+                self.inference.predict(record, all_modes=True),
+                self.predictor.predict(record, all_modes=True),
+            )
+
+    def test_client_does_not_import_ml_libraries(self):
+        code = (
+            "import sys, ml.inference_client; "
+            "print(sorted({'pandas', 'sklearn'} & set(sys.modules)))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual(result.stdout.strip(), "[]")
+
+    def test_server_error_keeps_connection_open(self):
+        with self.assertLogs("ml.inference_server", "ERROR"):
+            with self.assertRaisesRegex(inference_client.InferenceError, "opcode"):
+                self.inference._call(99, "mode1", [], 1)
+        self.assertEqual(
+            self.inference.predict(self.RECORDS[0], "mode1"),
+            self.predictor.predict(self.RECORDS[0], "mode1"),
+        )
+
+
+class ModelRegistryTests(SimpleTestCase):
+    """
+        Версійований реєстр ml.registry та гаряча заміна моделей у ml.services.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.models_dir = tempfile.mkdtemp()
+        cls.paths = train_models(cls.models_dir)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.models_dir)
+        super().tearDownClass()
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        patcher = mock.patch.multiple(
+            registry,
+            MODEL_DIR=directory,
+            VERSIONS_DIR=os.path.join(directory, "versions"),
+            CURRENT_FILE=os.path.join(directory, "current"),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        for name, value in (
+            ("ensemble", None),
+            ("_reload_checked_at", 0.0),
+            ("_reloading_version", None),
+        ):
+            self.addCleanup(setattr, services, name, value)
+        services.ensemble = None
+
+    def reload(self, version):
+        """
+            Запускає перевірку покажчика, наче минув MODEL_RELOAD_INTERVAL.
+
+            Returns:
+                Предиктор, який отримав запит під час перевірки
+        """
+        services._reload_checked_at -= settings.MODEL_RELOAD_INTERVAL
+        predictor = services.get_ensemble()
+        for thread in threading.enumerate():
+            if thread.name == f"model-reload-{version}":
+                thread.join(10)
+        return predictor
+
+    def test_publish_and_activate(self):
+        self.assertEqual(registry.publish(*self.paths, version="v1"), "v1")
+        self.assertEqual(registry.current_version(), "v1")
+        registry.publish(*self.paths, version="v2", make_current=False)
+        self.assertEqual(registry.current_version(), "v1")
+        self.assertEqual(registry.list_versions(), ["v1", "v2"])
+        with self.assertRaises(FileExistsError):
+            registry.publish(*self.paths, version="v2")
+
+        registry.activate("v2")
+        version, *paths = registry.resolve()
+        self.assertEqual(version, "v2")
+        self.assertEqual(tuple(paths), registry.version_paths("v2"))
+        self.assertTrue(os.path.isdir(compiled.compiled_path(paths[0])))
+        mode = os.stat(registry.CURRENT_FILE).st_mode & 0o777
+        self.assertEqual(mode, registry.CURRENT_FILE_MODE)
+
+        # Покажчик або замінюється повністю, або лишається попереднім
+        for error, version in ((OSError, "v1"), (FileNotFoundError, "missing")):
+            with self.subTest(version=version):
+                with mock.patch("ml.registry.os.replace", side_effect=OSError):
+                    with self.assertRaises(error):
+                        registry.activate(version)
+                self.assertEqual(registry.current_version(), "v2")
+        self.assertEqual(
+            sorted(os.listdir(registry.MODEL_DIR)), ["current", "versions"]
+        )
+
+    @override_settings(
+        INFERENCE_SOCKET="", PREDICTION_CACHE_SIZE=0, MODEL_RELOAD_INTERVAL=60
+    )
+    def test_version_change_is_picked_up_after_interval(self):
+        registry.publish(*self.paths, version="v1")
+        registry.publish(*self.paths, version="v2", make_current=False)
+        self.assertEqual(services.get_ensemble().version, "v1")
+
+        registry.activate("v2")
+        self.assertEqual(services.get_ensemble().version, "v1")
+        self.assertIsNone(services._reloading_version)
+
+        with self.assertLogs("ml.services", "INFO"):
+            self.reload("v2")
+        self.assertEqual(services.get_ensemble().version, "v2")
+
+    @override_settings(
+        INFERENCE_SOCKET="", PREDICTION_CACHE_SIZE=0, MODEL_RELOAD_INTERVAL=60
+    )
+    def test_requests_keep_old_predictor_until_swap(self):
+        registry.publish(*self.paths, version="v1")
+        old = services.get_ensemble()
+        expected = old.predict_batch([services.WARMUP_RECORD], "mode3")
+        registry.publish(*self.paths, version="v2")
+
+        gate = threading.Event()
+        load = services._load_ensemble
+
+        def slow_load(*args):
+            gate.wait(10)
+            return load(*args)
+
+        with (
+            mock.patch("ml.services._load_ensemble", side_effect=slow_load),
+            self.assertLogs("ml.services", "INFO"),
+        ):
+            services._reload_checked_at -= settings.MODEL_RELOAD_INTERVAL
+            # Поки нова версія завантажується, запити отримують попередню
+            for _ in range(3):
+                self.assertIs(services.get_ensemble(), old)
+            self.assertEqual(services._reloading_version, "v2")
+
+            gate.set()
+            self.reload("v2")
+        new = services.get_ensemble()
+        self.assertEqual(new.version, "v2")
+        self.assertIsNot(new, old)
+        # Запит, що почався на старому предикторі, завершується на ньому
+        self.assertEqual(old.version, "v1")
+        np.testing.assert_array_equal(
+            old.predict_batch([services.WARMUP_RECORD], "mode3"), expected
+        )
+
+    @override_settings(
+        INFERENCE_SOCKET="", PREDICTION_CACHE_SIZE=0, MODEL_RELOAD_INTERVAL=60
+    )
+    def test_failed_load_keeps_old_version(self):
+        registry.publish(*self.paths, version="v1")
+        old = services.get_ensemble()
+        expected = old.predict_batch([services.WARMUP_RECORD], "mode3")
+
+        # Пошкоджена версія: файли є, але не розпаковуються
+        for path in registry.version_paths("broken"):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(b"not a pickle")
+        registry.activate("broken")
+
+        with self.assertLogs("ml.services", "ERROR"):
+            self.reload("broken")
+        self.assertIs(services.get_ensemble(), old)
+        self.assertIsNone(services._reloading_version)
+        np.testing.assert_array_equal(
+            old.predict_batch([services.WARMUP_RECORD], "mode3"), expected
+        )
@@ -5,4 +5,6 @@ app_name = "api"
 
 urlpatterns = [
     path("get_predict/", views.get_predict, name="get_predict"),
+    path("get_predict_batch/", views.get_predict_batch, name="get_predict_batch"),
+    path("metrics/", views.metrics_view, name="metrics"),
 ]
@@ -1,11 +1,44 @@
+import json
+from collections.abc import Iterator
+from itertools import islice
+
+from django.conf import settings
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from rest_framework import status, permissions
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, parser_classes
+from rest_framework.parsers import JSONParser
 from rest_framework.response import Response
 
 
 from . import serializers
-from apps.credits.models import PredictionConfig
-from ml.services import get_ensemble
+from .parsers import NDJSONParser
+from apps.credits.config import get_active_mode
+from ml import metrics
+from ml.services import MODEL_VERSION_HEADER, get_ensemble, predict
+
+
+def get_serializer(data, mode, all_modes=False):
+    """
+        Повертає серіалізатор заявки відповідно до режиму прогнозування.
+
+        У режимі mode2 поле credit_history ігнорується і використовується
+        серіалізатор без кредитної історії. Для прогнозу всіх режимів
+        кредитна історія обов'язкова незалежно від активного режиму.
+
+        Args:
+            data: Дані однієї заявки (зазвичай dict)
+            mode (str): Активний режим прогнозування
+            all_modes (bool, optional): Чи потрібен прогноз усіх режимів
+
+        Returns:
+            Serializer: Незвалідований серіалізатор з переданими даними
+    """
+    if mode == "mode2" and not all_modes:
+        if isinstance(data, dict):
+            data = data.copy()
+            data.pop("credit_history", None)
+        return serializers.UserInfoWithoutCreditHistorySerializer(data=data)
+    return serializers.UserInfoWithCreditHistorySerializer(data=data)
 
 
 @api_view(["POST"])
@@ -22,13 +55,24 @@ def get_predict(request):
             - mode1: Прогнозування з урахуванням кредитної історії
             - mode2: Прогнозування без урахування кредитної історії
 
+        З параметром ?all_modes=true відповідь додатково містить ймовірності
+        та рішення всіх трьох режимів (поле modes), отримані за один прохід
+        моделей. У цьому випадку credit_history обов'язкове в усіх режимах,
+        а prediction - рішення активного режиму.
+
+        Тривалість етапів parse, config, validate, predict та total
+        записується в метрики (див. ml.metrics та ендпоінт metrics).
+
         Args:
             request (Request): HTTP запит з даними заявки у форматі JSON
 
         Returns:
             Response: JSON відповідь з результатом або помилками валідації
-                - 200 OK: {"prediction": <boolean або int>}
+                - 200 OK: {"prediction": <boolean або int>, "model_version": <str>}
+                - 200 OK (all_modes): {"prediction": ..., "model_version": ...,
+                  "modes": {"mode1": {"probability": <float>, "prediction": <int>}, ...}}
                 - 400 BAD REQUEST: {"field_name": ["error message"]}
+                Версія моделей також передається в заголовку X-Model-Version
 
         Example:
             Request (mode1):
@@ -49,20 +93,200 @@ def get_predict(request):
 
             Response:
                 {
-                    "prediction": 1
+                    "prediction": 1,
+                    "model_version": "20250101-120000"
+                }
+
+            Request (усі режими):
+                POST /api/get_predict/?all_modes=true
+
+            Response:
+                {
+                    "prediction": 1,
+                    "model_version": "20250101-120000",
+                    "modes": {
+                        "mode1": {"probability": 0.81, "prediction": 1},
+                        "mode2": {"probability": 0.42, "prediction": 1},
+                        "mode3": {"probability": 0.615, "prediction": 1}
+                    }
                 }
     """
-    predict_mode = PredictionConfig.objects.get(id=1)
+    timer = metrics.StageTimer()
+    data = request.data
+    timer.mark("parse")
+    mode = get_active_mode()
+    timer.mark("config")
+    all_modes = request.query_params.get("all_modes", "").lower() in ("1", "true")
+    serializer = get_serializer(data, mode, all_modes)
+    is_valid = serializer.is_valid()
+    timer.mark("validate")
 
-    if predict_mode.active_mode == "mode2":
-        data = request.data.copy()
-        data.pop("credit_history", None)
-        serializer = serializers.UserInfoWithoutCreditHistorySerializer(data=data)
+    if is_valid:
+        predictor = get_ensemble()
+        prediction = predict(predictor, serializer.validated_data, mode, all_modes)
+        timer.mark("predict")
+        if all_modes:
+            result = {"prediction": prediction[mode]["prediction"], "modes": prediction}
+        else:
+            result = {"prediction": prediction}
+        result["model_version"] = predictor.version
+        response = Response(
+            result,
+            status.HTTP_200_OK,
+            headers={MODEL_VERSION_HEADER: predictor.version},
+        )
     else:
-        serializer = serializers.UserInfoWithCreditHistorySerializer(data=request.data)
+        response = Response(serializer.errors, status.HTTP_400_BAD_REQUEST)
+
+    timer.observe("all" if all_modes else mode)
+    return response
+
+
+def _decode_row(row):
+    """
+        Декодує рядок NDJSON у Python-об'єкт.
+
+        Args:
+            row: bytes/str рядок NDJSON або вже декодований об'єкт JSON-масиву
+
+        Returns:
+            tuple: (дані, помилки) - помилки None, якщо рядок коректний
+    """
+    if not isinstance(row, (bytes, str)):
+        return row, None
+    try:
+        return json.loads(row), None
+    except (ValueError, UnicodeDecodeError) as e:
+        return None, {"non_field_errors": [f"Invalid JSON: {e}"]}
+
+
+def stream_predictions(rows, mode, chunk_size, predictor):
+    """
+        Генерує результати прогнозування у форматі NDJSON.
+
+        Рядки читаються чанками по chunk_size: кожен рядок валідується окремо,
+        а всі валідні рядки чанку оцінюються ансамблем одним викликом
+        predict_batch. Результати віддаються в порядку вхідних рядків одразу
+        після обробки чанку. Увесь потік оцінюється одним предиктором, тому
+        заміна версії моделей під час відповіді на неї не впливає.
 
-    if serializer.is_valid():
-        predict = get_ensemble().predict(serializer.validated_data, predict_mode.active_mode)
-        return Response({"prediction": predict}, status.HTTP_200_OK)
+        Args:
+            rows: Ітерабельний набір рядків (dict або bytes рядки NDJSON)
+            mode (str): Активний режим прогнозування
+            chunk_size (int): Максимальна кількість рядків в одному чанку
+            predictor (EnsemblePredictor): Предиктор для оцінки рядків
 
-    return Response(serializer.errors, status.HTTP_400_BAD_REQUEST)
+        Yields:
+            str: Рядок NDJSON з полями index та prediction або errors
+    """
+    rows = enumerate(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+
+        results = []
+        valid = []
+        for index, row in chunk:
+            data, errors = _decode_row(row)
+            if errors is None:
+                serializer = get_serializer(data, mode)
+                if serializer.is_valid():
+                    valid.append((len(results), serializer.validated_data))
+                else:
+                    errors = serializer.errors
+            results.append({"index": index, "errors": errors})
+
+        if valid:
+            predictions, _ = predictor.predict_batch(
+                [data for _, data in valid], mode
+            )
+            for (position, _), predict in zip(valid, predictions):
+                results[position] = {
+                    "index": results[position]["index"],
+                    "prediction": int(predict),
+                }
+
+        for result in results:
+            yield json.dumps(result) + "\n"
+
+
+@api_view(["POST"])
+@permission_classes([permissions.AllowAny])
+@parser_classes([JSONParser, NDJSONParser])
+def get_predict_batch(request):
+    """
+        API ендпоінт для пакетного прогнозування схвалення кредитних заявок.
+
+        Приймає JSON-масив заявок (application/json) або потік NDJSON
+        (application/x-ndjson, одна заявка на рядок). Кожна заявка валідується
+        незалежно, тому помилка в одному рядку не зупиняє обробку пакету.
+        Валідні заявки оцінюються чанками розміром PREDICTION_BATCH_CHUNK_SIZE,
+        а результати повертаються потоком NDJSON у порядку вхідних рядків.
+
+        Args:
+            request (Request): HTTP запит з масивом заявок або потоком NDJSON
+
+        Returns:
+            StreamingHttpResponse: Потік NDJSON з результатами для кожного рядка
+                - {"index": 0, "prediction": 1}
+                - {"index": 1, "errors": {"field_name": ["error message"]}}
+                Версія моделей передається в заголовку X-Model-Version
+            Response: 400 BAD REQUEST, якщо JSON-тіло не є масивом
+
+        Example:
+            Request:
+                POST /api/get_predict_batch/
+                Content-Type: application/x-ndjson
+
+                {"gender": "Male", "married": "Yes", ...}
+                {"gender": "Female", "married": "No", ...}
+
+            Response:
+                {"index": 0, "prediction": 1}
+                {"index": 1, "prediction": 0}
+    """
+    rows = request.data
+    if not isinstance(rows, (list, Iterator)):
+        return Response(
+            {"non_field_errors": ["Expected a list of items."]},
+            status.HTTP_400_BAD_REQUEST,
+        )
+
+    predictor = get_ensemble()
+    response = StreamingHttpResponse(
+        stream_predictions(
+            rows,
+            get_active_mode(),
+            settings.PREDICTION_BATCH_CHUNK_SIZE,
+            predictor,
+        ),
+        content_type="application/x-ndjson",
+    )
+    response[MODEL_VERSION_HEADER] = predictor.version
+    return response
+
+
+def metrics_view(request):
+    """
+        Ендпоінт метрик у текстовому форматі Prometheus.
+
+        Доступний лише з адрес METRICS_ALLOWED_IPS (за замовчуванням localhost),
+        для інших клієнтів повертає 404. Метрики зберігаються в пам'яті
+        процесу, тому кожен воркер gunicorn віддає власні лічильники та
+        статистику власного пулу з'єднань (core.db_pool).
+
+        Args:
+            request (HttpRequest): HTTP запит
+
+        Returns:
+            HttpResponse: Метрики у форматі text/plain; version=0.0.4
+
+        Raises:
+            Http404: Якщо запит надійшов не з дозволеної адреси
+    """
+    if request.META.get("REMOTE_ADDR") not in settings.METRICS_ALLOWED_IPS:
+        raise Http404
+    return HttpResponse(
+        metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -0,0 +1,62 @@
+import threading
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import PredictionConfig
+
+# Ключ спільного кешу з поточною версією конфігурації прогнозування
+CONFIG_VERSION_KEY = "prediction_config_version"
+
+# Кешована в процесі конфігурація та версія, з якою її прочитано
+_lock = threading.Lock()
+_active_mode = None
+_version = None
+
+
+def get_active_mode() -> str:
+    """
+        Повертає активний режим прогнозування з кешу процесу.
+
+        Режим читається з бази лише тоді, коли версія в спільному кеші
+        (CONFIG_VERSION_KEY) відрізняється від версії, з якою його прочитано.
+        Версію змінює bump_config_version при кожному збереженні конфігурації,
+        тому всі воркери бачать новий режим вже з наступного запиту без
+        опитування таблиці.
+
+        Returns:
+            str: Активний режим ("mode1", "mode2" або "mode3")
+
+        Example:
+            >>> get_active_mode()
+            'mode1'
+    """
+    global _active_mode, _version
+    version = cache.get(CONFIG_VERSION_KEY)
+    if version is None:
+        cache.add(CONFIG_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(CONFIG_VERSION_KEY)
+
+    if version != _version or _active_mode is None:
+        # Версія читається до запиту в базу: зміна, збережена між ними,
+        # змінить версію ще раз, і режим буде перечитано наступним запитом
+        config, _ = PredictionConfig.objects.get_or_create(id=1)
+        with _lock:
+            _active_mode, _version = config.active_mode, version
+    return _active_mode
+
+
+def bump_config_version():
+    """
+        Змінює версію конфігурації в спільному кеші.
+
+        Версія змінюється одразу (щоб поточна транзакція бачила новий режим)
+        і повторно після коміту, щоб воркери, які встигли прочитати старе
+        значення до коміту, перечитали його.
+    """
+    def bump():
+        cache.set(CONFIG_VERSION_KEY, uuid.uuid4().hex, None)
+
+    bump()
+    transaction.on_commit(bump)
@@ -1,6 +1,6 @@
 import django_filters
 from django.utils import timezone
-from datetime import timedelta
+from datetime import date, datetime, time, timedelta
 from django import forms
 from .models import CreditApplication
 
@@ -46,6 +46,10 @@ class OrderFilter(django_filters.FilterSet):
         """
             Фільтрує queryset за вибраним часовим періодом.
 
+            Кожен період - напіввідкритий інтервал [start, end) у поточному
+            часовому поясі (див. period_range), тому PostgreSQL може
+            використати індекси за created_at.
+
             Args:
                 queryset: Набір об'єктів для фільтрації
                 name: Назва поля фільтру
@@ -54,27 +58,55 @@ class OrderFilter(django_filters.FilterSet):
             Returns:
                 QuerySet: Відфільтрований набір кредитних заявок
         """
-        now = timezone.now()
-
-        if value == "today":
-            return queryset.filter(created_at__date=now.date())
-        elif value == "yesterday":
-            return queryset.filter(created_at__date=(now - timedelta(days=1)).date())
-        elif value == "week":
-            start_of_week = now - timedelta(days=now.weekday())
-            end_of_week = start_of_week + timedelta(days=6)
-            return queryset.filter(
-                created_at__date__gte=start_of_week.date(),
-                created_at__date__lte=end_of_week.date(),
-            )
-        elif value == "month":
-            return queryset.filter(
-                created_at__month=now.month, created_at__year=now.year
-            )
-        elif value == "last_month":
-            return queryset.filter(
-                created_at__month=now.month - 1, created_at__year=now.year
-            )
-        elif value == "year":
-            return queryset.filter(created_at__year=now.year)
-        return queryset
+        bounds = period_range(value)
+        if bounds is None:
+            return queryset
+        start, end = bounds
+        return queryset.filter(created_at__gte=start, created_at__lt=end)
+
+
+def period_range(value: str, now: datetime = None):
+    """
+        Обчислює межі періоду OrderFilter.PERIOD_CHOICES.
+
+        Межі - опівночі у поточному часовому поясі Django, тому день,
+        тиждень (з понеділка), місяць і рік збігаються з локальним календарем,
+        в тому числі під час переходу на літній час.
+
+        Args:
+            value (str): Значення періоду (today, yesterday, week, month, last_month, year)
+            now (datetime, optional): Поточний час. За замовчуванням timezone.now()
+
+        Returns:
+            tuple | None: (start, end) - aware datetime, end не входить у період;
+                None для "all" та невідомих значень
+
+        Example:
+            >>> period_range("last_month", now=datetime(2025, 1, 15, tzinfo=UTC))
+            (datetime(2024, 12, 1, 0, 0, tzinfo=UTC), datetime(2025, 1, 1, 0, 0, tzinfo=UTC))
+    """
+    today = timezone.localdate(now or timezone.now())
+
+    if value == "today":
+        start, end = today, today + timedelta(days=1)
+    elif value == "yesterday":
+        start, end = today - timedelta(days=1), today
+    elif value == "week":
+        start = today - timedelta(days=today.weekday())
+        end = start + timedelta(days=7)
+    elif value == "month":
+        start = today.replace(day=1)
+        end = (start + timedelta(days=32)).replace(day=1)
+    elif value == "last_month":
+        end = today.replace(day=1)
+        start = (end - timedelta(days=1)).replace(day=1)
+    elif value == "year":
+        start = today.replace(month=1, day=1)
+        end = start.replace(year=start.year + 1)
+    else:
+        return None
+    return _midnight(start), _midnight(end)
+
+
+def _midnight(day: date) -> datetime:
+    return timezone.make_aware(datetime.combine(day, time.min))
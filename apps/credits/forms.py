@@ -1,6 +1,7 @@
 from django import forms
 from django.core.validators import MinValueValidator, MaxValueValidator
 from decimal import Decimal
+from ml import codes
 from .models import PredictionConfig, CreditApplication
 
 
@@ -11,7 +12,7 @@ class Step1Form(forms.Form):
         Поля:
             gender: Стать заявника (Чоловік/Жінка)
     """
-    gender = forms.ChoiceField(
+    gender = forms.TypedChoiceField(
         label="Gender",
         required=True,
         widget=forms.Select(
@@ -21,10 +22,8 @@ class Step1Form(forms.Form):
                 "placeholder": " ",
             }
         ),
-        choices=[
-            ("Male", "Male"),
-            ("Female", "Female"),
-        ],
+        choices=codes.choices("gender", ["Male", "Female"]),
+        coerce=int,
     )
 
 
@@ -35,7 +34,7 @@ class Step2Form(forms.Form):
        Поля:
            married: Сімейний стан (Одружений/Неодружений)
     """
-    married = forms.ChoiceField(
+    married = forms.TypedChoiceField(
         label="Married",
         required=True,
         widget=forms.Select(
@@ -45,10 +44,8 @@ class Step2Form(forms.Form):
                 "placeholder": " ",
             }
         ),
-        choices=[
-            ("Yes", "Yes"),
-            ("No", "No"),
-        ],
+        choices=codes.choices("married", ["Yes", "No"]),
+        coerce=int,
     )
 
 
@@ -76,7 +73,7 @@ class Step4Form(forms.Form):
        Поля:
            education: Рівень освіти (Випускник/Не випускник)
     """
-    education = forms.ChoiceField(
+    education = forms.TypedChoiceField(
         label="Education",
         required=True,
         widget=forms.Select(
@@ -86,10 +83,8 @@ class Step4Form(forms.Form):
                 "placeholder": " ",
             }
         ),
-        choices=[
-            ("Graduate", "Graduate"),
-            ("Not Graduate", "Not Graduate"),
-        ],
+        choices=codes.choices("education", ["Graduate", "Not Graduate"]),
+        coerce=int,
     )
 
 
@@ -100,7 +95,7 @@ class Step5Form(forms.Form):
         Поля:
             self_employed: Чи є заявник самозайнятим (Так/Ні)
     """
-    self_employed = forms.ChoiceField(
+    self_employed = forms.TypedChoiceField(
         label="Self Employed",
         required=True,
         widget=forms.Select(
@@ -110,10 +105,8 @@ class Step5Form(forms.Form):
                 "placeholder": " ",
             }
         ),
-        choices=[
-            ("Yes", "Yes"),
-            ("No", "No"),
-        ],
+        choices=codes.choices("self_employed", ["Yes", "No"]),
+        coerce=int,
     )
 
 
@@ -215,16 +208,16 @@ class Step10Form(forms.Form):
         Форма десятого кроку: вказання кредитної історії.
 
         Поля:
-            credit_history: Наявність кредитної історії (1.0 - є, 0.0 - немає)
+            credit_history: Наявність кредитної історії (1 - є, 0 - немає)
     """
     credit_history = forms.TypedChoiceField(
         label="Credit History",
         required=True,
         choices=[
-            (1.0, "You have credit history"),
-            (0.0, "You have not credit history"),
+            (codes.encode("credit_history", "Yes"), "You have credit history"),
+            (codes.encode("credit_history", "No"), "You have not credit history"),
         ],
-        coerce=float,
+        coerce=int,
         widget=forms.Select(
             attrs={
                 "class": "form-control text-center",
@@ -242,7 +235,7 @@ class Step11Form(forms.Form):
         Поля:
             property_area: Тип місцевості (Сільська/Міська/Напівміська)
     """
-    property_area = forms.ChoiceField(
+    property_area = forms.TypedChoiceField(
         label="Property Area",
         required=True,
         widget=forms.Select(
@@ -252,11 +245,8 @@ class Step11Form(forms.Form):
                 "placeholder": " ",
             }
         ),
-        choices=[
-            ("Rural", "Rural"),
-            ("Urban", "Urban"),
-            ("Semiurban", "Semiurban"),
-        ],
+        choices=codes.choices("property_area", ["Rural", "Urban", "Semiurban"]),
+        coerce=int,
     )
 
 
@@ -0,0 +1,195 @@
+"""
+    Пакетний імпорт заявок з CSV файлів у форматі ml/loan_data.csv.
+
+    Файл читається частинами двічі: перший прохід рахує значення для
+    заповнення пропусків (мода та медіана всього файлу, як у
+    get_analytics), другий очищує кожну частину, оцінює її одним викликом
+    predict_batch і завантажує в таблицю заявок через COPY (PostgreSQL) або
+    bulk_create (інші СУБД). Кожна частина разом з оновленням лічильників
+    ApprovalStats зберігається в окремій транзакції.
+
+    Usage:
+        python manage.py import_applications partner.csv --user admin@example.com
+"""
+
+import io
+import time
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+from django.db import connection, transaction
+from django.utils import timezone
+
+from ml import codes
+from ml.cleaning import CATEGORICAL_COLUMNS, clean_applications, fill_values
+from ml.data_transform import FIELD_COLUMNS
+
+from . import stats
+from .models import CreditApplication
+from .partitioning import copy_stream
+
+CHUNK_SIZE = 10000
+
+# Межі числових полів заявки (DecimalField(max_digits=12, decimal_places=2))
+MAX_AMOUNT = 10**10
+AMOUNT_FIELDS = ["applicant_income", "coapplicant_income", "loan_amount"]
+INTEGER_FIELDS = ["dependents", "loan_amount_term"]
+
+
+def read_chunks(path: str, chunk_size: int = CHUNK_SIZE):
+    """
+        Читає CSV файл частинами.
+
+        Категоріальні колонки читаються як рядки, тому "3+" утриманців не
+        змінює тип колонки між частинами.
+
+        Args:
+            path (str): Шлях до CSV файлу
+            chunk_size (int, optional): Кількість рядків у частині
+
+        Returns:
+            Iterator[pd.DataFrame]: Частини файлу
+    """
+    return pd.read_csv(
+        path, chunksize=chunk_size, dtype={col: str for col in CATEGORICAL_COLUMNS}
+    )
+
+
+def prepare_chunk(df: pd.DataFrame, fill: dict) -> tuple:
+    """
+        Очищує частину файлу та перетворює її на поля CreditApplication.
+
+        Категоріальні значення перетворюються на коди ml.codes. Рядки з
+        невідомими категоріями, нечисловими або від'ємними значеннями
+        відкидаються.
+
+        Args:
+            df (pd.DataFrame): Частина файлу у форматі loan_data.csv
+            fill (dict): Значення для пропусків (fill_values)
+
+        Returns:
+            tuple: (DataFrame з полями заявки, кількість відкинутих рядків)
+    """
+    df = clean_applications(df, fill)
+    data = pd.DataFrame(index=df.index)
+    for field, column in FIELD_COLUMNS.items():
+        if field in codes.CODES and field != "credit_history":
+            index = {label: code for code, label in codes.choices(field)}
+            data[field] = df[column].map(index)
+        else:
+            data[field] = pd.to_numeric(df[column], errors="coerce")
+
+    valid = data.notna().all(axis=1)
+    valid &= data["credit_history"].isin([0, 1])
+    for field in INTEGER_FIELDS:
+        valid &= (data[field] >= 0) & (data[field] % 1 == 0)
+    for field in AMOUNT_FIELDS:
+        valid &= (data[field] >= 0) & (data[field] < MAX_AMOUNT)
+
+    data = data[valid].copy()
+    for field in [*codes.CODES, *INTEGER_FIELDS]:
+        data[field] = data[field].astype(int)
+    data[AMOUNT_FIELDS] = data[AMOUNT_FIELDS].round(2)
+    return data, int((~valid).sum())
+
+
+def load_chunk(data: pd.DataFrame, user, created_at):
+    """
+        Зберігає оцінену частину заявок і додає її до лічильників ApprovalStats.
+
+        Args:
+            data (pd.DataFrame): Поля заявки та prediction_result
+            user: Власник заявок
+            created_at (datetime): Час створення заявок
+    """
+    if connection.vendor == "postgresql":
+        columns = ["user_id", "created_at", *data.columns]
+        buffer = io.StringIO()
+        data.assign(user_id=user.pk, created_at=created_at.isoformat())[
+            columns
+        ].to_csv(buffer, header=False, index=False, float_format="%.2f")
+        buffer.seek(0)
+        with connection.cursor() as cursor:
+            copy_stream(
+                cursor,
+                f"COPY {CreditApplication._meta.db_table} ({', '.join(columns)}) "
+                "FROM STDIN WITH CSV",
+                buffer,
+                "in",
+            )
+    else:
+        CreditApplication.objects.bulk_create(
+            _applications(data, user, created_at), batch_size=1000
+        )
+
+    # Суми рахуються в копійках, щоб уникнути похибок float
+    cents = np.rint(data["loan_amount"].to_numpy() * 100).astype(np.int64)
+    approved = data["prediction_result"].to_numpy()
+    day = timezone.localdate(created_at)
+    daily = {}
+    for outcome, mask in (("approved", approved), ("rejected", ~approved)):
+        if mask.any():
+            amount = Decimal(int(cents[mask].sum())) / 100
+            daily[(day, outcome)] = (int(mask.sum()), amount)
+    stats.apply(daily, 1)
+
+
+def _applications(data: pd.DataFrame, user, created_at):
+    for record in data.to_dict("records"):
+        for field in AMOUNT_FIELDS:
+            record[field] = Decimal(f"{record[field]:.2f}")
+        yield CreditApplication(user=user, created_at=created_at, **record)
+
+
+def import_applications(
+    path: str, predictor, user, mode: str, chunk_size: int = CHUNK_SIZE, progress=None
+) -> dict:
+    """
+        Імпортує, оцінює та зберігає заявки з CSV файлу.
+
+        Частини, збережені до помилки, залишаються в базі.
+
+        Args:
+            path (str): Шлях до CSV файлу у форматі loan_data.csv
+            predictor: Предиктор з predict_batch (див. ml.services.get_ensemble)
+            user: Власник імпортованих заявок
+            mode (str): Режим прогнозування ("mode1", "mode2" або "mode3")
+            chunk_size (int, optional): Кількість рядків у частині
+            progress (callable, optional): Викликається після кожної частини
+                з проміжним результатом
+
+        Returns:
+            dict: Ключі rows, skipped, approved, seconds та rows_per_second
+
+        Example:
+            >>> import_applications("partner.csv", get_ensemble(), user, "mode1")
+            {'rows': 1000000, 'skipped': 12, 'approved': 690311, ...}
+    """
+    started = time.perf_counter()
+    fill = fill_values(read_chunks(path, chunk_size))
+    result = {"rows": 0, "skipped": 0, "approved": 0}
+
+    for df in read_chunks(path, chunk_size):
+        data, skipped = prepare_chunk(df, fill)
+        result["skipped"] += skipped
+        if not data.empty:
+            predictions, _ = predictor.predict_batch(
+                data.to_dict("records"), method=mode
+            )
+            data["prediction_result"] = np.asarray(predictions).astype(bool)
+            with transaction.atomic():
+                load_chunk(data, user, timezone.now())
+            result["rows"] += len(data)
+            result["approved"] += int(data["prediction_result"].sum())
+
+        _update_rate(result, started)
+        if progress is not None:
+            progress(dict(result))
+    return _update_rate(result, started)
+
+
+def _update_rate(result: dict, started: float) -> dict:
+    result["seconds"] = time.perf_counter() - started
+    result["rows_per_second"] = result["rows"] / result["seconds"]
+    return result
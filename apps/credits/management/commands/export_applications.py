@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from apps.credits import exporting
+from apps.credits.filters import OrderFilter
+from core.db_router import reporting_db
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream credit applications to CSV or NDJSON using a server-side "
+        "cursor, optionally filtered by the dashboard period"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--format", choices=list(exporting.FORMATS), default="csv"
+        )
+        parser.add_argument(
+            "--period",
+            choices=[period for period, _ in OrderFilter.PERIOD_CHOICES],
+            default="all",
+        )
+        parser.add_argument("--output", help="Output file (default: stdout)")
+        parser.add_argument("--chunk-size", type=int, default=exporting.CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        queryset = exporting.export_queryset(
+            {"period": options["period"]}, using=reporting_db()
+        )
+        chunks = exporting.stream(
+            queryset, options["format"], chunk_size=options["chunk_size"]
+        )
+        if not options["output"]:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+        with open(options["output"], "w", encoding="utf-8", newline="") as output:
+            for chunk in chunks:
+                output.write(chunk)
+        self.stderr.write(f"Exported applications to {options['output']}")
@@ -0,0 +1,60 @@
+import os
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.credits import importing
+from apps.credits.config import get_active_mode
+from apps.credits.models import PredictionConfig
+from ml.services import get_ensemble
+
+
+class Command(BaseCommand):
+    help = (
+        "Import credit applications from a CSV file in the ml/loan_data.csv "
+        "format: clean, score in batches and load them with COPY"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("file", help="CSV file in the loan_data.csv format")
+        parser.add_argument(
+            "--user",
+            required=True,
+            help="Email of the user who will own the imported applications",
+        )
+        parser.add_argument(
+            "--mode",
+            choices=[mode for mode, _ in PredictionConfig.MODE_CHOICES],
+            help="Prediction mode (default: the active mode)",
+        )
+        parser.add_argument("--chunk-size", type=int, default=importing.CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        path = options["file"]
+        if not os.path.isfile(path):
+            raise CommandError(f"{path} does not exist")
+        User = get_user_model()
+        try:
+            user = User.objects.get(**{User.USERNAME_FIELD: options["user"]})
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['user']} does not exist")
+        mode = options["mode"] or get_active_mode()
+
+        result = importing.import_applications(
+            path,
+            get_ensemble(),
+            user,
+            mode,
+            chunk_size=options["chunk_size"],
+            progress=self.report if options["verbosity"] > 1 else None,
+        )
+        self.stdout.write(
+            f"Imported {result['rows']} applications ({result['approved']} approved, "
+            f"{result['skipped']} invalid rows skipped) in {result['seconds']:.1f}s, "
+            f"{result['rows_per_second']:.0f} rows/s, {mode}"
+        )
+
+    def report(self, result: dict):
+        self.stdout.write(
+            f"  {result['rows']} rows, {result['rows_per_second']:.0f} rows/s"
+        )
@@ -0,0 +1,97 @@
+from datetime import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.credits import partitioning
+
+
+class Command(BaseCommand):
+    help = (
+        "Manage monthly PostgreSQL partitions of credit applications: convert the "
+        "table, create future partitions, archive old ones to CSV and restore them"
+    )
+
+    def add_arguments(self, parser):
+        subparsers = parser.add_subparsers(dest="action", required=True)
+
+        convert = subparsers.add_parser(
+            "convert", help="Convert the table to PARTITION BY RANGE (created_at)"
+        )
+        convert.add_argument("--months-ahead", type=int, default=3)
+
+        create = subparsers.add_parser(
+            "create", help="Create partitions for the next months (run from cron)"
+        )
+        create.add_argument("--months-ahead", type=int, default=3)
+
+        archive = subparsers.add_parser(
+            "archive",
+            help=(
+                "Dump old partitions to .csv.gz files and drop them; archived "
+                "applications are subtracted from the approval totals"
+            ),
+        )
+        cutoff = archive.add_mutually_exclusive_group(required=True)
+        cutoff.add_argument(
+            "--before", help="First month to keep, YYYY-MM"
+        )
+        cutoff.add_argument(
+            "--keep-months", type=int, help="Number of recent months to keep"
+        )
+        archive.add_argument("--directory", default=settings.ORDERS_ARCHIVE_DIR)
+
+        restore = subparsers.add_parser(
+            "restore",
+            help=(
+                "Load archived partitions back into the table and add them to "
+                "the approval totals"
+            ),
+        )
+        restore.add_argument("files", nargs="+")
+
+        subparsers.add_parser("list", help="List monthly partitions")
+
+    def handle(self, *args, **options):
+        try:
+            getattr(self, f"handle_{options['action']}")(options)
+        except (RuntimeError, ValueError) as e:
+            raise CommandError(str(e))
+
+    def handle_convert(self, options):
+        count = partitioning.convert(options["months_ahead"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Converted {partitioning.TABLE} into {count} partitions")
+        )
+
+    def handle_create(self, options):
+        created = partitioning.ensure_partitions(options["months_ahead"])
+        for name in created:
+            self.stdout.write(f"Created {name}")
+        if not created:
+            self.stdout.write("All partitions already exist")
+
+    def handle_archive(self, options):
+        if options["before"]:
+            cutoff = datetime.strptime(options["before"], "%Y-%m").date()
+        else:
+            current = partitioning.month_start(timezone.localdate())
+            cutoff = partitioning.add_months(current, 1 - options["keep_months"])
+        paths = partitioning.archive_before(cutoff, options["directory"])
+        for path in paths:
+            self.stdout.write(f"Archived {path}")
+        if not paths:
+            self.stdout.write(f"No partitions before {cutoff:%Y-%m}")
+
+    def handle_restore(self, options):
+        for path in options["files"]:
+            count = partitioning.restore_archive(path)
+            self.stdout.write(f"Restored {count} applications from {path}")
+
+    def handle_list(self, options):
+        if not partitioning.is_partitioned():
+            self.stdout.write(f"{partitioning.TABLE} is not partitioned")
+            return
+        for month, name in partitioning.list_partitions():
+            self.stdout.write(f"{month:%Y-%m}  {name}")
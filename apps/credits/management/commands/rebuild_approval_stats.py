@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from apps.credits import stats
+from apps.credits.models import ApprovalTotals
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute ApprovalStats and ApprovalTotals from the credit applications "
+        "table to repair counter drift"
+    )
+
+    def handle(self, *args, **options):
+        days = stats.rebuild()
+        self.stdout.write(f"Rebuilt approval stats for {days} day/outcome rows")
+        for totals in ApprovalTotals.objects.order_by("outcome"):
+            self.stdout.write(
+                f"  {totals.outcome}: {totals.count} applications, "
+                f"{totals.total_amount} total amount"
+            )
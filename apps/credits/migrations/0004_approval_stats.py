@@ -0,0 +1,116 @@
+# Generated by Django 5.2.6 on 2026-10-17 12:44
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+OUTCOME_CHOICES = [
+    ("approved", "Approved"),
+    ("rejected", "Rejected"),
+    ("pending", "Pending"),
+]
+
+
+def populate_approval_stats(apps, schema_editor):
+    CreditApplication = apps.get_model("credits", "CreditApplication")
+    ApprovalStats = apps.get_model("credits", "ApprovalStats")
+    ApprovalTotals = apps.get_model("credits", "ApprovalTotals")
+    db_alias = schema_editor.connection.alias
+
+    rows = (
+        CreditApplication.objects.using(db_alias)
+        .annotate(day=TruncDate("created_at"))
+        .values("day", "prediction_result")
+        .annotate(count=Count("id"), total_amount=Sum("loan_amount"))
+        .order_by()
+    )
+    daily = []
+    totals = {}
+    for row in rows:
+        if row["prediction_result"] is None:
+            outcome = "pending"
+        else:
+            outcome = "approved" if row["prediction_result"] else "rejected"
+        daily.append(
+            ApprovalStats(
+                day=row["day"],
+                outcome=outcome,
+                count=row["count"],
+                total_amount=row["total_amount"],
+            )
+        )
+        count, amount = totals.get(outcome, (0, Decimal(0)))
+        totals[outcome] = (count + row["count"], amount + row["total_amount"])
+
+    ApprovalStats.objects.using(db_alias).bulk_create(daily, batch_size=1000)
+    ApprovalTotals.objects.using(db_alias).bulk_create(
+        ApprovalTotals(outcome=outcome, count=count, total_amount=amount)
+        for outcome, (count, amount) in totals.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("credits", "0003_alter_creditapplication_options"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ApprovalTotals",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "outcome",
+                    models.CharField(
+                        choices=OUTCOME_CHOICES, max_length=10, unique=True
+                    ),
+                ),
+                ("count", models.PositiveBigIntegerField(default=0)),
+                (
+                    "total_amount",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=20),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ApprovalStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("outcome", models.CharField(choices=OUTCOME_CHOICES, max_length=10)),
+                ("count", models.PositiveBigIntegerField(default=0)),
+                (
+                    "total_amount",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=20),
+                ),
+            ],
+            options={
+                "ordering": ["-day", "outcome"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("day", "outcome"), name="approval_stats_day_outcome"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(populate_approval_stats, migrations.RunPython.noop),
+    ]
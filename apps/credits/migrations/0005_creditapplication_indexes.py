@@ -0,0 +1,57 @@
+# Generated by Django 5.2.6 on 2026-10-17 13:05
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+from django.db.migrations.operations import AddIndex
+
+
+class AddIndexConcurrentlyIfSupported(AddIndexConcurrently):
+    """
+        CREATE INDEX CONCURRENTLY на PostgreSQL і звичайний AddIndex на інших СУБД.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+        else:
+            AddIndex.database_forwards(
+                self, app_label, schema_editor, from_state, to_state
+            )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+        else:
+            AddIndex.database_backwards(
+                self, app_label, schema_editor, from_state, to_state
+            )
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY не можна виконувати в транзакції
+    atomic = False
+
+    dependencies = [
+        ("credits", "0004_approval_stats"),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfSupported(
+            model_name="creditapplication",
+            index=models.Index(fields=["created_at"], name="credit_created_idx"),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name="creditapplication",
+            index=models.Index(
+                fields=["user", "created_at"], name="credit_user_created_idx"
+            ),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name="creditapplication",
+            index=models.Index(
+                fields=["prediction_result", "created_at"],
+                name="credit_result_created_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,156 @@
+# Generated by Django 5.2.6 on 2026-10-17 13:55
+
+from django.db import migrations, models
+from django.db.models import Case, Value, When
+
+# Поле -> значення у порядку кодів (копія ml.codes.CODES на момент міграції)
+CODES = {
+    "gender": ("Female", "Male"),
+    "married": ("No", "Yes"),
+    "education": ("Graduate", "Not Graduate"),
+    "self_employed": ("No", "Yes"),
+    "property_area": ("Rural", "Semiurban", "Urban"),
+}
+# Довжина CharField до міграції
+MAX_LENGTH = {
+    "gender": 10,
+    "married": 5,
+    "education": 20,
+    "self_employed": 5,
+    "property_area": 20,
+}
+TABLE = "credits_creditapplication"
+
+
+class AlterFieldUnlessPostgres(migrations.AlterField):
+    """
+        AlterField на СУБД, крім PostgreSQL (там колонки змінює encode_columns).
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+def label_cases(to_codes: bool) -> dict:
+    """
+        Вирази UPDATE для перекодування рядкових колонок (значення <-> код).
+    """
+    cases = {}
+    for name, labels in CODES.items():
+        pairs = [(label, str(code)) for code, label in enumerate(labels)]
+        if not to_codes:
+            pairs = [(code, label) for label, code in pairs]
+        cases[name] = Case(
+            *(When(**{name: old}, then=Value(new)) for old, new in pairs)
+        )
+    return cases
+
+
+def encode_columns(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        # Один ALTER TABLE - одне переписування таблиці замість UPDATE
+        # та окремого ALTER для кожної колонки. Невідоме значення дає NULL,
+        # і міграція зупиняється на обмеженні NOT NULL.
+        changes = []
+        for name, labels in CODES.items():
+            cases = " ".join(
+                f"WHEN '{label}' THEN {code}" for code, label in enumerate(labels)
+            )
+            changes.append(
+                f"ALTER COLUMN {name} TYPE smallint USING CASE {name} {cases} END"
+            )
+        changes.append(
+            "ALTER COLUMN credit_history TYPE smallint"
+            " USING credit_history::smallint"
+        )
+        changes += [
+            f"ADD CONSTRAINT {TABLE}_{name}_check CHECK ({name} >= 0)"
+            for name in [*CODES, "credit_history"]
+        ]
+        schema_editor.execute(f"ALTER TABLE {TABLE} " + ", ".join(changes))
+        return
+
+    # Рядки з кодами, які AlterFieldUnlessPostgres перетворить на числа
+    model = apps.get_model("credits", "CreditApplication")
+    model.objects.using(schema_editor.connection.alias).update(
+        **label_cases(to_codes=True)
+    )
+
+
+def decode_columns(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        changes = [
+            f"DROP CONSTRAINT IF EXISTS {TABLE}_{name}_check"
+            for name in [*CODES, "credit_history"]
+        ]
+        changes += [
+            f"ALTER COLUMN {name} TYPE varchar({MAX_LENGTH[name]}) USING "
+            f"(ARRAY[{', '.join(repr(label) for label in labels)}])[{name} + 1]"
+            for name, labels in CODES.items()
+        ]
+        changes.append("ALTER COLUMN credit_history TYPE double precision")
+        schema_editor.execute(f"ALTER TABLE {TABLE} " + ", ".join(changes))
+        return
+
+    model = apps.get_model("credits", "CreditApplication")
+    model.objects.using(schema_editor.connection.alias).update(
+        **label_cases(to_codes=False)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("credits", "0005_creditapplication_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(encode_columns, decode_columns),
+        AlterFieldUnlessPostgres(
+            model_name="creditapplication",
+            name="credit_history",
+            field=models.PositiveSmallIntegerField(
+                blank=True, choices=[(0, "No"), (1, "Yes")], null=True
+            ),
+        ),
+        AlterFieldUnlessPostgres(
+            model_name="creditapplication",
+            name="education",
+            field=models.PositiveSmallIntegerField(
+                choices=[(0, "Graduate"), (1, "Not Graduate")]
+            ),
+        ),
+        AlterFieldUnlessPostgres(
+            model_name="creditapplication",
+            name="gender",
+            field=models.PositiveSmallIntegerField(
+                choices=[(0, "Female"), (1, "Male")]
+            ),
+        ),
+        AlterFieldUnlessPostgres(
+            model_name="creditapplication",
+            name="married",
+            field=models.PositiveSmallIntegerField(
+                choices=[(0, "No"), (1, "Yes")]
+            ),
+        ),
+        AlterFieldUnlessPostgres(
+            model_name="creditapplication",
+            name="property_area",
+            field=models.PositiveSmallIntegerField(
+                choices=[(0, "Rural"), (1, "Semiurban"), (2, "Urban")]
+            ),
+        ),
+        AlterFieldUnlessPostgres(
+            model_name="creditapplication",
+            name="self_employed",
+            field=models.PositiveSmallIntegerField(
+                choices=[(0, "No"), (1, "Yes")]
+            ),
+        ),
+    ]
@@ -1,5 +1,8 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from ml import codes
 
 
 User = get_user_model()
@@ -46,67 +49,38 @@ class CreditApplication(models.Model):
         Модель кредитної заявки користувача.
 
         Зберігає всю інформацію про заявку на кредит та результат
-        прогнозування від ML моделі.
+        прогнозування від ML моделі. Категоріальні поля зберігаються як
+        smallint коди спільної таблиці ml.codes (значення - get_<поле>_display).
 
         Attributes:
             user (ForeignKey): Користувач, який подав заявку
-            gender (CharField): Стать заявника
-            married (CharField): Сімейний стан
+            gender (PositiveSmallIntegerField): Стать заявника
+            married (PositiveSmallIntegerField): Сімейний стан
             dependents (PositiveIntegerField): Кількість утриманців
-            education (CharField): Рівень освіти
-            self_employed (CharField): Чи є самозайнятим
+            education (PositiveSmallIntegerField): Рівень освіти
+            self_employed (PositiveSmallIntegerField): Чи є самозайнятим
             applicant_income (DecimalField): Дохід заявника
             coapplicant_income (DecimalField): Дохід співзаявника
             loan_amount (DecimalField): Сума кредиту
             loan_amount_term (PositiveIntegerField): Термін кредиту (місяці)
-            credit_history (FloatField): Наявність кредитної історії (1.0/0.0)
-            property_area (CharField): Тип місцевості (міська/передмістя/сільська)
+            credit_history (PositiveSmallIntegerField): Наявність кредитної історії (1/0)
+            property_area (PositiveSmallIntegerField): Тип місцевості (міська/передмістя/сільська)
             prediction_result (BooleanField): Результат прогнозування (схвалено/відхилено)
             created_at (DateTimeField): Дата створення заявки
     """
-    GENDER_CHOICES = [
-        ("Male", "Male"),
-        ("Female", "Female"),
-    ]
-
-    MARRIED_CHOICES = [
-        ("Yes", "Yes"),
-        ("No", "No"),
-    ]
-
-    EDUCATION_CHOICES = [
-        ("Graduate", "Graduate"),
-        ("Not Graduate", "Not Graduate"),
-    ]
+    GENDER_CHOICES = codes.choices("gender")
+    MARRIED_CHOICES = codes.choices("married")
+    EDUCATION_CHOICES = codes.choices("education")
+    SELF_EMPLOYED_CHOICES = codes.choices("self_employed")
+    CREDIT_HISTORY_CHOICES = codes.choices("credit_history")
+    PROPERTY_AREA_CHOICES = codes.choices("property_area")
 
-    SELF_EMPLOYED_CHOICES = [
-        ("Yes", "Yes"),
-        ("No", "No"),
-    ]
-
-    PROPERTY_AREA_CHOICES = [
-        ("Urban", "Urban"),
-        ("Semiurban", "Semiurban"),
-        ("Rural", "Rural"),
-    ]
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="credits")
-    gender = models.CharField(
-        max_length=10,
-        choices=GENDER_CHOICES
-    )
-    married = models.CharField(
-        max_length=5,
-        choices=MARRIED_CHOICES
-    )
+    gender = models.PositiveSmallIntegerField(choices=GENDER_CHOICES)
+    married = models.PositiveSmallIntegerField(choices=MARRIED_CHOICES)
     dependents = models.PositiveIntegerField()
-    education = models.CharField(
-        max_length=20,
-        choices=EDUCATION_CHOICES
-    )
-    self_employed = models.CharField(
-        max_length=5,
-        choices=SELF_EMPLOYED_CHOICES
-    )
+    education = models.PositiveSmallIntegerField(choices=EDUCATION_CHOICES)
+    self_employed = models.PositiveSmallIntegerField(choices=SELF_EMPLOYED_CHOICES)
     applicant_income = models.DecimalField(
         max_digits=12,
         decimal_places=2
@@ -120,17 +94,124 @@ class CreditApplication(models.Model):
         decimal_places=2
     )
     loan_amount_term = models.PositiveIntegerField()
-    credit_history = models.FloatField(blank=True, null=True)
-    property_area = models.CharField(
-        max_length=20,
-        choices=PROPERTY_AREA_CHOICES
+    credit_history = models.PositiveSmallIntegerField(
+        choices=CREDIT_HISTORY_CHOICES, blank=True, null=True
     )
+    property_area = models.PositiveSmallIntegerField(choices=PROPERTY_AREA_CHOICES)
 
     prediction_result = models.BooleanField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["created_at"], name="credit_created_idx"),
+            models.Index(fields=["user", "created_at"], name="credit_user_created_idx"),
+            models.Index(
+                fields=["prediction_result", "created_at"],
+                name="credit_result_created_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"Order #{self.id} ({self.prediction_result})"
+
+    def stats_key(self) -> tuple:
+        """
+            Повертає ключ заявки в лічильниках схвалень.
+
+            Returns:
+                tuple: (день створення, результат з ApprovalStats.OUTCOME_CHOICES, сума кредиту)
+        """
+        return (
+            timezone.localdate(self.created_at),
+            ApprovalStats.outcome_of(self.prediction_result),
+            self.loan_amount,
+        )
+
+    def save(self, *args, **kwargs):
+        """
+            Зберігає заявку разом з оновленням лічильників в одній транзакції.
+
+            Лічильники оновлюються сигналами pre_save/post_save
+            (див. apps.credits.stats).
+        """
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class ApprovalStats(models.Model):
+    """
+        Лічильники заявок за днем створення та результатом прогнозування.
+
+        Оновлюються разом із заявками (див. apps.credits.stats), тому
+        статистика читається з кількох рядків замість агрегації всієї
+        таблиці заявок. Перебудовуються командою rebuild_approval_stats.
+
+        Attributes:
+            day (DateField): День створення заявок
+            outcome (CharField): Результат прогнозування
+                - approved: Схвалено
+                - rejected: Відхилено
+                - pending: Без результату
+            count (PositiveBigIntegerField): Кількість заявок
+            total_amount (DecimalField): Загальна сума кредитів
+    """
+    OUTCOME_CHOICES = [
+        ("approved", "Approved"),
+        ("rejected", "Rejected"),
+        ("pending", "Pending"),
+    ]
+
+    day = models.DateField()
+    outcome = models.CharField(max_length=10, choices=OUTCOME_CHOICES)
+    count = models.PositiveBigIntegerField(default=0)
+    total_amount = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+
+    class Meta:
+        ordering = ["-day", "outcome"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "outcome"], name="approval_stats_day_outcome"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.outcome}: {self.count}"
+
+    @staticmethod
+    def outcome_of(prediction_result) -> str:
+        """
+            Перетворює CreditApplication.prediction_result на outcome.
+
+            Args:
+                prediction_result (bool | None): Результат прогнозування
+
+            Returns:
+                str: "approved", "rejected" або "pending"
+        """
+        if prediction_result is None:
+            return "pending"
+        return "approved" if prediction_result else "rejected"
+
+
+class ApprovalTotals(models.Model):
+    """
+        Лічильники заявок за весь час за результатом прогнозування.
+
+        Враховують лише заявки в таблиці: заявки з архівованих партицій
+        (partition_applications archive) віднімаються до їх відновлення.
+
+        Attributes:
+            outcome (CharField): Результат прогнозування (ApprovalStats.OUTCOME_CHOICES)
+            count (PositiveBigIntegerField): Кількість заявок
+            total_amount (DecimalField): Загальна сума кредитів
+    """
+    outcome = models.CharField(
+        max_length=10, choices=ApprovalStats.OUTCOME_CHOICES, unique=True
+    )
+    count = models.PositiveBigIntegerField(default=0)
+    total_amount = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+
+    def __str__(self):
+        return f"{self.outcome}: {self.count}"
@@ -0,0 +1,204 @@
+"""
+    Курсорна (keyset) пагінація заявок за (created_at, id).
+
+    На відміну від django.core.paginator.Paginator, сторінка не потребує
+    COUNT(*) та OFFSET: наступна сторінка починається одразу після ключа
+    останньої заявки попередньої, тому будь-яка сторінка коштує стільки ж,
+    скільки перша (за наявності індексу за created_at, див. CreditApplication.Meta).
+"""
+
+import base64
+import binascii
+import json
+
+from django.db import connections
+from django.utils.dateparse import parse_datetime
+
+# Параметр рядка запиту з курсором сторінки
+CURSOR_PARAM = "cursor"
+# Значення курсора останньої сторінки
+LAST = "last"
+
+
+def encode_cursor(obj, direction: str) -> str:
+    """
+        Кодує ключ заявки та напрям переходу в рядок для URL.
+
+        Args:
+            obj (CreditApplication): Перша або остання заявка сторінки
+            direction (str): "next" - сторінка після obj, "prev" - перед obj
+
+        Returns:
+            str: Курсор (urlsafe base64)
+    """
+    payload = json.dumps([direction, obj.created_at.isoformat(), obj.pk])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """
+        Декодує курсор, створений encode_cursor.
+
+        Args:
+            cursor (str): Курсор з рядка запиту
+
+        Returns:
+            tuple | None: (напрям, created_at, id) або None, якщо курсор некоректний
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        direction, created_at, pk = json.loads(base64.urlsafe_b64decode(padded))
+        created_at = parse_datetime(created_at)
+    except (binascii.Error, ValueError, TypeError):
+        return None
+    if direction not in ("next", "prev") or created_at is None:
+        return None
+    if not isinstance(pk, int):
+        return None
+    return direction, created_at, pk
+
+
+def estimate_count(queryset):
+    """
+        Повертає оцінку кількості рядків queryset без COUNT(*).
+
+        Для запиту без умов береться pg_class.reltuples таблиці, для
+        відфільтрованого - оцінка планувальника (EXPLAIN). Точність залежить
+        від актуальності статистики (ANALYZE / autovacuum).
+
+        Args:
+            queryset (QuerySet): Набір записів
+
+        Returns:
+            int | None: Оцінка кількості або None не на PostgreSQL
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    if not queryset.query.where:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        return max(int(row[0]), 0) if row else None
+    plan = json.loads(queryset.order_by().explain(format="json"))
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class CursorPage:
+    """
+        Сторінка курсорної пагінації.
+
+        Attributes:
+            object_list (list): Заявки сторінки від новіших до старіших
+            has_next (bool): Чи є старіші заявки
+            has_previous (bool): Чи є новіші заявки
+            next_cursor (str | None): Курсор наступної сторінки
+            previous_cursor (str | None): Курсор попередньої сторінки
+            estimated_total (int | None): Оцінка загальної кількості заявок
+            is_cursor (bool): Ознака курсорної сторінки для шаблонів
+    """
+
+    is_cursor = True
+
+    def __init__(self, object_list, has_next, has_previous, estimated_total=None):
+        self.object_list = object_list
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.estimated_total = estimated_total
+        self.next_cursor = None
+        self.previous_cursor = None
+        if object_list and has_next:
+            self.next_cursor = encode_cursor(object_list[-1], "next")
+        if object_list and has_previous:
+            self.previous_cursor = encode_cursor(object_list[0], "prev")
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_other_pages(self) -> bool:
+        return self.has_next or self.has_previous
+
+
+class CursorPaginator:
+    """
+        Курсорний пагінатор заявок від новіших до старіших.
+
+        Заявки впорядковуються за (-created_at, -id); id розрізняє заявки з
+        однаковим часом створення.
+
+        Attributes:
+            queryset (QuerySet): Набір заявок
+            per_page (int): Кількість заявок на сторінці
+            estimate_total (bool): Чи оцінювати загальну кількість (estimate_count)
+
+        Example:
+            >>> paginator = CursorPaginator(CreditApplication.objects.all(), 10)
+            >>> page = paginator.get_page(request.GET.get(CURSOR_PARAM))
+            >>> page.next_cursor
+            'WyJuZXh0IiwgIjIwMjUtMDEtMDFUMTI6MDA6MDArMDA6MDAiLCA0Ml0'
+    """
+
+    def __init__(self, queryset, per_page: int, estimate_total: bool = False):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.estimate_total = estimate_total
+
+    def get_page(self, cursor: str = None) -> CursorPage:
+        """
+            Повертає сторінку за курсором.
+
+            Без курсора або з некоректним курсором повертається перша сторінка,
+            з курсором LAST - остання.
+
+            Args:
+                cursor (str, optional): Курсор з рядка запиту
+
+            Returns:
+                CursorPage: Сторінка заявок
+        """
+        queryset = self.queryset.order_by("-created_at", "-id")
+        estimated_total = estimate_count(self.queryset) if self.estimate_total else None
+
+        if cursor == LAST:
+            rows = list(queryset.reverse()[:self.per_page + 1])
+            has_previous = len(rows) > self.per_page
+            rows = rows[:self.per_page][::-1]
+            return CursorPage(rows, False, has_previous, estimated_total)
+
+        decoded = decode_cursor(cursor) if cursor else None
+        if decoded is None:
+            rows = list(queryset[:self.per_page + 1])
+            has_next = len(rows) > self.per_page
+            return CursorPage(rows[:self.per_page], has_next, False, estimated_total)
+
+        direction, created_at, pk = decoded
+        if direction == "next":
+            # created_at <= межі - умова індексу, рівні значення відсіює exclude
+            rows = list(
+                queryset.filter(created_at__lte=created_at).exclude(
+                    created_at=created_at, id__gte=pk
+                )[:self.per_page + 1]
+            )
+            page = CursorPage(
+                rows[:self.per_page], len(rows) > self.per_page, True, estimated_total
+            )
+        else:
+            rows = list(
+                queryset.reverse()
+                .filter(created_at__gte=created_at)
+                .exclude(created_at=created_at, id__lte=pk)[:self.per_page + 1]
+            )
+            page = CursorPage(
+                rows[:self.per_page][::-1],
+                True,
+                len(rows) > self.per_page,
+                estimated_total,
+            )
+        # Заявки за курсором могли бути видалені - тоді показується перша сторінка
+        return page if page.object_list else self.get_page()
@@ -0,0 +1,478 @@
+"""
+    Помісячне декларативне партиціювання CreditApplication (лише PostgreSQL).
+
+    Таблиця заявок перетворюється на PARTITION BY RANGE (created_at) з
+    партиціями <таблиця>_pYYYYMM та партицією за замовчуванням
+    <таблиця>_default. Межі партицій - опівночі першого дня місяця в
+    часовому поясі Django, як і межі періодів OrderFilter (period_range),
+    тому фільтр за періодом читає одну-дві партиції.
+
+    Старі партиції від'єднуються та вивантажуються в стиснуті CSV файли
+    (archive_partition) і за потреби завантажуються назад (restore_archive),
+    тож видалення старих даних не потребує великих DELETE.
+
+    Первинний ключ партиційованої таблиці - (id, created_at), бо PostgreSQL
+    вимагає ключ партиціювання в унікальних індексах; унікальність id
+    забезпечує послідовність. Django працює з таблицею як і раніше.
+
+    Usage:
+        python manage.py partition_applications convert
+        python manage.py partition_applications create --months-ahead 3
+        python manage.py partition_applications archive --keep-months 24
+        python manage.py partition_applications restore archive/credits_creditapplication_p202301.csv.gz
+"""
+
+import gzip
+import os
+import re
+from datetime import date, datetime, time
+
+from django.db import connection, transaction
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+
+from ml import codes
+
+from . import stats
+from .models import CreditApplication
+
+TABLE = CreditApplication._meta.db_table
+DEFAULT_PARTITION = f"{TABLE}_default"
+PARTITION_RE = re.compile(rf"^{TABLE}_p(\d{{4}})(\d{{2}})$")
+# Поля, які до міграції credits.0006 зберігались рядками: архіви тих часів
+# містять значення замість кодів, а credit_history - число з плаваючою комою
+LABEL_FIELDS = ("gender", "married", "education", "self_employed", "property_area")
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(day: date, months: int) -> date:
+    """
+        Зсуває перший день місяця на months місяців.
+
+        Args:
+            day (date): Перший день місяця
+            months (int): Кількість місяців (може бути від'ємною)
+
+        Returns:
+            date: Перший день цільового місяця
+    """
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{TABLE}_p{month.year}{month.month:02d}"
+
+
+def month_bounds(month: date) -> tuple:
+    """
+        Повертає межі партиції місяця як aware datetime.
+
+        Args:
+            month (date): Перший день місяця
+
+        Returns:
+            tuple: (start, end) - опівночі в часовому поясі Django
+    """
+    return tuple(
+        timezone.make_aware(datetime.combine(day, time.min))
+        for day in (month, add_months(month, 1))
+    )
+
+
+def _bounds_sql(month: date) -> str:
+    # DDL не приймає параметрів запиту, тому межі вставляються літералами
+    start, end = month_bounds(month)
+    return f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+
+
+def is_partitioned() -> bool:
+    """
+        Перевіряє, чи таблиця заявок вже партиційована.
+
+        Returns:
+            bool: True для PARTITION BY таблиці PostgreSQL
+    """
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT relkind FROM pg_class WHERE oid = %s::regclass", [TABLE]
+        )
+        return cursor.fetchone()[0] == "p"
+
+
+def list_partitions() -> list:
+    """
+        Повертає помісячні партиції таблиці заявок.
+
+        Returns:
+            list: Відсортовані пари (перший день місяця, назва партиції)
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = %s::regclass
+            """,
+            [TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    partitions = []
+    for name in names:
+        match = PARTITION_RE.match(name)
+        if match:
+            partitions.append((date(int(match[1]), int(match[2]), 1), name))
+    return sorted(partitions)
+
+
+def _check_postgresql():
+    if connection.vendor != "postgresql":
+        raise RuntimeError("Partitioning requires PostgreSQL")
+
+
+def create_partition(cursor, month: date) -> bool:
+    """
+        Створює партицію місяця, якщо її ще немає.
+
+        Заявки цього місяця, що вже потрапили в партицію за замовчуванням,
+        переносяться в нову партицію до її приєднання: інакше PostgreSQL
+        відмовляє у створенні партиції. Партиція за замовчуванням
+        блокується від вставок до кінця транзакції.
+
+        Args:
+            cursor: Курсор з'єднання
+            month (date): Перший день місяця
+
+        Returns:
+            bool: True, якщо партицію створено
+    """
+    name = partition_name(month)
+    cursor.execute("SELECT to_regclass(%s)", [name])
+    if cursor.fetchone()[0] is not None:
+        return False
+    start, end = month_bounds(month)
+    cursor.execute(f"LOCK TABLE {DEFAULT_PARTITION} IN SHARE ROW EXCLUSIVE MODE")
+    cursor.execute(
+        f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} "
+        f"WHERE created_at >= %s AND created_at < %s)",
+        [start, end],
+    )
+    if not cursor.fetchone()[0]:
+        cursor.execute(
+            f"CREATE TABLE {name} PARTITION OF {TABLE} {_bounds_sql(month)}"
+        )
+        return True
+    cursor.execute(
+        f"CREATE TABLE {name} "
+        f"(LIKE {TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    )
+    cursor.execute(
+        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+        f"WHERE created_at >= %s AND created_at < %s RETURNING *) "
+        f"INSERT INTO {name} SELECT * FROM moved",
+        [start, end],
+    )
+    cursor.execute(f"ALTER TABLE {TABLE} ATTACH PARTITION {name} {_bounds_sql(month)}")
+    return True
+
+
+def ensure_partitions(months_ahead: int = 3, today: date = None) -> list:
+    """
+        Створює партиції від поточного місяця на months_ahead місяців уперед.
+
+        Args:
+            months_ahead (int, optional): Кількість наступних місяців. За замовчуванням 3
+            today (date, optional): Поточна дата. За замовчуванням timezone.localdate()
+
+        Returns:
+            list: Назви створених партицій
+
+        Raises:
+            RuntimeError: Якщо таблиця не партиційована
+    """
+    if not is_partitioned():
+        raise RuntimeError(f"{TABLE} is not partitioned, run convert first")
+    first = month_start(today or timezone.localdate())
+    created = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        for offset in range(months_ahead + 1):
+            month = add_months(first, offset)
+            if create_partition(cursor, month):
+                created.append(partition_name(month))
+    return created
+
+
+def convert(months_ahead: int = 3) -> int:
+    """
+        Перетворює таблицю заявок на партиційовану за місяцями.
+
+        Виконується однією транзакцією: створюється нова таблиця з тими ж
+        колонками та CHECK обмеженнями, партиції для всіх місяців з даними
+        та months_ahead наступних, рядки копіюються, стара таблиця
+        видаляється, а індекси, зовнішні ключі та послідовність id
+        відновлюються з тими ж назвами. На час конвертації таблиця
+        заблокована, тому її слід виконувати у вікні обслуговування.
+
+        Args:
+            months_ahead (int, optional): Кількість майбутніх партицій. За замовчуванням 3
+
+        Returns:
+            int: Кількість створених помісячних партицій
+
+        Raises:
+            RuntimeError: Якщо СУБД не PostgreSQL або таблиця вже партиційована
+    """
+    _check_postgresql()
+    if is_partitioned():
+        raise RuntimeError(f"{TABLE} is already partitioned")
+
+    new_table = f"{TABLE}_partitioned"
+    sequence = f"{TABLE}_id_seq"
+    with transaction.atomic(), connection.cursor() as cursor:
+        # Відкладені перевірки зовнішніх ключів не дають видалити таблицю
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        cursor.execute(f"LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE")
+        cursor.execute(
+            """
+            SELECT indexdef FROM pg_indexes
+            WHERE tablename = %s AND indexname NOT IN (
+                SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass
+            )
+            """,
+            [TABLE, TABLE],
+        )
+        index_definitions = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            """
+            SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+            WHERE conrelid = %s::regclass AND contype = 'f'
+            """,
+            [TABLE],
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute(f"SELECT min(created_at), max(id) FROM {TABLE}")
+        oldest, max_id = cursor.fetchone()
+
+        # Ідентичність (IDENTITY) не підтримується партиційованими таблицями
+        # до PostgreSQL 17, тому id отримує звичайну послідовність
+        cursor.execute(
+            f"CREATE TABLE {new_table} "
+            f"(LIKE {TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+            f"PARTITION BY RANGE (created_at)"
+        )
+        cursor.execute(
+            f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {new_table} DEFAULT"
+        )
+
+        current = month_start(timezone.localdate())
+        month = month_start(timezone.localdate(oldest)) if oldest else current
+        last = add_months(current, months_ahead)
+        count = 0
+        while month <= last:
+            cursor.execute(
+                f"CREATE TABLE {partition_name(month)} PARTITION OF {new_table} "
+                f"{_bounds_sql(month)}"
+            )
+            month = add_months(month, 1)
+            count += 1
+
+        cursor.execute(f"INSERT INTO {new_table} SELECT * FROM {TABLE}")
+        cursor.execute(f"DROP TABLE {TABLE}")
+        cursor.execute(f"ALTER TABLE {new_table} RENAME TO {TABLE}")
+
+        cursor.execute(f"CREATE SEQUENCE {sequence} OWNED BY {TABLE}.id")
+        cursor.execute("SELECT setval(%s, %s)", [sequence, max_id or 1])
+        cursor.execute(
+            f"ALTER TABLE {TABLE} ALTER COLUMN id SET DEFAULT nextval('{sequence}')"
+        )
+        cursor.execute(
+            f"ALTER TABLE {TABLE} "
+            f"ADD CONSTRAINT {TABLE}_pkey PRIMARY KEY (id, created_at)"
+        )
+        for definition in index_definitions:
+            cursor.execute(definition)
+        for name, definition in foreign_keys:
+            cursor.execute(f"ALTER TABLE {TABLE} ADD CONSTRAINT {name} {definition}")
+    return count
+
+
+def copy_stream(cursor, sql: str, fileobj, direction: str):
+    """
+        Виконує COPY через psycopg2 (copy_expert) або psycopg 3 (copy).
+
+        Args:
+            cursor: Курсор Django
+            sql (str): Команда COPY ... TO STDOUT / FROM STDIN
+            fileobj: Файл для запису або читання
+            direction (str): "out" або "in"
+    """
+    raw = cursor.cursor
+    if hasattr(raw, "copy_expert"):
+        raw.copy_expert(sql, fileobj)
+        return
+    with raw.copy(sql) as copy:
+        if direction == "out":
+            for data in copy:
+                fileobj.write(data)
+        else:
+            while data := fileobj.read(1 << 16):
+                copy.write(data)
+
+
+def archive_partition(month: date, directory: str) -> str:
+    """
+        Вивантажує партицію місяця в стиснутий CSV і видаляє її.
+
+        Файл записується повністю (через тимчасовий файл) до від'єднання
+        партиції. Лічильники ApprovalStats та загальні лічильники
+        ApprovalTotals зменшуються на архівовані заявки в тій самій
+        транзакції, що й видалення партиції: лічильники завжди відповідають
+        заявкам у таблиці, як і після stats.rebuild(), тож загальні суми на
+        панелі зменшуються до відновлення архіву.
+
+        Args:
+            month (date): Перший день місяця
+            directory (str): Каталог архівів
+
+        Returns:
+            str: Шлях до архіву <партиція>.csv.gz
+    """
+    name = partition_name(month)
+    path = os.path.join(directory, f"{name}.csv.gz")
+    tmp_path = f"{path}.tmp"
+    os.makedirs(directory, exist_ok=True)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        # Блокує зміни партиції до кінця транзакції
+        cursor.execute(f"LOCK TABLE {name} IN SHARE MODE")
+        with gzip.open(tmp_path, "wb") as archive:
+            copy_stream(
+                cursor, f"COPY {name} TO STDOUT WITH CSV HEADER", archive, "out"
+            )
+        os.replace(tmp_path, path)
+
+        start, end = month_bounds(month)
+        daily = stats.aggregate(
+            CreditApplication.objects.filter(created_at__gte=start, created_at__lt=end)
+        )
+        stats.apply(daily, -1)
+        cursor.execute(f"ALTER TABLE {TABLE} DETACH PARTITION {name}")
+        cursor.execute(f"DROP TABLE {name}")
+    return path
+
+
+def archive_before(cutoff: date, directory: str) -> list:
+    """
+        Архівує всі помісячні партиції, що закінчуються до cutoff.
+
+        Args:
+            cutoff (date): Перший місяць, що залишається в таблиці
+            directory (str): Каталог архівів
+
+        Returns:
+            list: Шляхи створених архівів
+    """
+    _check_postgresql()
+    return [
+        archive_partition(month, directory)
+        for month, _ in list_partitions()
+        if month < month_start(cutoff)
+    ]
+
+
+def _decode_expression(column: str) -> str:
+    """
+        Повертає SQL вираз колонки архіву для вставки в таблицю заявок.
+
+        Значення категоріальних полів перекодовуються тим самим CASE, що й у
+        міграції credits.0006, коди з нових архівів лишаються кодами.
+        Невідоме значення зупиняє відновлення помилкою приведення типу.
+
+        Args:
+            column (str): Назва колонки із заголовка архіву
+
+        Returns:
+            str: Вираз для INSERT ... SELECT з тимчасової таблиці
+    """
+    quoted = connection.ops.quote_name(column)
+    if column in LABEL_FIELDS:
+        cases = " ".join(
+            f"WHEN '{label}' THEN {code}"
+            for code, label in enumerate(codes.CODES[column])
+        )
+        return f"CASE {quoted} {cases} ELSE {quoted}::smallint END"
+    if column == "credit_history":
+        return f"{quoted}::double precision::smallint"
+    return quoted
+
+
+def restore_archive(path: str) -> int:
+    """
+        Завантажує архів партиції назад у таблицю заявок.
+
+        Партиція місяця створюється заново, рядки копіюються з CSV (за
+        назвами колонок із заголовка) у тимчасову таблицю з текстовими
+        категоріальними колонками і переносяться в партицію одним
+        INSERT ... SELECT (див. _decode_expression), тому відновлюються і
+        архіви зі значеннями, створені до міграції credits.0006.
+        Лічильники ApprovalStats та ApprovalTotals збільшуються лише на
+        відновлені заявки (заявки місяця, перенесені з партиції за
+        замовчуванням, вже враховані).
+
+        Args:
+            path (str): Шлях до архіву <партиція>.csv.gz
+
+        Returns:
+            int: Кількість відновлених заявок
+
+        Raises:
+            ValueError: Якщо назва файлу не відповідає партиції заявок
+            RuntimeError: Якщо партиція місяця вже існує
+    """
+    _check_postgresql()
+    match = PARTITION_RE.match(os.path.basename(path).split(".")[0])
+    if match is None:
+        raise ValueError(f"{path} is not a {TABLE} partition archive")
+    month = date(int(match[1]), int(match[2]), 1)
+    name = partition_name(month)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        if not create_partition(cursor, month):
+            raise RuntimeError(f"Partition {name} already exists")
+        staging = f"{name}_restore"
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE {staging} (LIKE {TABLE}) ON COMMIT DROP"
+        )
+        cursor.execute(
+            f"ALTER TABLE {staging} "
+            + ", ".join(
+                f"ALTER COLUMN {field} TYPE text"
+                for field in (*LABEL_FIELDS, "credit_history")
+            )
+        )
+        with gzip.open(path, "rb") as archive:
+            header = archive.readline().decode().strip().split(",")
+            columns = ", ".join(connection.ops.quote_name(column) for column in header)
+            copy_stream(
+                cursor, f"COPY {staging} ({columns}) FROM STDIN WITH CSV", archive, "in"
+            )
+        values = ", ".join(_decode_expression(column) for column in header)
+        cursor.execute(
+            f"INSERT INTO {name} ({columns}) SELECT {values} FROM {staging}"
+        )
+
+        start, end = month_bounds(month)
+        daily = stats.aggregate(
+            CreditApplication.objects.filter(
+                created_at__gte=start,
+                created_at__lt=end,
+                id__in=RawSQL(f"SELECT id FROM {staging}", []),
+            )
+        )
+        stats.apply(daily, 1)
+    return sum(count for count, _ in daily.values())
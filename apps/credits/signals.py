@@ -0,0 +1,78 @@
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+from apps.credits import stats
+from apps.credits.config import bump_config_version
+from apps.credits.models import CreditApplication, PredictionConfig
+
+from ml import services
+
+
+@receiver([post_save, post_delete], sender=PredictionConfig)
+def clear_prediction_cache(sender, **kwargs):
+    """
+        Очищує кеш результатів прогнозування після зміни конфігурації.
+
+        Сигнал спрацьовує при збереженні або видаленні PredictionConfig,
+        тобто при зміні активного режиму прогнозування. Також змінює версію
+        конфігурації, щоб усі воркери перечитали активний режим.
+
+        Args:
+            sender: Модель, яка викликала сигнал
+            **kwargs: Додаткові аргументи сигналу
+    """
+    bump_config_version()
+    if services.prediction_cache is not None:
+        services.prediction_cache.clear()
+
+
+@receiver(pre_save, sender=CreditApplication)
+def load_application_stats_key(sender, instance, **kwargs):
+    """
+        Завантажує збережений стан заявки перед її оновленням.
+
+        Заявка читається з бази одним запитом лише при першому збереженні
+        наявної заявки: після збереження ключ запам'ятовує update_approval_stats.
+
+        Args:
+            sender: Модель, яка викликала сигнал
+            instance (CreditApplication): Заявка, що зберігається
+            **kwargs: Додаткові аргументи сигналу
+    """
+    if instance.pk is None or hasattr(instance, "_stats_key"):
+        return
+    stored = sender.objects.filter(pk=instance.pk).first()
+    instance._stats_key = stored.stats_key() if stored is not None else None
+
+
+@receiver(post_save, sender=CreditApplication)
+def update_approval_stats(sender, instance, created, **kwargs):
+    """
+        Оновлює лічильники схвалень після створення або зміни заявки.
+
+        Виконується в транзакції CreditApplication.save, тому заявка і
+        лічильники змінюються атомарно.
+
+        Args:
+            sender: Модель, яка викликала сигнал
+            instance (CreditApplication): Збережена заявка
+            created (bool): Чи створено нову заявку
+            **kwargs: Додаткові аргументи сигналу
+    """
+    old_key = None if created else getattr(instance, "_stats_key", None)
+    new_key = instance.stats_key()
+    stats.record_change(old_key, new_key)
+    instance._stats_key = new_key
+
+
+@receiver(post_delete, sender=CreditApplication)
+def remove_approval_stats(sender, instance, **kwargs):
+    """
+        Віднімає видалену заявку з лічильників схвалень.
+
+        Args:
+            sender: Модель, яка викликала сигнал
+            instance (CreditApplication): Видалена заявка
+            **kwargs: Додаткові аргументи сигналу
+    """
+    key = getattr(instance, "_stats_key", None) or instance.stats_key()
+    stats.record_change(key, None)
@@ -0,0 +1,174 @@
+"""
+    Інкрементальні лічильники схвалень (ApprovalStats, ApprovalTotals).
+
+    Кожне створення, зміна результату чи суми та видалення заявки змінює
+    рядок дня і рядок загальних лічильників у тій самій транзакції, що й
+    зміну заявки (див. apps.credits.signals). Лічильники оновлюються
+    атомарним UPDATE ... SET count = count + n, тому паралельні запити не
+    втрачають змін.
+
+    Лічильники відповідають заявкам, що є в таблиці: архівування партиції
+    віднімає її заявки, відновлення архіву додає їх назад (див.
+    apps.credits.partitioning), а rebuild перераховує лише наявні заявки.
+"""
+
+from decimal import Decimal
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+
+from .models import ApprovalStats, ApprovalTotals, CreditApplication
+
+
+def _increment(model, lookup: dict, count: int, amount: Decimal):
+    """
+        Додає count та amount до рядка лічильника, створюючи його за потреби.
+
+        Args:
+            model: ApprovalStats або ApprovalTotals
+            lookup (dict): Ключ рядка
+            count (int): Зміна кількості заявок
+            amount (Decimal): Зміна загальної суми
+    """
+    changes = {
+        "count": F("count") + count,
+        "total_amount": F("total_amount") + amount,
+    }
+    if model.objects.filter(**lookup).update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, count=count, total_amount=amount)
+    except IntegrityError:
+        # Рядок щойно створив паралельний запит
+        model.objects.filter(**lookup).update(**changes)
+
+
+def record(key: tuple, sign: int):
+    """
+        Додає заявку до лічильників (sign=1) або віднімає її (sign=-1).
+
+        Args:
+            key (tuple): Ключ заявки (CreditApplication.stats_key)
+            sign (int): 1 або -1
+    """
+    day, outcome, amount = key
+    amount = sign * Decimal(amount or 0)
+    _increment(ApprovalStats, {"day": day, "outcome": outcome}, sign, amount)
+    _increment(ApprovalTotals, {"outcome": outcome}, sign, amount)
+
+
+def record_change(old_key, new_key):
+    """
+        Переносить заявку між лічильниками, якщо змінився її ключ.
+
+        Args:
+            old_key (tuple | None): Ключ до зміни (None для нової заявки)
+            new_key (tuple | None): Ключ після зміни (None для видаленої заявки)
+    """
+    if old_key == new_key:
+        return
+    if old_key is not None:
+        record(old_key, -1)
+    if new_key is not None:
+        record(new_key, 1)
+
+
+def get_totals(outcome: str = "approved") -> dict:
+    """
+        Повертає лічильники за весь час для результату outcome.
+
+        Args:
+            outcome (str, optional): Результат прогнозування. За замовчуванням "approved"
+
+        Returns:
+            dict: Словник з ключами 'total_credits' та 'total_amount'
+    """
+    totals = ApprovalTotals.objects.filter(outcome=outcome).first()
+    if totals is None:
+        return {"total_credits": 0, "total_amount": Decimal(0)}
+    return {"total_credits": totals.count, "total_amount": totals.total_amount}
+
+
+def aggregate(queryset) -> dict:
+    """
+        Рахує лічильники для набору заявок одним GROUP BY.
+
+        Args:
+            queryset (QuerySet): Набір заявок
+
+        Returns:
+            dict: {(день, outcome): (кількість, сума)}
+    """
+    rows = (
+        queryset.annotate(day=TruncDate("created_at"))
+        .values("day", "prediction_result")
+        .annotate(count=Count("id"), total_amount=Sum("loan_amount"))
+        .order_by()
+    )
+    return {
+        (row["day"], ApprovalStats.outcome_of(row["prediction_result"])): (
+            row["count"],
+            row["total_amount"] or Decimal(0),
+        )
+        for row in rows
+    }
+
+
+def _totals(daily: dict) -> dict:
+    totals = {}
+    for (_, outcome), (count, amount) in daily.items():
+        total_count, total_amount = totals.get(outcome, (0, Decimal(0)))
+        totals[outcome] = (total_count + count, total_amount + amount)
+    return totals
+
+
+def apply(daily: dict, sign: int):
+    """
+        Додає (sign=1) або віднімає (sign=-1) результат aggregate з лічильників.
+
+        Використовується при архівуванні та відновленні партицій заявок
+        (див. apps.credits.partitioning).
+
+        Args:
+            daily (dict): Результат aggregate
+            sign (int): 1 або -1
+    """
+    for (day, outcome), (count, amount) in daily.items():
+        _increment(
+            ApprovalStats, {"day": day, "outcome": outcome}, sign * count, sign * amount
+        )
+    for outcome, (count, amount) in _totals(daily).items():
+        _increment(ApprovalTotals, {"outcome": outcome}, sign * count, sign * amount)
+
+
+def rebuild() -> int:
+    """
+        Перераховує всі лічильники з таблиці заявок.
+
+        На PostgreSQL таблиця заявок блокується від змін до кінця транзакції,
+        тому заявки, створені під час перерахунку, не губляться.
+
+        Returns:
+            int: Кількість створених рядків ApprovalStats
+    """
+    with transaction.atomic():
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"LOCK TABLE {CreditApplication._meta.db_table} IN SHARE MODE"
+                )
+        ApprovalStats.objects.all().delete()
+        ApprovalTotals.objects.all().delete()
+
+        daily = aggregate(CreditApplication.objects.all())
+        ApprovalStats.objects.bulk_create(
+            ApprovalStats(day=day, outcome=outcome, count=count, total_amount=amount)
+            for (day, outcome), (count, amount) in daily.items()
+        )
+        ApprovalTotals.objects.bulk_create(
+            ApprovalTotals(outcome=outcome, count=count, total_amount=amount)
+            for outcome, (count, amount) in _totals(daily).items()
+        )
+    return len(daily)
@@ -1,3 +1,665 @@
-from django.test import TestCase
+import csv
+import gzip
+import io
+import json
+import os
+import re
+import tempfile
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core import db_router
+from ml import codes
+
+from . import config, exporting, importing, partitioning, stats
+from .common import FORMS
+from .filters import OrderFilter, period_range
+from .forms import Step1Form, Step10Form, Step11Form, UpdateStatusForm
+from .models import ApprovalStats, ApprovalTotals, CreditApplication, PredictionConfig
+from .pagination import LAST, CursorPaginator
+
+APPLICATION = {
+    "gender": codes.encode("gender", "Male"),
+    "married": codes.encode("married", "Yes"),
+    "dependents": 0,
+    "education": codes.encode("education", "Graduate"),
+    "self_employed": codes.encode("self_employed", "No"),
+    "applicant_income": Decimal("5000"),
+    "coapplicant_income": Decimal("0"),
+    "loan_amount": Decimal("100"),
+    "loan_amount_term": 360,
+    "credit_history": codes.encode("credit_history", "Yes"),
+    "property_area": codes.encode("property_area", "Urban"),
+}
+PERIODS = [value for value, _ in OrderFilter.PERIOD_CHOICES]
+
+
+class PeriodRangeTests(TestCase):
+    """
+        Межі періодів OrderFilter.
+    """
+
+    def test_last_month_in_january(self):
+        now = datetime(2025, 1, 15, 12, tzinfo=dt_timezone.utc)
+        self.assertEqual(
+            period_range("last_month", now),
+            (
+                datetime(2024, 12, 1, tzinfo=dt_timezone.utc),
+                datetime(2025, 1, 1, tzinfo=dt_timezone.utc),
+            ),
+        )
+
+    def test_month_in_december(self):
+        now = datetime(2024, 12, 31, 23, tzinfo=dt_timezone.utc)
+        self.assertEqual(
+            period_range("month", now),
+            (
+                datetime(2024, 12, 1, tzinfo=dt_timezone.utc),
+                datetime(2025, 1, 1, tzinfo=dt_timezone.utc),
+            ),
+        )
+
+    def test_week_starts_on_monday(self):
+        now = datetime(2025, 3, 2, 10, tzinfo=dt_timezone.utc)  # неділя
+        start, end = period_range("week", now)
+        self.assertEqual(start, datetime(2025, 2, 24, tzinfo=dt_timezone.utc))
+        self.assertEqual(end, datetime(2025, 3, 3, tzinfo=dt_timezone.utc))
+
+    @override_settings(TIME_ZONE="Europe/Kyiv")
+    def test_bounds_use_active_timezone(self):
+        # 23:30 UTC 31 березня - вже 1 квітня за київським часом
+        now = datetime(2025, 3, 31, 23, 30, tzinfo=dt_timezone.utc)
+        start, end = period_range("today", now)
+        self.assertEqual(start, datetime(2025, 3, 31, 21, tzinfo=dt_timezone.utc))
+        self.assertEqual(end, datetime(2025, 4, 1, 21, tzinfo=dt_timezone.utc))
+
+    def test_all_has_no_bounds(self):
+        self.assertIsNone(period_range("all"))
+
+
+class CodesTests(TestCase):
+    """
+        Зберігання категоріальних полів заявки кодами ml.codes.
+    """
+
+    def test_forms_return_codes(self):
+        for form_class, field, label in [
+            (Step1Form, "gender", "Female"),
+            (Step10Form, "credit_history", "No"),
+            (Step11Form, "property_area", "Semiurban"),
+        ]:
+            with self.subTest(field=field):
+                code = codes.encode(field, label)
+                form = form_class({field: str(code)})
+                self.assertTrue(form.is_valid(), form.errors)
+                self.assertEqual(form.cleaned_data[field], code)
+
+    def test_application_stores_codes(self):
+        user = get_user_model().objects.create_user(
+            email="codes@example.com", username="codes", password="password"
+        )
+        application = CreditApplication.objects.create(user=user, **APPLICATION)
+        application = CreditApplication.objects.get(id=application.id)
+        self.assertEqual(application.property_area, APPLICATION["property_area"])
+        self.assertEqual(application.get_property_area_display(), "Urban")
+        self.assertEqual(application.get_credit_history_display(), "Yes")
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class ActiveModeTests(TestCase):
+    """
+        Кеш активного режиму прогнозування (apps.credits.config).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        PredictionConfig.objects.create(id=1, active_mode="mode1")
+
+    def setUp(self):
+        cache.clear()
+        for name in ("_active_mode", "_version"):
+            patcher = mock.patch.object(config, name, None)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_cached_mode_is_reused(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(config.get_active_mode(), "mode1")
+        with self.assertNumQueries(0):
+            self.assertEqual(config.get_active_mode(), "mode1")
+
+    def test_config_change_invalidates_cached_mode(self):
+        self.assertEqual(config.get_active_mode(), "mode1")
+        prediction_config = PredictionConfig.objects.get(id=1)
+        prediction_config.active_mode = "mode2"
+        prediction_config.save()
+        with self.assertNumQueries(1):
+            self.assertEqual(config.get_active_mode(), "mode2")
+
+        # Після видалення get_or_create створює конфігурацію за замовчуванням
+        prediction_config.delete()
+        self.assertEqual(config.get_active_mode(), "mode1")
+
+    def test_wizard_reads_mode_once_per_request(self):
+        user = get_user_model().objects.create_user(
+            email="mode@example.com", username="mode", password="password"
+        )
+        self.client.force_login(user)
+        step = FORMS[0][0]
+        data = {"credit_wizard-current_step": step, f"{step}-{step}": APPLICATION[step]}
+        with mock.patch(
+            "apps.credits.views.get_active_mode", wraps=config.get_active_mode
+        ) as get_active_mode:
+            self.client.get(reverse("credits:make_predict"))
+            self.assertEqual(get_active_mode.call_count, 1)
+            response = self.client.post(reverse("credits:make_predict"), data)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(get_active_mode.call_count, 2)
+
+
+class OrderFilterTests(TestCase):
+    """
+        Фільтрація заявок за періодами та використання індексів.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="filters@example.com", username="filters", password="password"
+        )
+        now = timezone.now()
+        cls.today = CreditApplication.objects.create(user=cls.user, **APPLICATION)
+        cls.old = CreditApplication.objects.create(user=cls.user, **APPLICATION)
+        CreditApplication.objects.filter(id=cls.old.id).update(
+            created_at=now - timedelta(days=800)
+        )
+
+    def filter(self, period, queryset=None):
+        queryset = CreditApplication.objects.all() if queryset is None else queryset
+        return OrderFilter({"period": period}, queryset=queryset).qs
+
+    def test_period_results(self):
+        expected = {
+            "all": {self.today.id, self.old.id},
+            "today": {self.today.id},
+            "yesterday": set(),
+            "week": {self.today.id},
+            "month": {self.today.id},
+            "last_month": set(),
+            "year": {self.today.id},
+        }
+        for period in PERIODS:
+            with self.subTest(period=period):
+                ids = set(self.filter(period).values_list("id", flat=True))
+                self.assertEqual(ids, expected[period])
+
+    @skipUnless(connection.vendor == "postgresql", "PostgreSQL EXPLAIN format")
+    def test_periods_use_indexes(self):
+        querysets = {
+            "all users": CreditApplication.objects.all(),
+            "one user": CreditApplication.objects.filter(user=self.user),
+            "approved": CreditApplication.objects.filter(prediction_result=True),
+        }
+        with connection.cursor() as cursor:
+            # Таблиця в тесті майже порожня, тому без цього планувальник
+            # обрав би послідовне сканування навіть за наявності індексу
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        for period in PERIODS:
+            for label, queryset in querysets.items():
+                with self.subTest(period=period, queryset=label):
+                    plan = self.filter(period, queryset).explain()
+                    self.assertNotIn("Seq Scan", plan)
+                    if period != "all":
+                        # Межі періоду мають бути умовою індексу, а не
+                        # фільтром поверх повного сканування індексу
+                        self.assertRegex(plan, r"Index Cond: .*created_at")
+
+
+class CursorPaginatorTests(TestCase):
+    """
+        Курсорна пагінація заявок.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="pages@example.com", username="pages", password="password"
+        )
+        CreditApplication.objects.bulk_create(
+            CreditApplication(user=cls.user, **APPLICATION) for _ in range(25)
+        )
+        # Частина заявок з однаковим часом, щоб перевірити розрізнення за id
+        ids = list(CreditApplication.objects.order_by("id").values_list("id", flat=True))
+        start = timezone.now() - timedelta(days=1)
+        for i, pk in enumerate(ids):
+            CreditApplication.objects.filter(id=pk).update(
+                created_at=start + timedelta(minutes=i // 3)
+            )
+        cls.expected = list(
+            CreditApplication.objects.order_by("-created_at", "-id").values_list(
+                "id", flat=True
+            )
+        )
+
+    def ids(self, page):
+        return [order.id for order in page]
+
+    def test_walk_forward_and_back(self):
+        paginator = CursorPaginator(CreditApplication.objects.all(), 10)
+        pages = [paginator.get_page()]
+        while pages[-1].has_next:
+            pages.append(paginator.get_page(pages[-1].next_cursor))
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+        self.assertEqual(sum(map(self.ids, pages), []), self.expected)
+        self.assertFalse(pages[0].has_previous)
+
+        previous = paginator.get_page(pages[2].previous_cursor)
+        self.assertEqual(self.ids(previous), self.ids(pages[1]))
+        self.assertTrue(previous.has_next and previous.has_previous)
+
+    def test_last_page_and_invalid_cursor(self):
+        paginator = CursorPaginator(CreditApplication.objects.all(), 10)
+        last = paginator.get_page(LAST)
+        self.assertEqual(self.ids(last), self.expected[-10:])
+        self.assertFalse(last.has_next)
+        self.assertTrue(last.has_previous)
+        self.assertEqual(self.ids(paginator.get_page("garbage")), self.expected[:10])
+
+    def test_page_cost_does_not_depend_on_depth(self):
+        paginator = CursorPaginator(CreditApplication.objects.all(), 10)
+        second = paginator.get_page(paginator.get_page().next_cursor)
+        with self.assertNumQueries(1):
+            deep = paginator.get_page(second.next_cursor)
+        self.assertEqual(len(deep), 5)
+
+    def test_orders_view_keeps_filter_params(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("credits:user_orders"), {"period": "week"})
+        page = response.context["page_obj"]
+        self.assertEqual(self.ids(page), self.expected[:10])
+        self.assertContains(response, f"?period=week&cursor={page.next_cursor}")
+
+
+class ApprovalStatsTests(TestCase):
+    """
+        Лічильники ApprovalStats та ApprovalTotals відповідають заявкам.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="stats@example.com", username="stats", password="password"
+        )
+        cls.other = get_user_model().objects.create_user(
+            email="stats-other@example.com", username="stats-other", password="password"
+        )
+        old = CreditApplication.objects.create(
+            user=cls.user, prediction_result=True, **APPLICATION
+        )
+        CreditApplication.objects.filter(id=old.id).update(
+            created_at=timezone.now() - timedelta(days=3)
+        )
+        stats.rebuild()
+
+    def create(self, user=None, prediction_result=None, **fields):
+        return CreditApplication.objects.create(
+            user=user or self.user,
+            prediction_result=prediction_result,
+            **{**APPLICATION, **fields},
+        )
+
+    def assertStatsMatch(self):
+        expected = stats.aggregate(CreditApplication.objects.all())
+        daily = {
+            (row.day, row.outcome): (row.count, row.total_amount)
+            for row in ApprovalStats.objects.exclude(count=0)
+        }
+        self.assertEqual(daily, expected)
+
+        totals = {}
+        for (_, outcome), (count, amount) in expected.items():
+            total_count, total_amount = totals.get(outcome, (0, Decimal(0)))
+            totals[outcome] = (total_count + count, total_amount + amount)
+        self.assertEqual(
+            {
+                row.outcome: (row.count, row.total_amount)
+                for row in ApprovalTotals.objects.exclude(count=0)
+            },
+            totals,
+        )
+
+    def test_create(self):
+        self.create(prediction_result=True)
+        self.create(prediction_result=False, loan_amount=Decimal("250"))
+        self.create()
+        self.assertStatsMatch()
+
+    def test_update_status_form(self):
+        application = self.create()
+        for value in ("1", "0"):
+            with self.subTest(value=value):
+                form = UpdateStatusForm(
+                    {"prediction_result": value},
+                    instance=CreditApplication.objects.get(id=application.id),
+                )
+                self.assertTrue(form.is_valid(), form.errors)
+                form.save()
+                self.assertStatsMatch()
+
+    def test_save_with_deferred_fields(self):
+        application = self.create(prediction_result=True)
+        deferred = CreditApplication.objects.only("id").get(id=application.id)
+        deferred.prediction_result = False
+        deferred.save()
+        self.assertStatsMatch()
+
+        deferred = CreditApplication.objects.defer("loan_amount").get(
+            id=application.id
+        )
+        deferred.loan_amount = Decimal("400")
+        deferred.save()
+        self.assertStatsMatch()
+
+    def test_delete_and_cascade(self):
+        application = self.create(prediction_result=True)
+        self.create(user=self.other, prediction_result=False)
+        self.create(user=self.other)
+
+        CreditApplication.objects.get(id=application.id).delete()
+        self.assertStatsMatch()
+        self.other.delete()
+        self.assertStatsMatch()
+
+    def test_rebuild_repairs_drift(self):
+        self.create(prediction_result=True)
+        CreditApplication.objects.update(loan_amount=Decimal("50"))
+        ApprovalTotals.objects.update(count=99)
+        ApprovalStats.objects.filter(outcome="approved").delete()
+
+        call_command("rebuild_approval_stats", stdout=io.StringIO())
+        self.assertStatsMatch()
+
+
+@skipUnless(connection.vendor == "postgresql", "PostgreSQL partitioning")
+class PartitioningTests(TestCase):
+    """
+        Помісячне партиціювання, архівування та відновлення заявок.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="partitions@example.com", username="partitions", password="password"
+        )
+        now = timezone.now()
+        for days in (0, 40, 400):
+            application = CreditApplication.objects.create(
+                user=cls.user, prediction_result=True, **APPLICATION
+            )
+            CreditApplication.objects.filter(id=application.id).update(
+                created_at=now - timedelta(days=days)
+            )
+        stats.rebuild()
+
+    def setUp(self):
+        partitioning.convert(months_ahead=2)
+
+    def scanned_partitions(self, period):
+        plan = OrderFilter(
+            {"period": period}, queryset=CreditApplication.objects.all()
+        ).qs.explain()
+        return set(re.findall(rf"{partitioning.TABLE}_p\d{{6}}\b", plan))
+
+    def test_periods_prune_partitions(self):
+        self.assertTrue(partitioning.is_partitioned())
+        self.assertEqual(len(self.scanned_partitions("today")), 1)
+        self.assertEqual(len(self.scanned_partitions("month")), 1)
+        self.assertEqual(len(self.scanned_partitions("last_month")), 1)
+        self.assertLessEqual(len(self.scanned_partitions("week")), 2)
+
+    def test_archive_and_restore(self):
+        current = partitioning.month_start(timezone.localdate())
+        cutoff = partitioning.add_months(current, -6)
+        with tempfile.TemporaryDirectory() as directory:
+            paths = partitioning.archive_before(cutoff, directory)
+            self.assertEqual(CreditApplication.objects.count(), 2)
+            self.assertEqual(ApprovalTotals.objects.get(outcome="approved").count, 2)
+
+            restored = sum(partitioning.restore_archive(path) for path in paths)
+        self.assertEqual(restored, 1)
+        self.assertEqual(CreditApplication.objects.count(), 3)
+        self.assertEqual(ApprovalTotals.objects.get(outcome="approved").count, 3)
+
+    def test_restore_archive_with_labels(self):
+        # Архів, створений до міграції credits.0006: значення замість кодів
+        current = partitioning.month_start(timezone.localdate())
+        cutoff = partitioning.add_months(current, -6)
+        with tempfile.TemporaryDirectory() as directory:
+            paths = partitioning.archive_before(cutoff, directory)
+            for path in paths:
+                with gzip.open(path, "rt", newline="") as archive:
+                    reader = csv.DictReader(archive)
+                    rows = list(reader)
+                for row in rows:
+                    for field in partitioning.LABEL_FIELDS:
+                        row[field] = codes.decode(field, int(row[field]))
+                    row["credit_history"] = f"{float(row['credit_history'])}"
+                with gzip.open(path, "wt", newline="") as archive:
+                    writer = csv.DictWriter(archive, fieldnames=reader.fieldnames)
+                    writer.writeheader()
+                    writer.writerows(rows)
+
+            restored = sum(partitioning.restore_archive(path) for path in paths)
+        self.assertEqual(restored, 1)
+        restored = CreditApplication.objects.order_by("created_at").first()
+        for field in (*partitioning.LABEL_FIELDS, "credit_history"):
+            self.assertEqual(getattr(restored, field), APPLICATION[field])
+        self.assertEqual(ApprovalTotals.objects.get(outcome="approved").count, 3)
+
+    def test_create_moves_rows_from_default_partition(self):
+        day = partitioning.add_months(timezone.localdate(), 6)
+        application = CreditApplication.objects.create(user=self.user, **APPLICATION)
+        CreditApplication.objects.filter(id=application.id).update(
+            created_at=timezone.make_aware(datetime.combine(day, time(12)))
+        )
+
+        created = partitioning.ensure_partitions(months_ahead=0, today=day)
+        name = partitioning.partition_name(partitioning.month_start(day))
+        self.assertEqual(created, [name])
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT id FROM {name}")
+            self.assertEqual(cursor.fetchall(), [(application.id,)])
+            cursor.execute(f"SELECT count(*) FROM {partitioning.DEFAULT_PARTITION}")
+            self.assertEqual(cursor.fetchone()[0], 0)
+        self.assertEqual(CreditApplication.objects.count(), 4)
+
+    def test_restore_counts_only_archived_rows(self):
+        current = partitioning.month_start(timezone.localdate())
+        cutoff = partitioning.add_months(current, -6)
+        with tempfile.TemporaryDirectory() as directory:
+            paths = partitioning.archive_before(cutoff, directory)
+            # Заявка архівованого місяця, створена після архівування
+            application = CreditApplication.objects.create(
+                user=self.user, prediction_result=True, **APPLICATION
+            )
+            CreditApplication.objects.filter(id=application.id).update(
+                created_at=timezone.now() - timedelta(days=400)
+            )
+            restored = sum(partitioning.restore_archive(path) for path in paths)
+        self.assertEqual(restored, 1)
+        self.assertEqual(CreditApplication.objects.count(), 4)
+        self.assertEqual(ApprovalTotals.objects.get(outcome="approved").count, 4)
+
+    def test_inserts_after_convert(self):
+        application = CreditApplication.objects.create(user=self.user, **APPLICATION)
+        self.assertGreater(application.id, 0)
+        self.assertEqual(CreditApplication.objects.get(id=application.id), application)
+
+
+class FakePredictor:
+    """
+        Схвалює заявки з кредитною історією.
+    """
+
+    def predict_batch(self, records, method="mode3"):
+        predictions = [int(record["credit_history"] == 1) for record in records]
+        return predictions, [float(p) for p in predictions]
+
+
+class ImportApplicationsTests(TestCase):
+    """
+        Імпорт заявок з CSV у форматі loan_data.csv.
+    """
+
+    CSV = (
+        "Loan_ID,Gender,Married,Dependents,Education,Self_Employed,ApplicantIncome,"
+        "CoapplicantIncome,LoanAmount,Loan_Amount_Term,Credit_History,Property_Area,"
+        "Loan_Status\n"
+        "LP1,Male,Yes,3+,Graduate,No,5000,0,100,360,1,Urban,Y\n"
+        "LP2,Female,No,0,Not Graduate,Yes,3000,1000,200.5,360,0,Rural,N\n"
+        "LP3,,Yes,1,Graduate,,4000,0,,360,,Semiurban,Y\n"
+        "LP4,Unknown,Yes,1,Graduate,No,4000,0,100,360,1,Urban,Y\n"
+        "LP5,Male,Yes,many,Graduate,No,4000,0,100,360,1,Urban,Y\n"
+        "LP6,Male,Yes,1,Graduate,No,-1,0,100,360,1,Urban,Y\n"
+    )
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="import@example.com", username="import", password="password"
+        )
+        handle, self.path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(handle, "w") as file:
+            file.write(self.CSV)
+        self.addCleanup(os.remove, self.path)
+
+    def test_import_cleans_scores_and_counts(self):
+        result = importing.import_applications(
+            self.path, FakePredictor(), self.user, "mode1", chunk_size=4
+        )
+        self.assertEqual((result["rows"], result["skipped"]), (3, 3))
+        self.assertEqual(result["approved"], 2)
+
+        first, second, filled = CreditApplication.objects.order_by("id")
+        self.assertEqual(first.dependents, 3)
+        self.assertEqual(second.loan_amount, Decimal("200.50"))
+        # Пропуски заповнюються модою та медіаною всього файлу
+        self.assertEqual(filled.get_gender_display(), "Male")
+        self.assertEqual(filled.get_self_employed_display(), "No")
+        self.assertEqual(filled.loan_amount, Decimal("100"))
+        self.assertEqual(filled.credit_history, 1)
+        self.assertTrue(filled.prediction_result)
+
+        totals = ApprovalTotals.objects.get(outcome="approved")
+        self.assertEqual((totals.count, totals.total_amount), (2, Decimal("200")))
+        self.assertEqual(ApprovalTotals.objects.get(outcome="rejected").count, 1)
+
+
+class ExportApplicationsTests(TestCase):
+    """
+        Потокове вивантаження заявок у CSV та NDJSON.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.admin = User.objects.create_superuser(
+            email="export@example.com", username="export", password="password"
+        )
+        cls.user = User.objects.create_user(
+            email="client@example.com", username="client", password="password"
+        )
+        cls.today = CreditApplication.objects.create(user=cls.user, **APPLICATION)
+        cls.old = CreditApplication.objects.create(
+            user=cls.user, **{**APPLICATION, "credit_history": None}
+        )
+        CreditApplication.objects.filter(id=cls.old.id).update(
+            created_at=timezone.now() - timedelta(days=800)
+        )
+
+    def test_view_streams_filtered_csv(self):
+        url = reverse("credits:export_orders")
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        self.client.force_login(self.admin)
+        response = self.client.get(url, {"period": "today"})
+        self.assertTrue(response.streaming)
+        self.assertIn(
+            'filename="applications-today.csv"', response["Content-Disposition"]
+        )
+        header, *rows = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(header.split(","), list(exporting.COLUMNS))
+        self.assertEqual(len(rows), 1)
+        self.assertTrue(rows[0].startswith(f"{self.today.id},client@example.com,"))
+        self.assertIn(
+            ",Male,Yes,0,Graduate,No,5000.00,0.00,100.00,360,Yes,Urban,", rows[0]
+        )
+        self.assertEqual(self.client.get(url, {"format": "xml"}).status_code, 400)
+
+    def test_command_writes_ndjson(self):
+        output = io.StringIO()
+        call_command(
+            "export_applications", "--format", "ndjson", "--chunk-size", "1", stdout=output
+        )
+        rows = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual([row["id"] for row in rows], [self.today.id, self.old.id])
+        self.assertEqual(rows[1]["credit_history"], None)
+        self.assertEqual(rows[0]["property_area"], "Urban")
+        self.assertEqual(rows[0]["loan_amount"], "100.00")
+
+
+@override_settings(DATABASE_REPLICA="extra", DATABASE_REPLICA_LAG_CHECK_INTERVAL=0)
+class ReplicaRouterTests(TestCase):
+    """
+        Звітні читання з репліки, read-your-writes та відставання репліки.
+    """
+
+    def test_falls_back_to_primary_when_replica_lags(self):
+        self.assertEqual(db_router.reporting_db(), "extra")
+        with db_router.reporting():
+            self.assertEqual(
+                db_router.ReplicaRouter().db_for_read(CreditApplication), "extra"
+            )
+        for lag in (60, None):
+            with mock.patch("core.db_router.replica_lag", return_value=lag):
+                self.assertEqual(db_router.reporting_db(), "default")
+
+    def test_user_reads_primary_after_write(self):
+        user = get_user_model().objects.create_user(
+            email="replica@example.com", username="replica", password="password"
+        )
+        order = CreditApplication.objects.create(user=user, **APPLICATION)
+        self.client.force_login(user)
+        self.client.post(reverse("credits:delete_order", args=[order.id]))
+        self.assertGreater(
+            self.client.session[db_router.PIN_SESSION_KEY], datetime.now().timestamp()
+        )
+
+        CreditApplication.objects.create(user=user, **APPLICATION)
+        # Запит до "extra" у цьому TestCase завершився б помилкою
+        response = self.client.get(reverse("credits:user_orders"))
+        self.assertEqual(len(response.context["orders"]), 1)
+
+    def test_post_without_write_does_not_pin(self):
+        user = get_user_model().objects.create_user(
+            email="replica@example.com", username="replica", password="password"
+        )
+        self.client.force_login(user)
+        step = FORMS[0][0]
+        response = self.client.post(
+            reverse("credits:make_predict"),
+            {"credit_wizard-current_step": step, f"{step}-{step}": APPLICATION[step]},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(db_router.PIN_SESSION_KEY, self.client.session)
@@ -15,5 +15,6 @@ urlpatterns = [
         views.DeleteOrderView.as_view(),
         name="delete_order",
     ),
+    path("orders/export/", views.ExportOrdersView.as_view(), name="export_orders"),
     path("user_orders/", views.UserOrdersView.as_view(), name="user_orders"),
 ]
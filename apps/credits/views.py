@@ -1,22 +1,68 @@
+from django.conf import settings
 from django.core.paginator import Paginator
 from django.urls import reverse_lazy
 
 
-from django.http import HttpResponseRedirect
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponseBadRequest, HttpResponseRedirect, StreamingHttpResponse
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
 from django.views import View
 from django.views.generic import TemplateView, ListView
 from formtools.wizard.views import SessionWizardView
-from django.db.models import Sum, Count
 
+from . import exporting
 from . import forms
 from . import filters
+from . import stats
+from .config import get_active_mode
+from .pagination import CURSOR_PARAM, CursorPaginator
 from .models import PredictionConfig, CreditApplication
 from .common import TEMPLATES, FORMS
 
-from ml.services import get_ensemble
+from core import db_router
+from ml.metrics import StageTimer
+from ml.services import MODEL_VERSION_HEADER, get_ensemble, predict
+
+
+def paginate_orders(request, queryset, per_page: int):
+    """
+        Повертає сторінку заявок згідно з налаштуванням ORDERS_PAGINATION.
+
+        У режимі "cursor" використовується CursorPaginator (без COUNT(*) та
+        OFFSET), у режимі "page" - Paginator з номерами сторінок.
+
+        Args:
+            request (HttpRequest): HTTP запит з параметром cursor або page
+            queryset (QuerySet): Набір заявок
+            per_page (int): Кількість заявок на сторінці
+
+        Returns:
+            Page | CursorPage: Сторінка заявок
+    """
+    if settings.ORDERS_PAGINATION == "cursor":
+        paginator = CursorPaginator(
+            queryset, per_page, estimate_total=settings.ORDERS_ESTIMATED_TOTAL
+        )
+        return paginator.get_page(request.GET.get(CURSOR_PARAM))
+    return Paginator(queryset, per_page).get_page(request.GET.get("page"))
+
+
+def pagination_params(request) -> str:
+    """
+        Повертає параметри запиту (фільтри) без параметрів пагінації.
+
+        Args:
+            request (HttpRequest): HTTP запит
+
+        Returns:
+            str: Закодований рядок параметрів для посилань на сторінки
+    """
+    params = request.GET.copy()
+    params.pop("page", None)
+    params.pop(CURSOR_PARAM, None)
+    return params.urlencode()
 
 
 class DashboardView(LoginRequiredMixin, TemplateView):
@@ -46,11 +92,16 @@ class DashboardView(LoginRequiredMixin, TemplateView):
         """
             Отримує або створює конфігурацію прогнозування.
 
+            Об'єкт запитується один раз за запит: форма змінює свій instance
+            під час валідації, тому кеш процесу (get_active_mode) тут не
+            використовується.
+
             Returns:
                 PredictionConfig: Об'єкт конфігурації
         """
-        config, _ = PredictionConfig.objects.get_or_create(id=1)
-        return config
+        if not hasattr(self, "_config"):
+            self._config, _ = PredictionConfig.objects.get_or_create(id=1)
+        return self._config
 
     def get_form(self):
         """
@@ -66,23 +117,27 @@ class DashboardView(LoginRequiredMixin, TemplateView):
 
     def get_total_approved_orders(self):
         """
-            Розраховує статистику по схваленим заявкам.
+            Повертає статистику по схваленим заявкам.
+
+            Значення читаються з лічильників ApprovalTotals (див.
+            apps.credits.stats), а не агрегуються по таблиці заявок, з
+            репліки бази (див. core.db_router).
 
             Returns:
                 dict: Словник з ключами 'total_credits' та 'total_amount'
         """
-        return CreditApplication.objects.filter(prediction_result=True).aggregate(
-            total_credits=Count("id"), total_amount=Sum("loan_amount")
-        )
+        with db_router.reporting():
+            return stats.get_totals("approved")
 
     def get_filtered_orders(self):
         """
-            Отримує відфільтрований список заявок.
+            Отримує відфільтрований список заявок з репліки бази.
 
             Returns:
                 QuerySet: Набір заявок згідно встановлених фільтрів
         """
-        queryset = CreditApplication.objects.select_related("user")
+        queryset = CreditApplication.objects.using(db_router.reporting_db())
+        queryset = queryset.select_related("user")
         self.filterset = filters.OrderFilter(self.request.GET, queryset=queryset)
         return self.filterset.qs
 
@@ -106,6 +161,7 @@ class DashboardView(LoginRequiredMixin, TemplateView):
             form = self.form_class(request.POST, instance=self.get_config())
             if form.is_valid():
                 form.save()
+                db_router.pin_primary(request)
                 return HttpResponseRedirect(
                     request.META.get("HTTP_REFERER", self.success_url)
                 )
@@ -118,6 +174,7 @@ class DashboardView(LoginRequiredMixin, TemplateView):
             form = forms.UpdateStatusForm(request.POST, instance=order)
             if form.is_valid():
                 form.save()
+                db_router.pin_primary(request)
                 return HttpResponseRedirect(
                     request.META.get("HTTP_REFERER", self.success_url)
                 )
@@ -131,12 +188,9 @@ class DashboardView(LoginRequiredMixin, TemplateView):
             Розбиває заявки на сторінки.
 
             Returns:
-                Page: Об'єкт сторінки з заявками (по 10 на сторінці)
+                Page | CursorPage: Об'єкт сторінки з заявками (по 10 на сторінці)
         """
-        orders = self.get_filtered_orders()
-        paginator = Paginator(orders, 10)
-        page_number = self.request.GET.get("page")
-        return paginator.get_page(page_number)
+        return paginate_orders(self.request, self.get_filtered_orders(), 10)
 
     def get_context_data(self, **kwargs):
         """
@@ -159,16 +213,11 @@ class DashboardView(LoginRequiredMixin, TemplateView):
                 dict: Словник з даними для шаблону
         """
         context = super().get_context_data(**kwargs)
-        config = self.get_config()
-        totals_approved = self.get_total_approved_orders()
-        form = kwargs.get("form", self.get_form())
-        paginated_orders = self.get_paginated_orders()
-        params = self.request.GET.copy()
-
-        if "page" in params:
-            params.pop("page")
-
         if self.request.user.is_superuser:
+            config = self.get_config()
+            form = kwargs["form"] if "form" in kwargs else self.get_form()
+            paginated_orders = self.get_paginated_orders()
+            params = pagination_params(self.request)
             context.update(
                 {
                     "config": config,
@@ -176,10 +225,11 @@ class DashboardView(LoginRequiredMixin, TemplateView):
                     "update_form": forms.UpdateStatusForm(),
                     "total_orders": paginated_orders,
                     "filter": self.filterset,
-                    "params": params.urlencode(),
+                    "params": params,
                 }
             )
         else:
+            totals_approved = self.get_total_approved_orders()
             context.update(
                 {
                     "total_credits": totals_approved["total_credits"],
@@ -227,6 +277,21 @@ class CreditWizard(LoginRequiredMixin, SessionWizardView):
         )
         return context
 
+    def get_mode(self) -> str:
+        """
+            Повертає активний режим прогнозування.
+
+            Режим читається один раз за запит: майстер викликає get_form_list
+            кілька разів на кожен крок, а get_active_mode щоразу звертається
+            до спільного кешу.
+
+            Returns:
+                str: Активний режим ("mode1", "mode2" або "mode3")
+        """
+        if not hasattr(self, "_mode"):
+            self._mode = get_active_mode()
+        return self._mode
+
     def get_form_list(self):
         """
             Формує список форм залежно від активного режиму прогнозування.
@@ -236,10 +301,9 @@ class CreditWizard(LoginRequiredMixin, SessionWizardView):
             Returns:
                 dict: Словник форм для відображення
         """
-        predict_mode = PredictionConfig.objects.get(id=1)
         form_list = dict(super().get_form_list())
 
-        if predict_mode.active_mode == "mode2":
+        if self.get_mode() == "mode2":
             form_list.pop("credit_history", None)
         return form_list
 
@@ -265,21 +329,37 @@ class CreditWizard(LoginRequiredMixin, SessionWizardView):
 
             Returns:
                 HttpResponse: Сторінка з результатом прогнозування
+                    (версія моделей - у заголовку X-Model-Version)
+
+            Note:
+                Тривалість етапів collect, config, predict, save, render та
+                total записується в метрики (див. ml.metrics)
         """
+        timer = StageTimer()
         data = {}
         for form in form_list:
             data.update(form.cleaned_data)
-        predict_mode = PredictionConfig.objects.get(id=1)
-        predict = get_ensemble().predict(data, predict_mode.active_mode)
+        timer.mark("collect")
+        mode = self.get_mode()
+        timer.mark("config")
+        predictor = get_ensemble()
+        prediction = predict(predictor, data, mode)
+        timer.mark("predict")
         CreditApplication.objects.create(
-            user=self.request.user, prediction_result=bool(predict), **data
+            user=self.request.user, prediction_result=bool(prediction), **data
         )
+        db_router.pin_primary(self.request)
+        timer.mark("save")
 
-        return render(
+        response = render(
             self.request,
             "credits/stepper/steps/result.html",
-            {"approved": predict},
+            {"approved": prediction},
         )
+        response[MODEL_VERSION_HEADER] = predictor.version
+        timer.mark("render")
+        timer.observe(mode)
+        return response
 
 
 class DeleteOrderView(LoginRequiredMixin, View):
@@ -313,9 +393,61 @@ class DeleteOrderView(LoginRequiredMixin, View):
             messages.error(request, "You do not have permission to delete this order")
             return redirect(request.META.get("HTTP_REFERER", "/"))
         order.delete()
+        db_router.pin_primary(request)
         return redirect(request.META.get("HTTP_REFERER", "/"))
 
 
+class ExportOrdersView(LoginRequiredMixin, View):
+    """
+        Потокове вивантаження заявок у CSV або NDJSON для адміністраторів.
+
+        Підтримує той самий фільтр period, що й панель управління, та
+        параметр format ("csv" за замовчуванням або "ndjson"). Рядки
+        читаються серверним курсором і надсилаються частинами
+        (див. apps.credits.exporting), тому пам'ять не залежить від
+        кількості заявок.
+
+        Methods:
+            get: Повертає StreamingHttpResponse з вивантаженням
+    """
+    def get(self, request, *args, **kwargs):
+        """
+            Вивантажує відфільтровані заявки.
+
+            Args:
+                request (HttpRequest): HTTP запит з параметрами period та format
+                *args: Позиційні аргументи
+                **kwargs: Іменовані аргументи
+
+            Returns:
+                StreamingHttpResponse: Файл вивантаження
+
+            Raises:
+                PermissionDenied: Якщо користувач не адміністратор
+        """
+        if not request.user.is_superuser:
+            raise PermissionDenied
+        fmt = request.GET.get("format", "csv")
+        if fmt not in exporting.FORMATS:
+            return HttpResponseBadRequest(f"Unknown export format {fmt!r}")
+
+        content_type, extension = exporting.FORMATS[fmt]
+        period = request.GET.get("period")
+        if period not in dict(filters.OrderFilter.PERIOD_CHOICES):
+            period = "all"
+        response = StreamingHttpResponse(
+            exporting.stream(
+                exporting.export_queryset(request.GET, using=db_router.reporting_db()),
+                fmt,
+            ),
+            content_type=content_type,
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="applications-{period}.{extension}"'
+        )
+        return response
+
+
 class UserOrdersView(LoginRequiredMixin, ListView):
     """
         Представлення для перегляду заявок користувача.
@@ -336,9 +468,43 @@ class UserOrdersView(LoginRequiredMixin, ListView):
 
     def get_queryset(self):
         """
-            Отримує список заявок для поточного користувача.
+            Отримує список заявок для поточного користувача з репліки бази.
+
+            Після подання заявки список читається з основної бази
+            (pin_primary у CreditWizard.done), тому нова заявка видна одразу.
 
             Returns:
                 QuerySet: Набір заявок, що належать поточному користувачу
         """
-        return CreditApplication.objects.filter(user=self.request.user)
+        return CreditApplication.objects.using(db_router.reporting_db()).filter(
+            user=self.request.user
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        """
+            Розбиває заявки на сторінки згідно з ORDERS_PAGINATION.
+
+            Args:
+                queryset (QuerySet): Набір заявок користувача
+                page_size (int): Кількість заявок на сторінці
+
+            Returns:
+                tuple: (paginator, сторінка, заявки сторінки, чи є інші сторінки)
+        """
+        page = paginate_orders(self.request, queryset, page_size)
+        paginator = getattr(page, "paginator", None)
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs):
+        """
+            Додає до контексту параметри запиту для посилань на сторінки.
+
+            Args:
+                **kwargs: Додаткові аргументи для контексту
+
+            Returns:
+                dict: Словник з даними для шаблону
+        """
+        context = super().get_context_data(**kwargs)
+        context["params"] = pagination_params(self.request)
+        return context
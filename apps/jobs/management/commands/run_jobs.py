@@ -0,0 +1,35 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.jobs import queue
+
+
+class Command(BaseCommand):
+    help = "Run background jobs from the database queue"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Run queued jobs and exit instead of polling",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=settings.JOBS_POLL_INTERVAL,
+            help="Seconds between queue polls when it is empty",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            # Як на початку запиту: закриває застарілі та пошкоджені з'єднання
+            close_old_connections()
+            count = queue.run_pending()
+            if count and options["verbosity"] > 0:
+                self.stdout.write(f"Ran {count} job(s)")
+            if options["once"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,77 @@
+from django.db import models
+from django.db.models import Q
+
+
+class Job(models.Model):
+    """
+        Фонова задача черги в базі даних (див. apps.jobs.queue).
+
+        Для кожної задачі (name) одночасно існує не більше одного запису в
+        статусі queued або running, тому повторні запуски під час виконання
+        об'єднуються в одну задачу.
+
+        Attributes:
+            name (CharField): Шлях до функції задачі (module.function)
+            status (CharField): Статус виконання
+                - queued: Очікує воркера (manage.py run_jobs)
+                - running: Виконується
+                - succeeded: Виконана успішно
+                - failed: Завершилась помилкою
+            error (TextField): Текст помилки для failed
+            created_at (DateTimeField): Час постановки в чергу
+            started_at (DateTimeField): Час початку виконання
+            heartbeat_at (DateTimeField): Останній сигнал воркера, що виконує задачу
+            finished_at (DateTimeField): Час завершення
+    """
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (SUCCEEDED, "Succeeded"),
+        (FAILED, "Failed"),
+    ]
+    ACTIVE = (QUEUED, RUNNING)
+
+    name = models.CharField(max_length=200)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["name"],
+                condition=Q(status__in=["queued", "running"]),
+                name="job_active_name_uniq",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["id"], condition=Q(status="queued"), name="job_queued_idx"
+            ),
+        ]
+
+    def __str__(self):
+        """
+            Повертає рядкове представлення задачі.
+
+            Returns:
+                str: Назва та статус задачі
+        """
+        return f"{self.name} ({self.status})"
+
+    @property
+    def is_finished(self) -> bool:
+        """
+            Чи завершилась задача (успішно або з помилкою).
+
+            Returns:
+                bool: True для succeeded та failed
+        """
+        return self.status not in self.ACTIVE
@@ -0,0 +1,182 @@
+"""
+    Черга фонових задач у базі даних.
+
+    Задача - це функція без аргументів, яка ставиться в чергу за шляхом
+    імпорту (enqueue("apps.analytics.jobs.collect_stats")) і виконується
+    воркером manage.py run_jobs. Поки задача з такою назвою очікує або
+    виконується, повторні enqueue повертають її ж (частковий унікальний
+    індекс job_active_name_uniq). Воркер забирає задачу умовним UPDATE,
+    тому кілька воркерів не виконають одну задачу двічі.
+
+    Поки задача виконується, воркер оновлює її heartbeat_at (heartbeat), а
+    задачі без сигналу довше JOBS_TIMEOUT вважаються втраченими (fail_stale).
+
+    Usage:
+        python manage.py run_jobs
+"""
+
+import logging
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, connection, transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue(name: str) -> tuple:
+    """
+        Ставить задачу в чергу або повертає вже активну задачу з тією ж назвою.
+
+        Args:
+            name (str): Шлях до функції задачі (module.function)
+
+        Returns:
+            tuple: (Job, чи створено нову задачу)
+
+        Example:
+            >>> enqueue("apps.analytics.jobs.collect_stats")
+            (<Job: apps.analytics.jobs.collect_stats (queued)>, True)
+    """
+    fail_stale()
+    while True:
+        try:
+            with transaction.atomic():
+                return Job.objects.create(name=name), True
+        except IntegrityError:
+            job = Job.objects.filter(name=name, status__in=Job.ACTIVE).first()
+            # Активна задача могла завершитись між INSERT та SELECT
+            if job is not None:
+                return job, False
+
+
+def fail_stale():
+    """
+        Позначає як failed задачі без heartbeat довше JOBS_TIMEOUT.
+
+        Такі задачі залишаються running, якщо воркер зупинився посеред
+        виконання; без цього вони блокували б нові запуски з тією ж назвою.
+        Живий воркер оновлює heartbeat_at, тому його задача не вважається
+        втраченою, хоч би скільки вона виконувалась.
+
+        Returns:
+            int: Кількість позначених задач
+    """
+    now = timezone.now()
+    return Job.objects.filter(
+        status=Job.RUNNING,
+        heartbeat_at__lt=now - timedelta(seconds=settings.JOBS_TIMEOUT),
+    ).update(status=Job.FAILED, error="Job timed out", finished_at=now)
+
+
+def claim():
+    """
+        Забирає найстарішу задачу з черги.
+
+        Returns:
+            Job | None: Задача в статусі running або None, якщо черга порожня
+    """
+    fail_stale()
+    candidates = Job.objects.filter(status=Job.QUEUED).order_by("id")
+    for job_id in candidates.values_list("id", flat=True)[:10]:
+        now = timezone.now()
+        claimed = Job.objects.filter(id=job_id, status=Job.QUEUED).update(
+            status=Job.RUNNING, started_at=now, heartbeat_at=now
+        )
+        if claimed:
+            return Job.objects.get(id=job_id)
+    return None
+
+
+@contextmanager
+def heartbeat(job: Job):
+    """
+        Оновлює heartbeat_at задачі кожні JOBS_HEARTBEAT_INTERVAL секунд.
+
+        Сигнали надсилає окремий потік з власним з'єднанням, поки виконується
+        блок with.
+
+        Args:
+            job (Job): Задача в статусі running
+    """
+    stop = threading.Event()
+
+    def beat():
+        try:
+            while not stop.wait(settings.JOBS_HEARTBEAT_INTERVAL):
+                try:
+                    Job.objects.filter(id=job.id, status=Job.RUNNING).update(
+                        heartbeat_at=timezone.now()
+                    )
+                except DatabaseError:
+                    logger.warning("Job %s heartbeat failed", job.id, exc_info=True)
+                    connection.close()
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=beat, name=f"job-heartbeat-{job.id}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def run(job: Job):
+    """
+        Виконує задачу та зберігає результат.
+
+        Результат зберігається, лише якщо задача ще running: задачу, яку
+        fail_stale вже позначив як failed, не перезаписує її колишній воркер.
+
+        Args:
+            job (Job): Задача в статусі running
+    """
+    started = time.perf_counter()
+    try:
+        with heartbeat(job):
+            import_string(job.name)()
+    except Exception:
+        logger.exception("Job %s (%s) failed", job.id, job.name)
+        job.status, job.error = Job.FAILED, traceback.format_exc()
+    else:
+        job.status = Job.SUCCEEDED
+        logger.info(
+            "Job %s (%s) finished in %.1fs",
+            job.id,
+            job.name,
+            time.perf_counter() - started,
+        )
+    job.finished_at = timezone.now()
+    saved = Job.objects.filter(id=job.id, status=Job.RUNNING).update(
+        status=job.status, error=job.error, finished_at=job.finished_at
+    )
+    if not saved:
+        logger.warning(
+            "Job %s (%s) is no longer running, result dropped", job.id, job.name
+        )
+
+
+def run_pending() -> int:
+    """
+        Виконує задачі, поки черга не спорожніє.
+
+        Returns:
+            int: Кількість виконаних задач
+    """
+    count = 0
+    while True:
+        job = claim()
+        if job is None:
+            return count
+        run(job)
+        count += 1
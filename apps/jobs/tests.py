@@ -0,0 +1,114 @@
+import time
+from datetime import timedelta
+
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from . import queue
+from .models import Job
+
+CALLS = []
+
+
+def record_call():
+    CALLS.append(Job.objects.get(status=Job.RUNNING).name)
+
+
+def broken():
+    raise RuntimeError("broken job")
+
+
+def slow():
+    # Довше за JOBS_TIMEOUT у HeartbeatTests; інший воркер перевіряє чергу
+    time.sleep(1.5)
+    CALLS.append(queue.fail_stale())
+
+
+def timed_out():
+    # fail_stale іншого воркера позначив задачу як втрачену під час виконання
+    Job.objects.filter(status=Job.RUNNING).update(
+        status=Job.FAILED, error="Job timed out"
+    )
+
+
+class JobQueueTests(TestCase):
+    """
+    Черга фонових задач у базі даних.
+    """
+
+    def setUp(self):
+        CALLS.clear()
+
+    def test_active_jobs_are_deduplicated(self):
+        job, created = queue.enqueue("apps.jobs.tests.record_call")
+        again, created_again = queue.enqueue("apps.jobs.tests.record_call")
+        self.assertTrue(created)
+        self.assertEqual((again.id, created_again), (job.id, False))
+
+        self.assertEqual(queue.run_pending(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.SUCCEEDED)
+        self.assertEqual(CALLS, ["apps.jobs.tests.record_call"])
+        # Завершена задача не блокує новий запуск
+        self.assertTrue(queue.enqueue("apps.jobs.tests.record_call")[1])
+
+    def test_failed_and_stale_jobs(self):
+        job, _ = queue.enqueue("apps.jobs.tests.broken")
+        queue.run_pending()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertIn("RuntimeError: broken job", job.error)
+
+        stale = Job.objects.create(
+            name="apps.jobs.tests.record_call",
+            status=Job.RUNNING,
+            started_at=timezone.now() - timedelta(hours=1),
+            heartbeat_at=timezone.now() - timedelta(hours=1),
+        )
+        with override_settings(JOBS_TIMEOUT=60):
+            job, created = queue.enqueue("apps.jobs.tests.record_call")
+        self.assertTrue(created)
+        stale.refresh_from_db()
+        self.assertEqual(stale.status, Job.FAILED)
+
+    def test_collect_stats_view_enqueues(self):
+        response = self.client.post(reverse("analytics:collect_stats"))
+        self.assertEqual(response.status_code, 202)
+        data = response.json()
+        self.assertEqual(data["status"], Job.QUEUED)
+        self.assertEqual(
+            self.client.post(reverse("analytics:collect_stats")).json()["job"],
+            data["job"],
+        )
+
+        Job.objects.filter(id=data["job"]).update(status=Job.SUCCEEDED)
+        self.assertEqual(
+            self.client.get(data["status_url"]).json()["status"], "success"
+        )
+
+    def test_result_of_failed_job_is_dropped(self):
+        job, _ = queue.enqueue("apps.jobs.tests.timed_out")
+        self.assertEqual(queue.run_pending(), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error), (Job.FAILED, "Job timed out"))
+
+
+@override_settings(JOBS_TIMEOUT=1, JOBS_HEARTBEAT_INTERVAL=0.1)
+class HeartbeatTests(TransactionTestCase):
+    """
+        Задача, що виконується довше JOBS_TIMEOUT, не вважається втраченою.
+    """
+
+    def setUp(self):
+        CALLS.clear()
+
+    def test_running_job_is_not_failed(self):
+        job, _ = queue.enqueue("apps.jobs.tests.slow")
+        self.assertEqual(queue.run_pending(), 1)
+        self.assertEqual(CALLS, [0])
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.SUCCEEDED)
+        self.assertGreater(job.heartbeat_at, job.started_at + timedelta(seconds=1))
+        # Після виконання enqueue створює нову задачу
+        self.assertTrue(queue.enqueue("apps.jobs.tests.slow")[1])
@@ -0,0 +1,112 @@
+"""
+    Пули з'єднань psycopg 3 (DATABASES[...]["OPTIONS"]["pool"]) у воркерах gunicorn.
+
+    Django створює пул процесу при першому запиті до бази. Пул тримає
+    сокети з'єднань і фонові потоки, які не переживають fork, тому master
+    gunicorn закриває свої пули та з'єднання перед fork кожного воркера
+    (gunicorn.conf.py, pre_fork), а воркер відкидає успадковані об'єкти без
+    закриття сокетів (post_fork). Статистика пулів віддається ендпоінтом
+    метрик /api/metrics/ (PoolMetrics реєструє ApiConfig.ready).
+"""
+
+from django.db import connections
+
+from ml.metrics import label
+
+# Поточний стан пулу; інші значення get_stats - лічильники з моменту створення
+GAUGE_STATS = ("pool_min", "pool_max", "pool_size", "pool_available", "requests_waiting")
+
+# Пули та з'єднання батьківського процесу (див. discard_inherited)
+_inherited = []
+
+
+def get_pools() -> dict:
+    """
+        Повертає відкриті пули з'єднань процесу.
+
+        Returns:
+            dict: Псевдонім бази -> psycopg_pool.ConnectionPool
+    """
+    pools = {}
+    for alias in connections:
+        created = getattr(type(connections[alias]), "_connection_pools", {})
+        if alias in created:
+            pools[alias] = created[alias]
+    return pools
+
+
+def close_pools():
+    """
+        Закриває з'єднання та пули процесу.
+
+        Викликається в master-процесі gunicorn перед fork воркера.
+    """
+    connections.close_all()
+    for alias in get_pools():
+        connections[alias].close_pool()
+
+
+def discard_inherited():
+    """
+        Відкидає пули та з'єднання, успадковані від батьківського процесу.
+
+        Сокети не закриваються: ними ще володіє батьківський процес, а
+        закриття з дочірнього надіслало б серверу Terminate. Воркер відкриє
+        власний пул при першому запиті.
+    """
+    for alias, pool in get_pools().items():
+        # Посилання зберігається, щоб збирач сміття не закрив успадковані сокети
+        del type(connections[alias])._connection_pools[alias]
+        _inherited.append(pool)
+    for connection in connections.all(initialized_only=True):
+        if connection.connection is not None:
+            _inherited.append(connection.connection)
+            connection.connection = None
+
+
+def get_stats() -> dict:
+    """
+        Повертає статистику пулів процесу (psycopg_pool get_stats).
+
+        Returns:
+            dict: Псевдонім бази -> словник статистики
+
+        Example:
+            >>> get_stats()
+            {'default': {'pool_min': 2, 'pool_max': 4, 'pool_size': 2, ...}}
+    """
+    return {alias: pool.get_stats() for alias, pool in get_pools().items()}
+
+
+class PoolMetrics:
+    """
+        Метрики Prometheus зі статистики пулів з'єднань.
+
+        Стан пулу (GAUGE_STATS) віддається як gauge db_pool_<назва>,
+        накопичені значення - як counter db_pool_<назва>_total з міткою alias.
+    """
+
+    def render(self) -> list:
+        """
+            Формує рядки метрик у текстовому форматі Prometheus.
+
+            Returns:
+                list: Рядки HELP, TYPE та значення для кожної статистики
+        """
+        series = {}
+        for alias, stats in sorted(get_stats().items()):
+            for key, value in stats.items():
+                series.setdefault(key, []).append((alias, value))
+
+        lines = []
+        for key, values in sorted(series.items()):
+            if key in GAUGE_STATS:
+                name, kind = f"db_pool_{key}", "gauge"
+            else:
+                name, kind = f"db_pool_{key}_total", "counter"
+            lines.append(f"# HELP {name} psycopg_pool statistic {key}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(
+                f'{name}{{{label("alias", alias)}}} {value}' for alias, value in values
+            )
+        return lines
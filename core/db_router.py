@@ -0,0 +1,205 @@
+"""
+    Читання звітних даних з репліки бази (DATABASE_REPLICA).
+
+    Списки заявок у панелі адміністратора та "My Credits", підсумки
+    схвалених кредитів, вивантаження та аналітика допускають невелику
+    затримку даних, тому читаються з репліки. Запис і решта читань завжди
+    йдуть на основну базу.
+
+    Репліка не використовується, якщо:
+        - DATABASE_REPLICA порожній (репліку не налаштовано);
+        - користувач щойно змінив дані (подав, видалив чи змінив заявку або
+          конфігурацію - представлення викликають pin_primary): протягом
+          DATABASE_REPLICA_PIN_SECONDS його запити читають з основної бази,
+          щоб він бачив власні зміни;
+        - відставання репліки перевищує DATABASE_REPLICA_MAX_LAG або репліка
+          недоступна (перевіряється не частіше DATABASE_REPLICA_LAG_CHECK_INTERVAL).
+
+    Example:
+        >>> CreditApplication.objects.using(reporting_db())
+        >>> with reporting():
+        ...     totals = stats.get_totals("approved")
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+# Ключ сесії з часом (unix), до якого запити користувача читають з основної бази
+PIN_SESSION_KEY = "db_primary_until"
+
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+_reporting = ContextVar("reporting", default=False)
+_pinned = ContextVar("pinned_to_primary", default=False)
+
+# Псевдонім репліки -> (час перевірки, чи можна читати з репліки)
+_lag_checks = {}
+_lag_lock = threading.Lock()
+
+
+def replica_lag(alias: str):
+    """
+        Повертає відставання репліки в секундах.
+
+        Args:
+            alias (str): Псевдонім бази репліки
+
+        Returns:
+            float | None: Відставання; 0 для основної бази PostgreSQL та інших
+                СУБД; None, якщо репліка недоступна або ще нічого не відтворила
+    """
+    connection = connections[alias]
+    if connection.vendor != "postgresql":
+        return 0.0
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(REPLICA_LAG_SQL)
+            (lag,) = cursor.fetchone()
+    except DatabaseError:
+        logger.warning("Replica %s is unavailable", alias, exc_info=True)
+        return None
+    return None if lag is None else float(lag)
+
+
+def replica_available(alias: str) -> bool:
+    """
+        Перевіряє відставання репліки з кешуванням результату в процесі.
+
+        Args:
+            alias (str): Псевдонім бази репліки
+
+        Returns:
+            bool: True, якщо відставання не перевищує DATABASE_REPLICA_MAX_LAG
+    """
+    now = time.monotonic()
+    checked = _lag_checks.get(alias)
+    if checked and now - checked[0] < settings.DATABASE_REPLICA_LAG_CHECK_INTERVAL:
+        return checked[1]
+
+    with _lag_lock:
+        checked = _lag_checks.get(alias)
+        if checked and now - checked[0] < settings.DATABASE_REPLICA_LAG_CHECK_INTERVAL:
+            return checked[1]
+        lag = replica_lag(alias)
+        available = lag is not None and lag <= settings.DATABASE_REPLICA_MAX_LAG
+        if not available:
+            logger.warning("Reading from primary: replica %s lag is %s s", alias, lag)
+        _lag_checks[alias] = (time.monotonic(), available)
+    return available
+
+
+def reporting_db() -> str:
+    """
+        Повертає базу для звітних читань поточного запиту.
+
+        Для QuerySet, які виконуються пізніше (пагінація в шаблоні,
+        StreamingHttpResponse), базу потрібно вибрати одразу через using().
+
+        Returns:
+            str: DATABASE_REPLICA або DEFAULT_DB_ALIAS
+    """
+    alias = settings.DATABASE_REPLICA
+    if not alias or _pinned.get() or not replica_available(alias):
+        return DEFAULT_DB_ALIAS
+    return alias
+
+
+@contextmanager
+def reporting():
+    """
+        Направляє читання всередині блоку на reporting_db (через ReplicaRouter).
+
+        Можна використовувати як декоратор функції, яка виконує запити одразу.
+    """
+    token = _reporting.set(True)
+    try:
+        yield
+    finally:
+        _reporting.reset(token)
+
+
+def pin_primary(request):
+    """
+        Направляє читання користувача на основну базу на DATABASE_REPLICA_PIN_SECONDS.
+
+        Викликається представленнями після запису в базу. Без репліки
+        нічого не робить, тому сесія не змінюється.
+
+        Args:
+            request (HttpRequest): HTTP запит з сесією
+    """
+    if not settings.DATABASE_REPLICA:
+        return
+    request.session[PIN_SESSION_KEY] = time.time() + settings.DATABASE_REPLICA_PIN_SECONDS
+    _pinned.set(True)
+
+
+class ReplicaRouter:
+    """
+        Роутер бази для звітних читань.
+
+        Усередині reporting() читання йдуть на reporting_db(), поза ним
+        роутер не має думки, і Django використовує основну базу. Міграції
+        на репліці не виконуються.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _reporting.get():
+            return reporting_db()
+        return None
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, settings.DATABASE_REPLICA}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == settings.DATABASE_REPLICA:
+            return False
+        return None
+
+
+class PrimaryPinMiddleware:
+    """
+        Read-your-writes для користувачів, які щойно змінили дані.
+
+        Запити користувача, якого представлення закріпило за основною базою
+        (pin_primary після запису), протягом DATABASE_REPLICA_PIN_SECONDS
+        читають з основної бази. Запити без запису (зокрема POST кроків
+        майстра та /api/get_predict/) сесію не змінюють.
+        Має стояти після SessionMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _pinned.set(self.is_pinned(request))
+        try:
+            return self.get_response(request)
+        finally:
+            _pinned.reset(token)
+
+    @staticmethod
+    def is_pinned(request) -> bool:
+        if not settings.DATABASE_REPLICA:
+            return False
+        return request.session.get(PIN_SESSION_KEY, 0) > time.time()
@@ -36,7 +36,14 @@ DJANGO_APPS = [
 
 THIRD_PARTY_APPS = ["corsheaders", "formtools", "django_filters", "rest_framework"]
 
-LOCAL_APPS = ["apps.accounts", "apps.credits", "apps.analytics", "apps.api", "apps.docs"]
+LOCAL_APPS = [
+    "apps.accounts",
+    "apps.credits",
+    "apps.analytics",
+    "apps.api",
+    "apps.docs",
+    "apps.jobs",
+]
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
@@ -48,6 +55,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.db_router.PrimaryPinMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -73,6 +81,18 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "core.wsgi.application"
 
+# Пул з'єднань psycopg 3 у кожному воркері (DB_POOL=False - окреме з'єднання
+# на запит або постійне з'єднання на потік з DB_CONN_MAX_AGE). Воркер gunicorn
+# має 2 потоки, тому max_size 4 залишає запас для фонових задач.
+DB_POOL = config("DB_POOL", default=True, cast=bool)
+DB_POOL_MIN_SIZE = config("DB_POOL_MIN_SIZE", default=2, cast=int)
+DB_POOL_MAX_SIZE = config("DB_POOL_MAX_SIZE", default=4, cast=int)
+# Очікування вільного з'єднання (секунди) та час життя з'єднань у пулі
+DB_POOL_TIMEOUT = config("DB_POOL_TIMEOUT", default=10, cast=float)
+DB_POOL_MAX_IDLE = config("DB_POOL_MAX_IDLE", default=300, cast=float)
+DB_POOL_MAX_LIFETIME = config("DB_POOL_MAX_LIFETIME", default=1800, cast=float)
+DB_CONN_MAX_AGE = config("DB_CONN_MAX_AGE", default=0, cast=int)
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -81,6 +101,22 @@ DATABASES = {
         "PASSWORD": config("POSTGRES_PASSWORD", "postgres"),
         "HOST": config("POSTGRES_HOST", "localhost"),
         "PORT": config("POSTGRES_PORT", 5432),
+        # Перевірка з'єднання перед видачею з пулу (або перед повторним
+        # використанням постійного з'єднання)
+        "CONN_HEALTH_CHECKS": True,
+        "CONN_MAX_AGE": 0 if DB_POOL else DB_CONN_MAX_AGE,
+        "OPTIONS": {
+            "pool": {
+                "name": "default",
+                "min_size": DB_POOL_MIN_SIZE,
+                "max_size": DB_POOL_MAX_SIZE,
+                "timeout": DB_POOL_TIMEOUT,
+                "max_idle": DB_POOL_MAX_IDLE,
+                "max_lifetime": DB_POOL_MAX_LIFETIME,
+            }
+        }
+        if DB_POOL
+        else {},
     },
     "extra": {
         "ENGINE": "django.db.backends.sqlite3",
@@ -88,6 +124,36 @@ DATABASES = {
     },
 }
 
+# Репліка PostgreSQL для звітних читань (core/db_router.py). DATABASE_REPLICA -
+# псевдонім бази, з якої читаються списки заявок, підсумки, вивантаження та
+# аналітика (порожній - все читається з default)
+POSTGRES_REPLICA_HOST = config("POSTGRES_REPLICA_HOST", default="")
+if POSTGRES_REPLICA_HOST:
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": POSTGRES_REPLICA_HOST,
+        "PORT": config("POSTGRES_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        "OPTIONS": {
+            "pool": {**DATABASES["default"]["OPTIONS"]["pool"], "name": "replica"}
+        }
+        if DB_POOL
+        else {},
+        "TEST": {"MIRROR": "default"},
+    }
+DATABASE_REPLICA = config(
+    "DATABASE_REPLICA", default="replica" if POSTGRES_REPLICA_HOST else ""
+)
+# Максимальне відставання репліки (секунди), після якого читання йдуть на default,
+# та як часто воно перевіряється
+DATABASE_REPLICA_MAX_LAG = config("DATABASE_REPLICA_MAX_LAG", default=5, cast=float)
+DATABASE_REPLICA_LAG_CHECK_INTERVAL = config(
+    "DATABASE_REPLICA_LAG_CHECK_INTERVAL", default=2, cast=float
+)
+# Скільки секунд після зміни заявки чи конфігурації користувач читає з default
+DATABASE_REPLICA_PIN_SECONDS = config("DATABASE_REPLICA_PIN_SECONDS", default=15, cast=float)
+
+DATABASE_ROUTERS = ["core.db_router.ReplicaRouter"]
+
 CACHES = {
     "default": {
         "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
@@ -148,3 +214,73 @@ REST_FRAMEWORK = {
         "rest_framework.parsers.FileUploadParser",
     ),
 }
+
+# ORDERS
+# Пагінація списків заявок: "cursor" (keyset за created_at, id) або "page" (номери сторінок)
+ORDERS_PAGINATION = config("ORDERS_PAGINATION", default="cursor")
+# Показувати оцінку кількості заявок (pg_class.reltuples / EXPLAIN) у режимі "cursor"
+ORDERS_ESTIMATED_TOTAL = config("ORDERS_ESTIMATED_TOTAL", default=False, cast=bool)
+# Каталог стиснутих CSV архівів партицій заявок (manage.py partition_applications)
+ORDERS_ARCHIVE_DIR = config("ORDERS_ARCHIVE_DIR", default=os.path.join(BASE_DIR, "archive"))
+
+# JOBS
+# Як часто воркер (manage.py run_jobs) перевіряє порожню чергу, секунди
+JOBS_POLL_INTERVAL = config("JOBS_POLL_INTERVAL", default=2, cast=float)
+# Як часто воркер оновлює heartbeat_at задачі, що виконується, секунди
+JOBS_HEARTBEAT_INTERVAL = config("JOBS_HEARTBEAT_INTERVAL", default=60, cast=float)
+# Задачі без heartbeat довше за цей час (воркер зупинився) позначаються як failed
+JOBS_TIMEOUT = config("JOBS_TIMEOUT", default=1800, cast=int)
+
+# ANALYTICS
+# Кількість процесів для рендерингу графіків аналітики
+# (0 - за кількістю доступних ядер, 1 - у поточному процесі)
+ANALYTICS_PROCESSES = config("ANALYTICS_PROCESSES", default=0, cast=int)
+
+# Кеш графіків і статистики аналітики за хешем вхідних даних та коду графіків
+# (порожній - вимкнено; каталог можна видалити будь-коли)
+ANALYTICS_CACHE_DIR = config(
+    "ANALYTICS_CACHE_DIR", default=os.path.join(BASE_DIR, "analytics_cache")
+)
+
+# ML PREDICTION
+# Завантажувати моделі при імпорті core.wsgi (у master-процесі gunicorn --preload)
+ML_PRELOAD = config("ML_PRELOAD", default=True, cast=bool)
+
+# Кількість рядків, що оцінюються ансамблем за один виклик у пакетному API
+PREDICTION_BATCH_CHUNK_SIZE = config("PREDICTION_BATCH_CHUNK_SIZE", default=500, cast=int)
+
+# Кеш результатів прогнозування в пам'яті процесу (0 - вимкнено)
+# Статистика кешу (prediction_cache_*) віддається на /api/metrics/
+PREDICTION_CACHE_SIZE = config("PREDICTION_CACHE_SIZE", default=0, cast=int)
+PREDICTION_CACHE_TTL = config("PREDICTION_CACHE_TTL", default=300, cast=int)
+
+# Мікробатчинг одночасних запитів: максимальне очікування пакету в мс (0 - вимкнено),
+# максимальний розмір пакету та глибина черги
+PREDICTION_BATCH_WAIT_MS = config("PREDICTION_BATCH_WAIT_MS", default=0, cast=float)
+PREDICTION_BATCH_MAX_SIZE = config("PREDICTION_BATCH_MAX_SIZE", default=32, cast=int)
+PREDICTION_BATCH_QUEUE_SIZE = config("PREDICTION_BATCH_QUEUE_SIZE", default=1024, cast=int)
+
+# Unix сокет сервера інференсу (python -m ml.inference_server); якщо порожній,
+# моделі завантажуються в кожному воркері
+INFERENCE_SOCKET = config("INFERENCE_SOCKET", default="")
+
+# Як часто (секунди) воркер перевіряє покажчик ml_data/current на нову версію моделей (0 - ніколи)
+MODEL_RELOAD_INTERVAL = config("MODEL_RELOAD_INTERVAL", default=5, cast=float)
+
+# Адреси, з яких доступний ендпоінт метрик /api/metrics/
+METRICS_ALLOWED_IPS = config("METRICS_ALLOWED_IPS", default="127.0.0.1,::1").split(",")
+
+# LOGGING
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "simple": {"format": "%(asctime)s - %(levelname)s - %(name)s - %(message)s"},
+    },
+    "handlers": {
+        "console": {"class": "logging.StreamHandler", "formatter": "simple"},
+    },
+    "loggers": {
+        "ml": {"handlers": ["console"], "level": "INFO", "propagate": False},
+    },
+}
@@ -9,8 +9,20 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
 
 application = get_wsgi_application()
+
+# При запуску gunicorn з --preload модуль імпортується один раз у master-процесі,
+# тому завантажені тут моделі спільно використовуються воркерами після fork.
+# URLconf імпортується заздалегідь з тієї ж причини: views тягнуть за собою
+# pandas, sklearn та matplotlib, які інакше імпортувалися б у кожному воркері.
+if settings.ML_PRELOAD:
+    from django.urls import get_resolver
+    from ml.services import preload_ensemble
+
+    get_resolver().url_patterns
+    preload_ensemble()
@@ -0,0 +1,29 @@
+"""
+    Налаштування gunicorn (entrypoint.sh: gunicorn -c gunicorn.conf.py).
+
+    Застосунок завантажується в master-процесі (preload_app) разом з
+    моделями (див. core/wsgi.py), після чого воркери створюються fork.
+    Пули з'єднань psycopg 3 не переживають fork, тому master закриває їх
+    перед кожним fork, а воркер відкидає все успадковане (core/db_pool.py).
+"""
+
+wsgi_app = "core.wsgi:application"
+bind = "0.0.0.0:8000"
+workers = 2
+threads = 2
+# Графіки аналітики будуються воркером черги (apps.jobs), тому запити
+# не виконуються довго; завислий воркер перезапускається за хвилину
+timeout = 60
+preload_app = True
+
+
+def pre_fork(server, worker):
+    from core import db_pool
+
+    db_pool.close_pools()
+
+
+def post_fork(server, worker):
+    from core import db_pool
+
+    db_pool.discard_inherited()
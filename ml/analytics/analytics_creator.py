@@ -1,9 +1,8 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import warnings
 import os
 import sys
+import time
 
 import django
 
@@ -20,7 +19,10 @@ django.setup()
 from django.conf import settings
 
 warnings.filterwarnings("ignore")
-from . import graphs
+from ml.cleaning import clean_applications
+from . import cache
+from .graphs.storage import save_graphs
+from .rendering import GRAPHS, render_graphs
 
 
 import logging
@@ -58,9 +60,15 @@ def get_analytics():
             3. Заповнення пропущених значень (мода для категоріальних, медіана для числових)
             4. Трансформація змінних (Dependents, Loan_Status)
             5. Створення інженерної ознаки Total_Income
-            6. Генерація 12 типів графіків аналітики
+            6. Генерація 12 типів графіків аналітики паралельно в пулі процесів
+               (ml.analytics.rendering, ANALYTICS_PROCESSES)
             7. Логування процесу та результатів
 
+        Якщо CSV файл і код графіків не змінились з попереднього запуску,
+        кроки 2-6 пропускаються, а графіки копіюються з кешу
+        (ml.analytics.cache, ANALYTICS_CACHE_DIR). Якщо змінилась частина
+        даних, рендеряться лише графіки, чиї вхідні колонки змінились.
+
         Створювані графіки:
             01. Розподіл статусу кредиту (pie chart)
             02. Кореляційна матриця (heatmap)
@@ -104,56 +112,37 @@ def get_analytics():
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
-    df = pd.read_csv(os.path.join(project_root, "ml", "loan_data.csv"))
-
-    categorical_columns = [
-        "Gender",
-        "Married",
-        "Dependents",
-        "Education",
-        "Self_Employed",
-        "Property_Area",
-    ]
-    numerical_columns = [
-        "ApplicantIncome",
-        "CoapplicantIncome",
-        "LoanAmount",
-        "Loan_Amount_Term",
-        "Credit_History",
-    ]
-
-    for col in categorical_columns:
-        if df[col].isnull().sum() > 0:
-            df[col].fillna(df[col].mode()[0], inplace=True)
-
-    for col in numerical_columns:
-        if df[col].isnull().sum() > 0:
-            df[col].fillna(df[col].median(), inplace=True)
-
-    df["Dependents"] = df["Dependents"].replace("3+", "3").astype(int)
+    csv_path = os.path.join(project_root, "ml", "loan_data.csv")
+    dataset_key = None
+    if cache.enabled():
+        started = time.perf_counter()
+        dataset_key = cache.dataset_key(csv_path, GRAPHS)
+        records = cache.restore_dataset(dataset_key, output_dir, images_dir)
+        if records is not None:
+            save_graphs(records)
+            root_logger.info(
+                f"Дані не змінились: {len(records)} графіків відновлено з кешу "
+                f"за {(time.perf_counter() - started) * 1000:.0f} мс"
+            )
+            return
+
+    df = pd.read_csv(csv_path)
+
+    df = clean_applications(df)
     df["Loan_Status_Binary"] = df["Loan_Status"].map({"Y": 1, "N": 0})
     df["Total_Income"] = df["ApplicantIncome"] + df["CoapplicantIncome"]
 
-    sns.set_style("whitegrid")
-    plt.rcParams["font.size"] = 11
-
     root_logger.info("Починаю створення графіків...")
     root_logger.info("=" * 50)
 
-    graphs.pie_chart_graph(df, output_dir, root_logger, images_dir)
-    corr_matrix = graphs.correlation(df, output_dir, root_logger, images_dir)
-    graphs.credit_history_graph(df, output_dir, root_logger, images_dir)
-    graphs.married_graph(df, output_dir, root_logger, images_dir)
-    graphs.property_area_graph(df, output_dir, root_logger, images_dir)
-    graphs.education_graph(df, output_dir, root_logger, images_dir)
-    graphs.dependents_graph(df, output_dir, root_logger, images_dir)
-    graphs.self_employed_graph(df, output_dir, root_logger, images_dir)
-    graphs.correlation_matrix_graph(output_dir, corr_matrix, root_logger, images_dir)
-    graphs.total_income_graph(df, output_dir, root_logger, images_dir)
-    graphs.chi_square_graph(df, output_dir, root_logger, images_dir)
-    graphs.mutual_score_graph(df, output_dir, root_logger, images_dir)
+    started = time.perf_counter()
+    timings = render_graphs(df, output_dir, images_dir, dataset_key=dataset_key)
 
     root_logger.info("=" * 50)
+    root_logger.info(
+        f"Графіки створено за {time.perf_counter() - started:.1f} с "
+        f"(рендеринг {len(timings)} графіків, сума часу {sum(timings.values()):.1f} с)"
+    )
     root_logger.info(f"✅ Усі графіки збережено в папку '{output_dir}/'")
     root_logger.info(f"Створено 12 графіків:")
     root_logger.info("  01_loan_distribution.png")
@@ -0,0 +1,320 @@
+"""
+    Кеш результатів аналітики за хешем вхідних даних і коду графіків.
+
+    Кожен графік кешується окремо під ключем з:
+        - хешу колонок підготовленого датасету, від яких він залежить
+          (COLUMNS модуля графіка);
+        - хешу коду модуля графіка (та модулів ml.analytics.graphs, з яких
+          він імпортує функції) і спільного коду рендерингу;
+        - версій pandas, matplotlib, seaborn, scikit-learn та scipy.
+    Запис містить PNG файл, розраховану статистику графіка (таблицю
+    співвідношень, матрицю кореляцій, таблицю хі-квадрат, MI scores) та
+    записи AnalyticGraph. Якщо змінилась частина даних, повторно
+    рендеряться лише графіки, чиї колонки змінились.
+
+    Крім того, за хешем CSV файлу та коду підготовки даних зберігається
+    маніфест ключів усіх графіків: повторний запуск з незміненим файлом
+    не читає CSV і лише відновлює PNG файли з кешу.
+
+    Структура ANALYTICS_CACHE_DIR:
+        graphs/<графік>/<ключ>/{<файл>.png, stats.pkl, records.json}
+        datasets/<ключ датасету>.json
+
+    Example:
+        >>> key = graph_key("pie_chart_graph", df)
+        >>> load("pie_chart_graph", key)
+        [('pie_chart', '01_loan_distribution.png')]
+        >>> load_stats("pie_chart_graph", key)
+        Loan_Status
+        Y    422
+        N    192
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import sys
+import tempfile
+from functools import lru_cache
+from importlib.metadata import PackageNotFoundError, version
+
+import pandas as pd
+from django.conf import settings
+
+from ml import cleaning
+
+from . import graphs
+
+# Бібліотеки, від версії яких залежить статистика та вигляд графіків
+LIBRARIES = ("pandas", "matplotlib", "seaborn", "scikit-learn", "scipy")
+
+STATS_FILE = "stats.pkl"
+RECORDS_FILE = "records.json"
+
+
+def enabled() -> bool:
+    """
+        Повертає True, якщо кеш увімкнено (ANALYTICS_CACHE_DIR не порожній).
+    """
+    return bool(settings.ANALYTICS_CACHE_DIR)
+
+
+def _hash_files(*paths) -> hashlib.sha256:
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest
+
+
+@lru_cache(maxsize=None)
+def _libraries() -> str:
+    versions = []
+    for library in LIBRARIES:
+        try:
+            versions.append(f"{library}={version(library)}")
+        except PackageNotFoundError:
+            versions.append(f"{library}=")
+    return ";".join(versions)
+
+
+def _graph_modules(name: str) -> list:
+    module = sys.modules[getattr(graphs, name).__module__]
+    modules = {module}
+    for value in vars(module).values():
+        source = sys.modules.get(getattr(value, "__module__", None) or "")
+        if source is not None and source.__name__.startswith(graphs.__name__ + "."):
+            modules.add(source)
+    return sorted(modules, key=lambda m: m.__name__)
+
+
+@lru_cache(maxsize=None)
+def code_version(name: str) -> str:
+    """
+        Повертає хеш коду, який створює графік.
+
+        Розраховується один раз на процес: змінений код усе одно
+        підхоплюється лише після перезапуску.
+
+        Args:
+            name (str): Назва функції графіка з ml.analytics.graphs
+
+        Returns:
+            str: sha256 коду модуля графіка, його залежностей у пакеті
+                graphs, модуля рендерингу та версій бібліотек
+    """
+    from . import rendering
+
+    paths = [inspect.getfile(m) for m in _graph_modules(name)]
+    digest = _hash_files(*paths, inspect.getfile(rendering))
+    digest.update(_libraries().encode())
+    return digest.hexdigest()
+
+
+def graph_key(name: str, df: pd.DataFrame) -> str:
+    """
+        Будує ключ кешу графіка за його вхідними колонками та кодом.
+
+        Args:
+            name (str): Назва функції графіка з ml.analytics.graphs
+            df (pd.DataFrame): Підготовлений датасет
+
+        Returns:
+            str: Ключ кешу (sha256 у шістнадцятковому вигляді)
+    """
+    columns = sys.modules[getattr(graphs, name).__module__].COLUMNS
+    data = df[columns]
+    digest = hashlib.sha256(code_version(name).encode())
+    digest.update(json.dumps([[c, str(t)] for c, t in data.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(data, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+def dataset_key(csv_path: str, names: list) -> str:
+    """
+        Будує ключ маніфесту за CSV файлом і кодом підготовки даних та графіків.
+
+        Args:
+            csv_path (str): Шлях до вхідного CSV файлу
+            names (list): Назви функцій графіків
+
+        Returns:
+            str: Ключ датасету (sha256 у шістнадцятковому вигляді)
+    """
+    from . import analytics_creator
+
+    digest = _hash_files(
+        csv_path, inspect.getfile(cleaning), inspect.getfile(analytics_creator)
+    )
+    for name in names:
+        digest.update(f"{name}:{code_version(name)}".encode())
+    return digest.hexdigest()
+
+
+def _entry_dir(name: str, key: str) -> str:
+    return os.path.join(settings.ANALYTICS_CACHE_DIR, "graphs", name, key)
+
+
+def _dataset_path(key: str) -> str:
+    return os.path.join(settings.ANALYTICS_CACHE_DIR, "datasets", f"{key}.json")
+
+
+def load(name: str, key: str):
+    """
+        Повертає записи AnalyticGraph із запису кешу графіка.
+
+        Args:
+            name (str): Назва функції графіка
+            key (str): Ключ кешу (graph_key)
+
+        Returns:
+            list | None: Пари (назва AnalyticGraph, ім'я PNG файлу) або None,
+                якщо запису немає
+    """
+    try:
+        with open(
+            os.path.join(_entry_dir(name, key), RECORDS_FILE), encoding="utf-8"
+        ) as f:
+            return [tuple(record) for record in json.load(f)]
+    except FileNotFoundError:
+        return None
+
+
+def load_stats(name: str, key: str):
+    """
+        Повертає статистику, яку розрахувала функція графіка.
+
+        Args:
+            name (str): Назва функції графіка
+            key (str): Ключ кешу (graph_key)
+
+        Returns:
+            pd.DataFrame | pd.Series: Статистика графіка
+
+        Raises:
+            FileNotFoundError: Якщо запису немає
+    """
+    return pd.read_pickle(os.path.join(_entry_dir(name, key), STATS_FILE))
+
+
+def store(name: str, key: str, records: list, stats, output_dir: str):
+    """
+        Зберігає PNG файли, статистику та записи AnalyticGraph графіка.
+
+        Запис спочатку створюється в тимчасовому каталозі та переноситься
+        одним rename, тому паралельні запуски не бачать неповних записів.
+
+        Args:
+            name (str): Назва функції графіка
+            key (str): Ключ кешу (graph_key)
+            records (list): Пари (назва AnalyticGraph, шлях до зображення)
+            stats: Статистика, яку повернула функція графіка
+            output_dir (str): Каталог, куди графік зберіг PNG файли
+    """
+    directory = _entry_dir(name, key)
+    if os.path.isdir(directory):
+        return
+    os.makedirs(os.path.dirname(directory), exist_ok=True)
+    staging = tempfile.mkdtemp(dir=os.path.dirname(directory))
+    try:
+        files = []
+        for graph_name, image_path in records:
+            file_name = os.path.basename(image_path)
+            shutil.copyfile(
+                os.path.join(output_dir, file_name), os.path.join(staging, file_name)
+            )
+            files.append((graph_name, file_name))
+        pd.to_pickle(stats, os.path.join(staging, STATS_FILE))
+        with open(os.path.join(staging, RECORDS_FILE), "w", encoding="utf-8") as f:
+            json.dump(files, f)
+        os.rename(staging, directory)
+    except OSError:
+        # Інший процес уже зберіг цей запис
+        shutil.rmtree(staging, ignore_errors=True)
+        if not os.path.isdir(directory):
+            raise
+
+
+def restore(name: str, key: str, files: list, output_dir: str, images_dir: str) -> list:
+    """
+        Копіює PNG файли запису кешу в каталог графіків.
+
+        Args:
+            name (str): Назва функції графіка
+            key (str): Ключ кешу (graph_key)
+            files (list): Записи кешу графіка (load)
+            output_dir (str): Каталог для PNG файлів
+            images_dir (str): Каталог зображень відносно MEDIA_ROOT
+
+        Returns:
+            list: Пари (назва AnalyticGraph, шлях до зображення) для save_graph
+    """
+    directory = _entry_dir(name, key)
+    records = []
+    for graph_name, file_name in files:
+        shutil.copyfile(
+            os.path.join(directory, file_name), os.path.join(output_dir, file_name)
+        )
+        records.append((graph_name, os.path.join(images_dir, file_name)))
+    return records
+
+
+def load_dataset(key: str):
+    """
+        Повертає маніфест ключів графіків для ключа датасету.
+
+        Args:
+            key (str): Ключ датасету (dataset_key)
+
+        Returns:
+            dict | None: Назва функції графіка -> ключ кешу графіка
+    """
+    try:
+        with open(_dataset_path(key), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def store_dataset(key: str, keys: dict):
+    """
+        Зберігає маніфест ключів графіків для ключа датасету.
+
+        Args:
+            key (str): Ключ датасету (dataset_key)
+            keys (dict): Назва функції графіка -> ключ кешу графіка
+    """
+    path = _dataset_path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    staging = f"{path}.{os.getpid()}.tmp"
+    with open(staging, "w", encoding="utf-8") as f:
+        json.dump(keys, f)
+    os.replace(staging, path)
+
+
+def restore_dataset(key: str, output_dir: str, images_dir: str):
+    """
+        Відновлює всі графіки датасету з кешу без читання CSV файлу.
+
+        Args:
+            key (str): Ключ датасету (dataset_key)
+            output_dir (str): Каталог для PNG файлів
+            images_dir (str): Каталог зображень відносно MEDIA_ROOT
+
+        Returns:
+            list | None: Пари (назва AnalyticGraph, шлях до зображення) або None,
+                якщо маніфесту чи запису якогось графіка немає
+    """
+    keys = load_dataset(key)
+    if keys is None:
+        return None
+    entries = {name: load(name, graph) for name, graph in keys.items()}
+    if None in entries.values():
+        return None
+    records = []
+    for name, files in entries.items():
+        records.extend(restore(name, keys[name], files, output_dir, images_dir))
+    return records
@@ -1,5 +1,5 @@
 from .analytics_1 import pie_chart_graph
-from .analytics_2 import correlation
+from .analytics_2 import correlation, numeric_correlation
 from .analytics_3 import credit_history_graph
 from .analytics_4 import married_graph
 from .analytics_5 import property_area_graph
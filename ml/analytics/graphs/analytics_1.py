@@ -1,11 +1,14 @@
 import os
 import matplotlib
 
-from apps.analytics.models import AnalyticGraph
+from .storage import save_graph
 
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 
+# Колонки датасету, від яких залежить графік
+COLUMNS = ["Loan_Status"]
+
 
 def pie_chart_graph(df, output_dir, logger, images_dir):
     logger.info("1. Створення pie chart...")
@@ -25,6 +28,5 @@ def pie_chart_graph(df, output_dir, logger, images_dir):
     plt.savefig(os.path.join(output_dir, file_name), dpi=150, bbox_inches="tight")
     plt.close()
     relative_path = os.path.join(images_dir, file_name)
-    AnalyticGraph.objects.get_or_create(
-        name="pie_chart", defaults={"image_path": relative_path}
-    )
+    save_graph("pie_chart", relative_path)
+    return approval_counts
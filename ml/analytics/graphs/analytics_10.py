@@ -1,12 +1,15 @@
 import os
 import matplotlib
 
-from apps.analytics.models import AnalyticGraph
+from .storage import save_graph
 
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 import pandas as pd
 
+# Колонки датасету, від яких залежить графік
+COLUMNS = ["Total_Income", "Loan_Status"]
+
 
 def total_income_graph(df, output_dir, logger, images_dir):
     logger.info("10. Створення графіка категорій доходу...")
@@ -35,6 +38,5 @@ def total_income_graph(df, output_dir, logger, images_dir):
     plt.savefig(os.path.join(output_dir, file_name), dpi=150, bbox_inches="tight")
     plt.close()
     relative_path = os.path.join(images_dir, file_name)
-    AnalyticGraph.objects.get_or_create(
-        name="income_category_chart", defaults={"image_path": relative_path}
-    )
+    save_graph("income_category_chart", relative_path)
+    return income_approval
@@ -2,27 +2,31 @@ import os
 import pandas as pd
 import matplotlib
 
-from apps.analytics.models import AnalyticGraph
+from .storage import save_graph
 
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 from scipy.stats import chi2_contingency
 
+CATEGORICAL_FEATURES = [
+    "Gender",
+    "Married",
+    "Dependents",
+    "Education",
+    "Self_Employed",
+    "Property_Area",
+    "Credit_History",
+]
+
+# Колонки датасету, від яких залежить графік
+COLUMNS = CATEGORICAL_FEATURES + ["Loan_Status"]
+
 
 def chi_square_graph(df, output_dir, logger, images_dir):
     logger.info("11. Створення графіка Chi-square...")
     plt.figure(figsize=(12, 8))
-    categorical_features = [
-        "Gender",
-        "Married",
-        "Dependents",
-        "Education",
-        "Self_Employed",
-        "Property_Area",
-        "Credit_History",
-    ]
     chi_square_results = []
-    for feature in categorical_features:
+    for feature in CATEGORICAL_FEATURES:
         contingency_table = pd.crosstab(df[feature], df["Loan_Status"])
         chi2, p_value, dof, expected = chi2_contingency(contingency_table)
         chi_square_results.append(
@@ -47,6 +51,5 @@ def chi_square_graph(df, output_dir, logger, images_dir):
     plt.savefig(os.path.join(output_dir, file_name), dpi=150, bbox_inches="tight")
     plt.close()
     relative_path = os.path.join(images_dir, file_name)
-    AnalyticGraph.objects.get_or_create(
-        name="chi_square_graph", defaults={"image_path": relative_path}
-    )
+    save_graph("chi_square_graph", relative_path)
+    return chi_df
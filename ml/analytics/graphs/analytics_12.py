@@ -2,50 +2,54 @@ import os
 import pandas as pd
 import matplotlib
 
-from apps.analytics.models import AnalyticGraph
+from .storage import save_graph
 
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 from sklearn.preprocessing import LabelEncoder
 from sklearn.feature_selection import mutual_info_classif
 
+CATEGORICAL_COLS = [
+    "Gender",
+    "Married",
+    "Education",
+    "Self_Employed",
+    "Property_Area",
+]
+
+FEATURES_FOR_MI = [
+    "Gender",
+    "Married",
+    "Dependents",
+    "Education",
+    "Self_Employed",
+    "ApplicantIncome",
+    "CoapplicantIncome",
+    "LoanAmount",
+    "Loan_Amount_Term",
+    "Credit_History",
+    "Property_Area",
+]
+
+# Колонки датасету, від яких залежить графік
+COLUMNS = FEATURES_FOR_MI + ["Loan_Status_Binary"]
+
 
 def mutual_score_graph(df, output_dir, logger, images_dir):
     logger.info("12. Створення графіка Mutual Information...")
     plt.figure(figsize=(12, 8))
     le = LabelEncoder()
     X_encoded = df.copy()
-    categorical_cols = [
-        "Gender",
-        "Married",
-        "Education",
-        "Self_Employed",
-        "Property_Area",
-    ]
-    for col in categorical_cols:
+    for col in CATEGORICAL_COLS:
         X_encoded[col] = le.fit_transform(X_encoded[col])
 
-    features_for_mi = [
-        "Gender",
-        "Married",
-        "Dependents",
-        "Education",
-        "Self_Employed",
-        "ApplicantIncome",
-        "CoapplicantIncome",
-        "LoanAmount",
-        "Loan_Amount_Term",
-        "Credit_History",
-        "Property_Area",
-    ]
-
-    X_mi = X_encoded[features_for_mi]
+    X_mi = X_encoded[FEATURES_FOR_MI]
     mi_scores = mutual_info_classif(
         X_mi, X_encoded["Loan_Status_Binary"], random_state=42
     )
 
     mi_results = pd.DataFrame(
-        {"Feature": features_for_mi, "MI_Score": mi_scores}
+        {"Feature": FEATURES_FOR_MI, "MI_Score": mi_scores}
     ).sort_values("MI_Score", ascending=True)
 
     colors_mi = plt.cm.RdYlGn(
@@ -65,6 +69,5 @@ def mutual_score_graph(df, output_dir, logger, images_dir):
     plt.savefig(os.path.join(output_dir, file_name), dpi=150, bbox_inches="tight")
     plt.close()
     relative_path = os.path.join(images_dir, file_name)
-    AnalyticGraph.objects.get_or_create(
-        name="mutual_information", defaults={"image_path": relative_path}
-    )
+    save_graph("mutual_information", relative_path)
+    return mi_results
@@ -2,24 +2,32 @@ import os
 import seaborn as sns
 import matplotlib
 
-from apps.analytics.models import AnalyticGraph
+from .storage import save_graph
 
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 
+NUMERICAL_FOR_CORR = [
+    "ApplicantIncome",
+    "CoapplicantIncome",
+    "LoanAmount",
+    "Loan_Amount_Term",
+    "Credit_History",
+    "Dependents",
+]
+
+# Колонки датасету, від яких залежить графік
+COLUMNS = NUMERICAL_FOR_CORR + ["Loan_Status_Binary"]
+
+
+def numeric_correlation(df):
+    return df[COLUMNS].corr()
+
 
 def correlation(df, output_dir, logger, images_dir):
     logger.info("2. Створення кореляційної матриці...")
     plt.figure(figsize=(12, 10))
-    numerical_for_corr = [
-        "ApplicantIncome",
-        "CoapplicantIncome",
-        "LoanAmount",
-        "Loan_Amount_Term",
-        "Credit_History",
-        "Dependents",
-    ]
-    correlation_matrix = df[numerical_for_corr + ["Loan_Status_Binary"]].corr()
+    correlation_matrix = numeric_correlation(df)
     sns.heatmap(
         correlation_matrix,
         annot=True,
@@ -38,7 +46,5 @@ def correlation(df, output_dir, logger, images_dir):
     plt.savefig(os.path.join(output_dir, file_name), dpi=150, bbox_inches="tight")
     plt.close()
     relative_path = os.path.join(images_dir, file_name)
-    AnalyticGraph.objects.get_or_create(
-        name="correlation_matrix", defaults={"image_path": relative_path}
-    )
+    save_graph("correlation_matrix", relative_path)
     return correlation_matrix
@@ -1,11 +1,14 @@
 import os
 import matplotlib
 
-from apps.analytics.models import AnalyticGraph
+from .storage import save_graph
 
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 
+# Колонки датасету, від яких залежить графік
+COLUMNS = ["Credit_History", "Loan_Status"]
+
 
 def credit_history_graph(df, output_dir, logger, images_dir):
     logger.info("3. Створення графіка кредитної історії...")
@@ -31,6 +34,5 @@ def credit_history_graph(df, output_dir, logger, images_dir):
     plt.savefig(os.path.join(output_dir, file_name), dpi=150, bbox_inches="tight")
     plt.close()
     relative_path = os.path.join(images_dir, file_name)
-    AnalyticGraph.objects.get_or_create(
-        name="credit_history_chart", defaults={"image_path": relative_path}
-    )
+    save_graph("credit_history_chart", relative_path)
+    return credit_approval
@@ -1,11 +1,14 @@
 import os
 import matplotlib
 
-from apps.analytics.models import AnalyticGraph
+from .storage import save_graph
 
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 
+# Колонки датасету, від яких залежить графік
+COLUMNS = ["Married", "Loan_Status"]
+
 
 def married_graph(df, output_dir, logger, images_dir):
     logger.info("4. Створення графіка сімейного стану...")
@@ -27,6 +30,5 @@ def married_graph(df, output_dir, logger, images_dir):
     plt.savefig(os.path.join(output_dir, file_name), dpi=150, bbox_inches="tight")
     plt.close()
     relative_path = os.path.join(images_dir, file_name)
-    AnalyticGraph.objects.get_or_create(
-        name="marital_status_chart", defaults={"image_path": relative_path}
-    )
+    save_graph("marital_status_chart", relative_path)
+    return marriage_approval
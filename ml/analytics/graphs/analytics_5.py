@@ -1,11 +1,14 @@
 import matplotlib
 import os
 
-from apps.analytics.models import AnalyticGraph
+from .storage import save_graph
 
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 
+# Колонки датасету, від яких залежить графік
+COLUMNS = ["Property_Area", "Loan_Status"]
+
 
 def property_area_graph(df, output_dir, logger, images_dir):
     logger.info("5. Створення графіка розташування...")
@@ -29,6 +32,5 @@ def property_area_graph(df, output_dir, logger, images_dir):
     plt.savefig(os.path.join(output_dir, file_name), dpi=150, bbox_inches="tight")
     plt.close()
     relative_path = os.path.join(images_dir, file_name)
-    AnalyticGraph.objects.get_or_create(
-        name="location_chart", defaults={"image_path": relative_path}
-    )
+    save_graph("location_chart", relative_path)
+    return property_approval
@@ -1,11 +1,14 @@
 import os
 import matplotlib
 
-from apps.analytics.models import AnalyticGraph
+from .storage import save_graph
 
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 
+# Колонки датасету, від яких залежить графік
+COLUMNS = ["Education", "Loan_Status"]
+
 
 def education_graph(df, output_dir, logger, images_dir):
     logger.info("6. Створення графіка освіти...")
@@ -29,6 +32,5 @@ def education_graph(df, output_dir, logger, images_dir):
     )
     plt.close()
     relative_path = os.path.join(images_dir, file_name)
-    AnalyticGraph.objects.get_or_create(
-        name="education_chart", defaults={"image_path": relative_path}
-    )
+    save_graph("education_chart", relative_path)
+    return education_approval
@@ -1,11 +1,14 @@
 import os
 import matplotlib
 
-from apps.analytics.models import AnalyticGraph
+from .storage import save_graph
 
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 
+# Колонки датасету, від яких залежить графік
+COLUMNS = ["Dependents", "Loan_Status"]
+
 
 def dependents_graph(df, output_dir, logger, images_dir):
     logger.info("7. Створення графіка утриманців...")
@@ -27,6 +30,5 @@ def dependents_graph(df, output_dir, logger, images_dir):
     plt.savefig(os.path.join(output_dir, file_name), dpi=150, bbox_inches="tight")
     plt.close()
     relative_path = os.path.join(images_dir, file_name)
-    AnalyticGraph.objects.get_or_create(
-        name="dependents_chart", defaults={"image_path": relative_path}
-    )
+    save_graph("dependents_chart", relative_path)
+    return dependents_approval
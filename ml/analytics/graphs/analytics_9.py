@@ -1,15 +1,17 @@
 import os
 import matplotlib
 
-from apps.analytics.models import AnalyticGraph
+from .analytics_2 import COLUMNS, numeric_correlation
+from .storage import save_graph
 
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 
 
-def correlation_matrix_graph(output_dir, correlation_matrix, logger, images_dir):
+def correlation_matrix_graph(df, output_dir, logger, images_dir):
     logger.info("9. Створення графіка кореляцій...")
     plt.figure(figsize=(12, 8))
+    correlation_matrix = numeric_correlation(df)
     loan_correlations = correlation_matrix["Loan_Status_Binary"].drop(
         "Loan_Status_Binary"
     )
@@ -33,6 +35,5 @@ def correlation_matrix_graph(output_dir, correlation_matrix, logger, images_dir)
     plt.savefig(os.path.join(output_dir, file_name), dpi=150, bbox_inches="tight")
     plt.close()
     relative_path = os.path.join(images_dir, file_name)
-    AnalyticGraph.objects.get_or_create(
-        name="correlation_bar", defaults={"image_path": relative_path}
-    )
+    save_graph("correlation_bar", relative_path)
+    return loan_correlations_sorted
@@ -0,0 +1,59 @@
+"""
+    Збереження записів AnalyticGraph для створених графіків.
+
+    Графіки можуть рендеритися в дочірніх процесах (ml.analytics.rendering),
+    які не повинні працювати з успадкованим з'єднанням бази. Усередині
+    collecting() записи не зберігаються одразу, а накопичуються в списку,
+    який процес-рендерер повертає батьківському процесу.
+"""
+
+from contextlib import contextmanager
+
+from django.db import transaction
+
+from apps.analytics.models import AnalyticGraph
+
+# Відкладені записи (назва, шлях до зображення) або None - зберігати одразу
+_pending = None
+
+
+def save_graph(name: str, image_path: str):
+    """
+        Зберігає запис графіка (або відкладає його всередині collecting()).
+
+        Args:
+            name (str): Унікальна назва графіка
+            image_path (str): Шлях до зображення відносно MEDIA_ROOT
+    """
+    if _pending is not None:
+        _pending.append((name, image_path))
+        return
+    AnalyticGraph.objects.get_or_create(name=name, defaults={"image_path": image_path})
+
+
+def save_graphs(records: list):
+    """
+        Зберігає записи графіків в одній транзакції.
+
+        Args:
+            records (list): Пари (назва, шлях до зображення)
+    """
+    with transaction.atomic():
+        for name, image_path in records:
+            save_graph(name, image_path)
+
+
+@contextmanager
+def collecting():
+    """
+        Накопичує записи save_graph замість збереження в базі.
+
+        Yields:
+            list: Пари (назва, шлях до зображення)
+    """
+    global _pending
+    previous, _pending = _pending, []
+    try:
+        yield _pending
+    finally:
+        _pending = previous
@@ -0,0 +1,158 @@
+"""
+    Паралельний рендеринг графіків аналітики в пулі процесів.
+
+    Підготовлений DataFrame передається воркерам один раз: при fork
+    (Linux) він успадковується без копіювання, при spawn - серіалізується
+    один раз на процес через initializer. Графіки незалежні (графік 9
+    сам обчислює матрицю кореляцій), тому кожен рендериться окремою
+    задачею, а записи AnalyticGraph з усіх процесів зберігаються в одній
+    транзакції батьківським процесом.
+
+    Графіки, чиї вхідні колонки та код не змінились, не рендеряться, а
+    відновлюються з кешу ml.analytics.cache (ANALYTICS_CACHE_DIR).
+
+    Example:
+        >>> render_graphs(df, output_dir, "loan_analysis_plots")
+        {'pie_chart_graph': 0.41, 'correlation': 0.93, ...}
+"""
+
+import logging
+import multiprocessing
+import os
+import time
+
+import matplotlib
+import seaborn as sns
+from django.conf import settings
+
+from core import db_pool
+
+from . import cache, graphs
+from .graphs import storage
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+# Функції графіків з ml.analytics.graphs у порядку нумерації
+GRAPHS = [
+    "pie_chart_graph",
+    "correlation",
+    "credit_history_graph",
+    "married_graph",
+    "property_area_graph",
+    "education_graph",
+    "dependents_graph",
+    "self_employed_graph",
+    "correlation_matrix_graph",
+    "total_income_graph",
+    "chi_square_graph",
+    "mutual_score_graph",
+]
+
+# DataFrame, output_dir та images_dir поточного процесу-рендерера
+_state = None
+
+
+def available_cores() -> int:
+    """
+        Повертає кількість ядер, доступних процесу.
+
+        Returns:
+            int: Кількість ядер з урахуванням CPU affinity (наприклад, у контейнері)
+    """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _init_renderer(df, output_dir: str, images_dir: str, forked: bool):
+    global _state
+    if forked:
+        # З'єднання з базою належать батьківському процесу
+        db_pool.discard_inherited()
+    _state = (df, output_dir, images_dir)
+    sns.set_style("whitegrid")
+    plt.rcParams["font.size"] = 11
+
+
+def _render(name: str) -> tuple:
+    df, output_dir, images_dir = _state
+    started = time.perf_counter()
+    with storage.collecting() as records:
+        stats = getattr(graphs, name)(df, output_dir, logging.getLogger(), images_dir)
+    return name, records, stats, time.perf_counter() - started
+
+
+def _restore(df, output_dir: str, images_dir: str) -> tuple:
+    keys = {name: cache.graph_key(name, df) for name in GRAPHS}
+    records, pending = [], []
+    for name in GRAPHS:
+        files = cache.load(name, keys[name])
+        if files is None:
+            pending.append(name)
+        else:
+            records.extend(cache.restore(name, keys[name], files, output_dir, images_dir))
+    logging.getLogger().info(f"З кешу: {len(GRAPHS) - len(pending)}, рендеринг: {len(pending)}")
+    return keys, records, pending
+
+
+def render_graphs(
+    df, output_dir: str, images_dir: str, processes: int = None, dataset_key: str = None
+) -> dict:
+    """
+        Рендерить графіки аналітики та зберігає записи AnalyticGraph.
+
+        Графіки, для яких є запис у кеші (ANALYTICS_CACHE_DIR), копіюються
+        з кешу; решта рендеряться та додаються в кеш.
+
+        Args:
+            df (pd.DataFrame): Підготовлений датасет (див. get_analytics)
+            output_dir (str): Каталог для PNG файлів
+            images_dir (str): Каталог зображень відносно MEDIA_ROOT
+            processes (int, optional): Кількість процесів. За замовчуванням
+                ANALYTICS_PROCESSES або кількість доступних ядер; 1 - рендеринг
+                у поточному процесі без пулу
+            dataset_key (str, optional): Ключ датасету (cache.dataset_key), під
+                яким зберігається маніфест ключів графіків
+
+        Returns:
+            dict: Назва функції графіка -> тривалість рендерингу в секундах
+                (лише для графіків, яких не було в кеші)
+    """
+    global _state
+    if cache.enabled():
+        keys, records, pending = _restore(df, output_dir, images_dir)
+    else:
+        keys, records, pending = {}, [], list(GRAPHS)
+
+    processes = processes or settings.ANALYTICS_PROCESSES or available_cores()
+    processes = min(processes, len(pending))
+
+    if not pending:
+        results = []
+    elif processes == 1:
+        _init_renderer(df, output_dir, images_dir, forked=False)
+        try:
+            results = [_render(name) for name in pending]
+        finally:
+            _state = None
+    else:
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+        with context.Pool(
+            processes,
+            initializer=_init_renderer,
+            initargs=(df, output_dir, images_dir, context.get_start_method() == "fork"),
+        ) as pool:
+            results = pool.map(_render, pending, chunksize=1)
+
+    for name, rendered, stats, _ in results:
+        records.extend(rendered)
+        if keys:
+            cache.store(name, keys[name], rendered, stats, output_dir)
+    if keys and dataset_key:
+        cache.store_dataset(dataset_key, keys)
+
+    storage.save_graphs(records)
+    return {name: seconds for name, _, _, seconds in results}
@@ -0,0 +1,215 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+from .data_transform import transform_input
+from .metrics import Counter, Histogram
+
+BATCH_SIZE = Histogram(
+    "prediction_batch_size",
+    "Number of requests scored together by the micro-batcher",
+    ("mode",),
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+BATCH_WAIT = Histogram(
+    "prediction_batch_wait_seconds",
+    "Time a request waited in the micro-batcher queue before scoring",
+    ("mode",),
+)
+BATCH_OVERFLOW = Counter(
+    "prediction_batch_overflow_total",
+    "Requests scored inline because the micro-batcher queue was full",
+)
+
+
+class _Request:
+    __slots__ = ("predictor", "row", "method", "future", "enqueued_at")
+
+    def __init__(self, predictor, row: dict, method: str):
+        self.predictor = predictor
+        self.row = row
+        self.method = method
+        self.future = Future()
+        self.enqueued_at = time.monotonic()
+
+
+class MicroBatcher:
+    """
+        Об'єднує одночасні запити прогнозування в пакети.
+
+        Кожен потік, що викликає predict, трансформує свою заявку, ставить її
+        в обмежену чергу і чекає на результат. Фоновий потік забирає першу
+        заявку з черги та збирає до неї інші, доки пакет не досягне
+        max_batch_size або не мине max_wait секунд від постановки першої
+        заявки. Очікування також припиняється, щойно в пакеті опинилися всі
+        заявки, що зараз обробляються в predict, тому одиночний запит не
+        чекає даремно. Заявки з однаковим предиктором і режимом оцінюються одним
+        викликом predict_rows, тобто одним predict_proba на модель.
+
+        Якщо черга заповнена, заявка оцінюється одразу в потоці запиту, тому
+        глибина черги і час очікування обмежені.
+
+        Attributes:
+            max_batch_size (int): Максимальна кількість заявок у пакеті
+            max_wait (float): Максимальне очікування першої заявки пакету в секундах
+            max_queue_size (int): Максимальна кількість заявок у черзі
+
+        Example:
+            >>> batcher = MicroBatcher(32, max_wait=0.002, max_queue_size=1024)
+            >>> batcher.predict(get_ensemble(), data, "mode1")
+            1
+    """
+
+    def __init__(self, max_batch_size: int, max_wait: float, max_queue_size: int):
+        """
+            Ініціалізує батчер. Фоновий потік запускається при першому виклику.
+
+            Args:
+                max_batch_size (int): Максимальна кількість заявок у пакеті
+                max_wait (float): Максимальне очікування в секундах
+                max_queue_size (int): Максимальна кількість заявок у черзі
+        """
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.max_queue_size = max_queue_size
+        self._lock = threading.Lock()
+        self._queue = None
+        self._pid = None
+        self._active = 0
+
+    def _ensure_worker(self) -> queue.Queue:
+        """
+            Повертає чергу поточного процесу, запускаючи фоновий потік.
+
+            Потоки не переживають fork, тому після fork воркера gunicorn
+            створюються нові черга та потік.
+        """
+        pid = os.getpid()
+        if self._pid != pid:
+            with self._lock:
+                if self._pid != pid:
+                    self._queue = queue.Queue(self.max_queue_size)
+                    threading.Thread(
+                        target=self._run,
+                        args=(self._queue,),
+                        name="prediction-batcher",
+                        daemon=True,
+                    ).start()
+                    self._pid = pid
+        return self._queue
+
+    @contextmanager
+    def _tracking(self):
+        with self._lock:
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def _submit(self, predictor, row: dict, method: str) -> tuple:
+        request = _Request(predictor, row, method)
+        try:
+            self._ensure_worker().put_nowait(request)
+        except queue.Full:
+            BATCH_OVERFLOW.inc()
+            self._score([request])
+        return request.future.result()
+
+    def predict(self, predictor, raw_data: dict, method: str = "mode3") -> int:
+        """
+            Прогнозує одну заявку в складі пакету одночасних запитів.
+
+            Результат збігається з predictor.predict(raw_data, method),
+            включно з використанням кешу предиктора.
+
+            Args:
+                predictor (EnsemblePredictor): Предиктор для оцінки заявки
+                raw_data (dict): Сирі дані заявки
+                method (str, optional): Метод прогнозування. За замовчуванням "mode3"
+
+            Returns:
+                int: Результат прогнозування (0 або 1)
+
+            Raises:
+                ValueError: Якщо method не є одним з: 'mode1', 'mode2', 'mode3'
+        """
+        with self._tracking():
+            row = transform_input(raw_data)
+            cache = predictor.cache
+            if cache is not None:
+                pred = cache.get(row, method, predictor.version)
+                if pred is not None:
+                    return pred
+
+            pred = self._submit(predictor, row, method)[0]
+
+        if cache is not None:
+            cache.set(row, method, predictor.version, pred)
+        return pred
+
+    def predict_row(self, predictor, row: dict, method: str = "mode3") -> tuple:
+        """
+            Прогнозує одну вже трансформовану заявку в складі пакету (без кешу).
+
+            Args:
+                predictor (EnsemblePredictor): Предиктор для оцінки заявки
+                row (dict): Трансформовані дані заявки (transform_input)
+                method (str, optional): Метод прогнозування. За замовчуванням "mode3"
+
+            Returns:
+                tuple: (рішення 0/1, ймовірність схвалення)
+
+            Raises:
+                ValueError: Якщо method не є одним з: 'mode1', 'mode2', 'mode3'
+        """
+        with self._tracking():
+            return self._submit(predictor, row, method)
+
+    def _run(self, requests: queue.Queue):
+        while True:
+            batch = [requests.get()]
+            deadline = batch[0].enqueued_at + self.max_wait
+            while len(batch) < min(self.max_batch_size, self._active):
+                timeout = deadline - time.monotonic()
+                try:
+                    if timeout > 0:
+                        batch.append(requests.get(timeout=timeout))
+                    else:
+                        batch.append(requests.get_nowait())
+                except queue.Empty:
+                    break
+            self._score(batch)
+
+    @staticmethod
+    def _score(batch: list):
+        """
+            Оцінює пакет заявок, групуючи їх за предиктором та режимом.
+
+            Args:
+                batch (list): Заявки (_Request)
+        """
+        started = time.monotonic()
+        groups = {}
+        for request in batch:
+            key = (id(request.predictor), request.method)
+            groups.setdefault(key, []).append(request)
+
+        for (_, method), requests in groups.items():
+            BATCH_SIZE.observe(len(requests), method)
+            for request in requests:
+                BATCH_WAIT.observe(started - request.enqueued_at, method)
+            try:
+                predictions, probabilities = requests[0].predictor.predict_rows(
+                    [request.row for request in requests], method
+                )
+            except Exception as e:
+                for request in requests:
+                    request.future.set_exception(e)
+                continue
+            for request, pred, prob in zip(requests, predictions, probabilities):
+                request.future.set_result((int(pred), float(prob)))
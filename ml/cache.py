@@ -0,0 +1,179 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from decimal import Decimal
+
+
+class PredictionCache:
+    """
+        Потокобезпечний LRU-кеш результатів прогнозування з TTL.
+
+        Ключ запису - канонічний хеш трансформованих ознак заявки (результат
+        transform_input) та режиму прогнозування. Кожен виклик також передає
+        версію артефактів моделей: щойно вона змінюється, усі записи
+        попередньої версії видаляються.
+
+        Attributes:
+            max_size (int): Максимальна кількість записів
+            ttl (float): Час життя запису в секундах
+            hits (int): Кількість влучань у кеш
+            misses (int): Кількість промахів
+            evictions (int): Кількість записів, витіснених через переповнення
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        """
+            Ініціалізує порожній кеш.
+
+            Args:
+                max_size (int): Максимальна кількість записів (більше 0)
+                ttl (float): Час життя запису в секундах
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._version = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(features: dict, method: str) -> str:
+        """
+            Будує канонічний ключ для ознак заявки та режиму прогнозування.
+
+            Числові значення нормалізуються до float, тому 5000, 5000.0 та
+            Decimal("5000.00") дають однаковий ключ. Порядок полів не впливає
+            на результат.
+
+            Args:
+                features (dict): Трансформовані ознаки заявки (transform_input)
+                method (str): Режим прогнозування
+
+            Returns:
+                str: Ключ кешу (sha256 у шістнадцятковому вигляді)
+        """
+        canonical = {}
+        for name, value in features.items():
+            is_number = isinstance(value, (int, float, Decimal))
+            if is_number and not isinstance(value, bool):
+                value = float(value)
+            canonical[name] = value
+
+        payload = json.dumps([method, canonical], sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _check_version(self, version: str):
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
+
+    def get(self, features: dict, method: str, version: str):
+        """
+            Повертає збережений результат або None, якщо запису немає.
+
+            Args:
+                features (dict): Трансформовані ознаки заявки
+                method (str): Режим прогнозування
+                version (str): Версія артефактів моделей
+
+            Returns:
+                Збережений результат прогнозування або None
+        """
+        key = self.make_key(features, method)
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, features: dict, method: str, version: str, value):
+        """
+            Зберігає результат прогнозування, витісняючи найстаріші записи.
+
+            Args:
+                features (dict): Трансформовані ознаки заявки
+                method (str): Режим прогнозування
+                version (str): Версія артефактів моделей
+                value: Результат прогнозування
+        """
+        key = self.make_key(features, method)
+        with self._lock:
+            self._check_version(version)
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """
+            Видаляє всі записи кешу (лічильники зберігаються).
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+            Повертає статистику використання кешу.
+
+            Returns:
+                dict: Розмір, ліміти, кількість влучань, промахів та витіснень
+        """
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+class PredictionCacheMetrics:
+    """
+        Метрики Prometheus зі статистики кешу прогнозування.
+
+        Влучання, промахи та витіснення віддаються як counter
+        prediction_cache_<назва>_total, розмір та ліміт кешу - як gauge
+        prediction_cache_<назва>.
+
+        Attributes:
+            cache (PredictionCache): Кеш, статистика якого віддається
+    """
+
+    COUNTERS = ("hits", "misses", "evictions")
+    GAUGES = ("size", "max_size")
+
+    def __init__(self, cache: PredictionCache):
+        self.cache = cache
+
+    def render(self) -> list:
+        """
+            Формує рядки метрик у текстовому форматі Prometheus.
+
+            Returns:
+                list: Рядки HELP, TYPE та значення для кожної статистики
+        """
+        stats = self.cache.stats()
+        lines = []
+        for key in self.COUNTERS + self.GAUGES:
+            if key in self.COUNTERS:
+                name, kind = f"prediction_cache_{key}_total", "counter"
+            else:
+                name, kind = f"prediction_cache_{key}", "gauge"
+            lines.append(f"# HELP {name} Prediction cache statistic {key}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {stats[key]}")
+        return lines
@@ -0,0 +1,93 @@
+"""
+    Очищення датасету заявок (loan_data.csv) для аналітики, імпорту заявок
+    та навчання моделей.
+
+    Винесено з ml.data_transform, щоб модулі прогнозування (зокрема
+    ml.inference_client) не завантажували pandas.
+"""
+
+import pandas as pd
+
+# Колонки датасету, пропуски в яких заповнюються модою та медіаною
+CATEGORICAL_COLUMNS = [
+    "Gender",
+    "Married",
+    "Dependents",
+    "Education",
+    "Self_Employed",
+    "Property_Area",
+]
+NUMERICAL_COLUMNS = [
+    "ApplicantIncome",
+    "CoapplicantIncome",
+    "LoanAmount",
+    "Loan_Amount_Term",
+    "Credit_History",
+]
+
+
+def fill_values(frames) -> dict:
+    """
+        Розраховує значення для заповнення пропусків у датасеті заявок.
+
+        Для CATEGORICAL_COLUMNS це мода (з кількох - найменше значення, як
+        Series.mode()[0]), для NUMERICAL_COLUMNS - медіана. Значення
+        рахуються за частотами, тому великий файл можна передати частинами
+        (pd.read_csv з chunksize) і отримати той самий результат, що й для
+        всього датасету.
+
+        Args:
+            frames: Ітерабельний набір DataFrame з колонками loan_data.csv
+
+        Returns:
+            dict: Колонка -> значення для fillna (колонки без значень пропускаються)
+
+        Example:
+            >>> fill_values([pd.read_csv("ml/loan_data.csv")])["LoanAmount"]
+            110.0
+    """
+    counts = {}
+    for df in frames:
+        for col in CATEGORICAL_COLUMNS + NUMERICAL_COLUMNS:
+            frequencies = df[col].value_counts()
+            if col in counts:
+                frequencies = counts[col].add(frequencies, fill_value=0)
+            counts[col] = frequencies
+
+    values = {}
+    for col, frequencies in counts.items():
+        if frequencies.empty:
+            continue
+        frequencies = frequencies.sort_index()
+        if col in CATEGORICAL_COLUMNS:
+            values[col] = frequencies.idxmax()
+            continue
+        # Значення на позиціях (n - 1) // 2 та n // 2 відсортованого стовпця
+        positions = frequencies.cumsum().to_numpy()
+        total = int(positions[-1])
+        lower = frequencies.index[positions.searchsorted((total - 1) // 2 + 1)]
+        upper = frequencies.index[positions.searchsorted(total // 2 + 1)]
+        values[col] = (lower + upper) / 2
+    return values
+
+
+def clean_applications(df: pd.DataFrame, fill: dict = None) -> pd.DataFrame:
+    """
+        Очищує датасет заявок за правилами аналітики та навчання моделей.
+
+        Пропуски заповнюються значеннями fill_values, а "3+" утриманців
+        перетворюється на 3. Нечислові значення Dependents стають NaN
+        (тоді колонка залишається float).
+
+        Args:
+            df (pd.DataFrame): Дані у форматі loan_data.csv
+            fill (dict, optional): Результат fill_values. За замовчуванням
+                розраховується за самим df
+
+        Returns:
+            pd.DataFrame: Очищена копія df
+    """
+    df = df.fillna(fill_values([df]) if fill is None else fill)
+    dependents = pd.to_numeric(df["Dependents"].replace("3+", "3"), errors="coerce")
+    df["Dependents"] = dependents if dependents.isna().any() else dependents.astype(int)
+    return df
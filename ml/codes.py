@@ -0,0 +1,121 @@
+"""
+    Спільна таблиця кодів категоріальних ознак кредитної заявки.
+
+    CreditApplication зберігає категоріальні поля як smallint коди замість
+    рядків. Код - це позиція значення в кортежі CODES, тому порядок
+    значень не можна змінювати: нові значення додаються лише в кінець.
+    Таблицею користуються модель, форми майстра, серіалізатори API,
+    transform_input та скомпільований препроцесор (ml.compiled), який
+    переводить коди в one-hot колонки без порівняння рядків.
+
+    Example:
+        >>> encode("property_area", "Urban")
+        2
+        >>> decode("property_area", 2)
+        'Urban'
+"""
+
+import numpy as np
+
+# Поле заявки -> значення у порядку кодів
+CODES = {
+    "gender": ("Female", "Male"),
+    "married": ("No", "Yes"),
+    "education": ("Graduate", "Not Graduate"),
+    "self_employed": ("No", "Yes"),
+    "credit_history": ("No", "Yes"),
+    "property_area": ("Rural", "Semiurban", "Urban"),
+}
+
+# Колонка датасету -> поле заявки для категоріальних ознак ML моделей.
+# Credit_History моделі використовують як числову ознаку, а її код
+# (0 - немає, 1 - є) збігається з числовим значенням.
+FEATURES = {
+    "Gender": "gender",
+    "Married": "married",
+    "Education": "education",
+    "Self_Employed": "self_employed",
+    "Property_Area": "property_area",
+}
+
+_INDEX = {
+    field: {label: code for code, label in enumerate(labels)}
+    for field, labels in CODES.items()
+}
+_LABELS = {field: np.array(labels, dtype=object) for field, labels in CODES.items()}
+
+
+def choices(field: str, labels=None) -> list:
+    """
+        Повертає choices поля у форматі Django та DRF.
+
+        Args:
+            field (str): Поле заявки з CODES
+            labels (list, optional): Значення у порядку відображення.
+                За замовчуванням - порядок кодів
+
+        Returns:
+            list: Пари (код, значення)
+
+        Example:
+            >>> choices("married", ["Yes", "No"])
+            [(1, 'Yes'), (0, 'No')]
+    """
+    labels = CODES[field] if labels is None else labels
+    return [(_INDEX[field][label], label) for label in labels]
+
+
+def encode(field: str, label: str) -> int:
+    """
+        Повертає код значення поля.
+
+        Args:
+            field (str): Поле заявки з CODES
+            label (str): Значення поля
+
+        Returns:
+            int: Код значення
+
+        Raises:
+            ValueError: Якщо значення немає в таблиці поля
+    """
+    try:
+        return _INDEX[field][label]
+    except KeyError:
+        raise ValueError(f"Unknown value {label!r} for field {field!r}") from None
+
+
+def decode(field: str, code: int) -> str:
+    """
+        Повертає значення поля за кодом.
+
+        Args:
+            field (str): Поле заявки з CODES
+            code (int): Код значення
+
+        Returns:
+            str: Значення поля
+    """
+    return CODES[field][code]
+
+
+def decode_features(columns: dict) -> dict:
+    """
+        Замінює коди категоріальних ознак на значення для sklearn моделей.
+
+        sklearn OneHotEncoder навчений на рядкових категоріях датасету,
+        тому перед викликом sklearn pipeline колонки кодів перетворюються
+        назад на рядки одним індексуванням масиву.
+
+        Args:
+            columns (dict): Колонка датасету -> масив значень
+
+        Returns:
+            dict: Копія columns з рядковими категоріальними ознаками
+    """
+    decoded = dict(columns)
+    for column, field in FEATURES.items():
+        values = np.asarray(columns.get(column, ()))
+        if values.dtype.kind in "iu":
+            decoded[column] = _LABELS[field][values]
+    return decoded
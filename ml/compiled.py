@@ -0,0 +1,695 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import joblib
+import numpy as np
+from scipy.special import expit
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from sklearn.svm import SVC
+
+from .codes import CODES, FEATURES
+
+
+class CompiledPreprocessor:
+    """
+        Скомпільований ColumnTransformer(StandardScaler, OneHotEncoder).
+
+        Зберігає середні значення та масштаби StandardScaler і таблиці категорій
+        OneHotEncoder у вигляді плоских масивів та словників, тому перетворення
+        ознак виконується без pandas та валідації sklearn.
+
+        Для категоріальних ознак з таблиці ml.codes додатково будується масив
+        код -> колонка, тому колонки цілочисельних кодів (див. transform_input)
+        переводяться в one-hot одним індексуванням numpy без порівняння рядків.
+
+        Attributes:
+            numeric_columns (list): Числові ознаки у порядку ColumnTransformer
+            categorical_columns (list): Категоріальні ознаки у порядку ColumnTransformer
+            mean (np.ndarray): Середні значення числових ознак
+            scale (np.ndarray): Масштаби числових ознак
+            n_outputs (int): Кількість колонок після перетворення
+            coded (list): Індекси категоріальних ознак з таблиці ml.codes
+            code_offsets (np.ndarray): Колонка X для кожної пари (ознака coded, код)
+    """
+
+    def __init__(self, arrays: dict, params: dict):
+        """
+            Ініціалізує препроцесор з плоских масивів та параметрів.
+
+            Args:
+                arrays (dict): Масиви "mean" та "scale"
+                params (dict): Списки колонок, таблиці категорій та прапорець ignore_unknown
+        """
+        self.arrays = arrays
+        self.params = params
+
+        self.mean = arrays["mean"]
+        self.scale = arrays["scale"]
+        self.numeric_columns = params["numeric_columns"]
+        self.categorical_columns = params["categorical_columns"]
+        self.ignore_unknown = params["ignore_unknown"]
+
+        offset = len(self.numeric_columns)
+        self.category_offsets = []
+        for categories, dropped in zip(params["categories"], params["dropped"]):
+            offsets = {}
+            for category in categories:
+                if category == dropped:
+                    offsets[category] = None
+                else:
+                    offsets[category] = offset
+                    offset += 1
+            self.category_offsets.append(offsets)
+        self.n_outputs = offset
+
+        # Таблиця (ознака ml.codes, код) -> колонка X. Відкинута категорія
+        # та невідомий код (останній стовпчик таблиці і коди поза нею)
+        # записуються у дві службові колонки за межами результату.
+        self.coded = [
+            i for i, col in enumerate(self.categorical_columns) if col in FEATURES
+        ]
+        tables = [CODES[FEATURES[self.categorical_columns[i]]] for i in self.coded]
+        width = max(map(len, tables), default=0) + 1
+        self.dropped_column = self.n_outputs
+        self.unknown_column = self.n_outputs + 1
+        self.code_offsets = np.full((len(self.coded), width), self.unknown_column)
+        for row, (i, labels) in enumerate(zip(self.coded, tables)):
+            offsets = self.category_offsets[i]
+            for code, label in enumerate(labels):
+                if label in offsets:
+                    offset = offsets[label]
+                    self.code_offsets[row, code] = (
+                        self.dropped_column if offset is None else offset
+                    )
+        self._coded_rows = np.arange(len(self.coded))[:, np.newaxis]
+
+    def transform(self, columns) -> np.ndarray:
+        """
+            Перетворює колонки ознак у матрицю для класифікатора.
+
+            Args:
+                columns: Відображення назва колонки -> масив значень
+                    (dict масивів numpy або pandas DataFrame)
+
+            Returns:
+                np.ndarray: Матриця float64 розміром (n_rows, n_outputs)
+
+            Raises:
+                ValueError: Якщо категоріальна ознака має невідому категорію
+        """
+        numeric = np.column_stack(
+            [np.asarray(columns[col], dtype=np.float64) for col in self.numeric_columns]
+        )
+        X = np.zeros((numeric.shape[0], self.n_outputs + 2))
+        X[:, : len(self.numeric_columns)] = (numeric - self.mean) / self.scale
+
+        coded = self._set_codes(X, columns)
+        for i, (col, offsets) in enumerate(
+            zip(self.categorical_columns, self.category_offsets)
+        ):
+            if coded and i in self.coded:
+                continue
+            for row, value in enumerate(columns[col]):
+                try:
+                    offset = offsets[value]
+                except KeyError:
+                    if self.ignore_unknown:
+                        continue
+                    raise ValueError(
+                        f"Found unknown category {value!r} in column {col!r}"
+                    )
+                if offset is not None:
+                    X[row, offset] = 1.0
+        return X[:, : self.n_outputs]
+
+    def _set_codes(self, X: np.ndarray, columns) -> bool:
+        """
+            Встановлює one-hot колонки ознак ml.codes одним індексуванням таблиці.
+
+            Returns:
+                bool: False, якщо хоча б одна з цих ознак задана не кодами
+                    (тоді всі вони обробляються за значеннями)
+        """
+        if not self.coded:
+            return False
+        values = [np.asarray(columns[self.categorical_columns[i]]) for i in self.coded]
+        if any(value.dtype.kind not in "iu" for value in values):
+            return False
+
+        # Від'ємні коди після переведення в uint64 теж потрапляють в останній стовпчик
+        codes = np.minimum(
+            np.array(values).astype(np.uint64), self.code_offsets.shape[1] - 1
+        )
+        offsets = self.code_offsets[self._coded_rows, codes]
+        if not self.ignore_unknown and offsets.max() == self.unknown_column:
+            i, row = np.argwhere(offsets == self.unknown_column)[0]
+            col = self.categorical_columns[self.coded[i]]
+            raise ValueError(
+                f"Found unknown category code {values[i][row]!r} in column {col!r}"
+            )
+        X[np.arange(X.shape[0]), offsets] = 1.0
+        return True
+
+
+class CompiledLinear:
+    """
+        Скомпільована бінарна LogisticRegression (коефіцієнти та зсув).
+    """
+
+    def __init__(self, arrays: dict, params: dict):
+        self.arrays = arrays
+        self.params = params
+        self.coef = arrays["coef"]
+        self.intercept = params["intercept"]
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """
+            Повертає ймовірності класу 1 для рядків матриці X.
+        """
+        return expit(X @ self.coef + self.intercept)
+
+
+class CompiledTrees:
+    """
+        Скомпільований ансамбль дерев (RandomForest або GradientBoosting).
+
+        Вузли всіх дерев об'єднані в плоскі масиви з глобальною нумерацією,
+        тому всі дерева обходяться одночасно векторними операціями numpy:
+        кількість ітерацій дорівнює глибині найглибшого дерева.
+
+        Для RandomForest value містить нормовану ймовірність класу 1 у листі,
+        а результат усереднюється за деревами. Для GradientBoosting value
+        містить внесок листа, вже помножений на learning_rate, а результат
+        є expit(init + сума внесків).
+    """
+
+    def __init__(self, arrays: dict, params: dict):
+        self.arrays = arrays
+        self.params = params
+        self.roots = arrays["roots"]
+        self.left = arrays["left"]
+        self.right = arrays["right"]
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.value = arrays["value"]
+        self.kind = params["kind"]
+        self.init = params.get("init", 0.0)
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        """
+            Повертає індекси листів для кожного рядка та кожного дерева.
+
+            Як і sklearn, порівнює ознаки у точності float32 з порогами float64.
+
+            Args:
+                X (np.ndarray): Матриця ознак (n_rows, n_features)
+
+            Returns:
+                np.ndarray: Індекси листів розміром (n_rows, n_trees)
+        """
+        n_rows, n_features = X.shape
+        n_trees = len(self.roots)
+        X = X.astype(np.float32).ravel()
+
+        nodes = np.tile(self.roots, n_rows)
+        offsets = np.repeat(np.arange(n_rows) * n_features, n_trees)
+        # Обробляються лише пари (рядок, дерево), які ще не дійшли до листа
+        active = np.arange(nodes.shape[0])
+
+        while active.shape[0]:
+            current = nodes[active]
+            left = self.left[current]
+            is_split = left != -1
+            active, current, left = active[is_split], current[is_split], left[is_split]
+
+            go_left = (
+                X[offsets[active] + self.feature[current]] <= self.threshold[current]
+            )
+            nodes[active] = np.where(go_left, left, self.right[current])
+
+        return nodes.reshape(n_rows, n_trees)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """
+            Повертає ймовірності класу 1 для рядків матриці X.
+        """
+        values = self.value[self.apply(X)]
+        if self.kind == "forest":
+            return values.sum(axis=1) / len(self.roots)
+        return expit(self.init + values.sum(axis=1))
+
+
+class CompiledSVC:
+    """
+        Скомпільований бінарний SVC з оцінкою ймовірностей (Platt scaling).
+
+        Повторює обчислення libsvm: значення рішення за опорними векторами
+        та подвійними коефіцієнтами, далі сигмоїда з параметрами probA/probB.
+    """
+
+    MIN_PROB = 1e-7
+
+    def __init__(self, arrays: dict, params: dict):
+        self.arrays = arrays
+        self.params = params
+        self.support_vectors = arrays["support_vectors"]
+        self.dual_coef = arrays["dual_coef"]
+        self.kernel = params["kernel"]
+        self.gamma = params["gamma"]
+        self.coef0 = params["coef0"]
+        self.degree = params["degree"]
+        self.intercept = params["intercept"]
+        self.prob_a = params["prob_a"]
+        self.prob_b = params["prob_b"]
+
+    def _kernel(self, X: np.ndarray) -> np.ndarray:
+        if self.kernel == "rbf":
+            diff = X[:, np.newaxis, :] - self.support_vectors[np.newaxis, :, :]
+            return np.exp(-self.gamma * (diff * diff).sum(axis=2))
+
+        dot = X @ self.support_vectors.T
+        if self.kernel == "linear":
+            return dot
+        if self.kernel == "poly":
+            return (self.gamma * dot + self.coef0) ** self.degree
+        return np.tanh(self.gamma * dot + self.coef0)
+
+    @staticmethod
+    def _pairwise_coupling(r: np.ndarray) -> np.ndarray:
+        """
+            Повторює multiclass_probability з libsvm для двох класів.
+
+            libsvm не повертає попарну ймовірність напряму, а уточнює її
+            ітеративно до похибки 0.005 / k, тому для точного збігу з sklearn
+            ті самі ітерації виконуються векторно для всіх рядків.
+
+            Args:
+                r (np.ndarray): Попарні ймовірності класу 0 проти класу 1
+
+            Returns:
+                np.ndarray: Ймовірності класу 0 для кожного рядка
+        """
+        k = 2
+        eps = 0.005 / k
+        r_01, r_10 = r, 1.0 - r
+        Q = np.empty((r.shape[0], k, k))
+        Q[:, 0, 0] = r_10 * r_10
+        Q[:, 1, 1] = r_01 * r_01
+        Q[:, 0, 1] = Q[:, 1, 0] = -r_10 * r_01
+        p = np.full((r.shape[0], k), 1.0 / k)
+
+        for _ in range(max(100, k)):
+            Qp = np.einsum("ntj,nj->nt", Q, p)
+            pQp = (p * Qp).sum(axis=1)
+            active = np.abs(Qp - pQp[:, np.newaxis]).max(axis=1) >= eps
+            if not active.any():
+                break
+
+            for t in range(k):
+                diff = np.where(active, (-Qp[:, t] + pQp) / Q[:, t, t], 0.0)
+                p[:, t] += diff
+                pQp = (pQp + diff * (diff * Q[:, t, t] + 2 * Qp[:, t])) / (
+                    (1 + diff) * (1 + diff)
+                )
+                Qp = (Qp + diff[:, np.newaxis] * Q[:, t, :]) / (1 + diff)[:, np.newaxis]
+                p /= (1 + diff)[:, np.newaxis]
+        return p[:, 0]
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """
+            Повертає ймовірності класу 1 для рядків матриці X.
+        """
+        decision = self._kernel(X) @ self.dual_coef + self.intercept
+        f = decision * self.prob_a + self.prob_b
+        # Стабільна форма сигмоїди, як у sigmoid_predict з libsvm
+        e = np.exp(-np.abs(f))
+        pairwise = np.where(f >= 0, e / (1.0 + e), 1.0 / (1.0 + e))
+        pairwise = np.clip(pairwise, self.MIN_PROB, 1 - self.MIN_PROB)
+        return 1.0 - self._pairwise_coupling(pairwise)
+
+
+class CompiledPipeline:
+    """
+        Скомпільований Pipeline(ColumnTransformer, classifier) для швидкого інференсу.
+
+        Має той самий контракт predict_proba, що й sklearn Pipeline, але приймає
+        відображення назва колонки -> масив значень (dict або DataFrame) і не
+        створює проміжних об'єктів pandas. Ймовірності збігаються з sklearn
+        з точністю до 1e-9.
+
+        Attributes:
+            preprocessor (CompiledPreprocessor): Скомпільований препроцесор
+            classifier: Скомпільований класифікатор
+    """
+
+    def __init__(self, preprocessor: CompiledPreprocessor, classifier):
+        self.preprocessor = preprocessor
+        self.classifier = classifier
+
+    def predict_proba(self, columns) -> np.ndarray:
+        """
+            Повертає ймовірності класів для кожного рядка.
+
+            Args:
+                columns: Відображення назва колонки -> масив значень
+
+            Returns:
+                np.ndarray: Масив розміром (n_rows, 2) з ймовірностями класів 0 та 1
+        """
+        prob = self.classifier.predict_proba(self.preprocessor.transform(columns))
+        return np.column_stack([1.0 - prob, prob])
+
+
+def _compile_preprocessor(preprocessor) -> CompiledPreprocessor:
+    if not isinstance(preprocessor, ColumnTransformer):
+        raise ValueError(f"Unsupported preprocessor: {type(preprocessor).__name__}")
+
+    scaler = encoder = None
+    numeric_columns = categorical_columns = []
+    for name, transformer, columns in preprocessor.transformers_:
+        if name == "remainder" and transformer == "drop":
+            continue
+        if not all(isinstance(col, str) for col in columns):
+            raise ValueError(f"Columns of {name!r} must be selected by name")
+        # ColumnTransformer склеює виходи у порядку transformers_
+        is_first = scaler is None and encoder is None
+        if isinstance(transformer, StandardScaler) and is_first:
+            scaler, numeric_columns = transformer, list(columns)
+        elif isinstance(transformer, OneHotEncoder) and encoder is None:
+            encoder, categorical_columns = transformer, list(columns)
+        else:
+            raise ValueError(f"Unsupported transformer: {name!r}")
+
+    n_numeric = len(numeric_columns)
+    mean = np.zeros(n_numeric)
+    scale = np.ones(n_numeric)
+    if scaler is not None:
+        if scaler.mean_ is not None:
+            mean = np.asarray(scaler.mean_, dtype=np.float64)
+        if scaler.scale_ is not None:
+            scale = np.asarray(scaler.scale_, dtype=np.float64)
+
+    categories = []
+    dropped = []
+    if encoder is not None:
+        if getattr(encoder, "_infrequent_enabled", False):
+            raise ValueError("Infrequent categories are not supported")
+        drop_idx = encoder.drop_idx_
+        for i, feature_categories in enumerate(encoder.categories_):
+            feature_categories = feature_categories.tolist()
+            categories.append(feature_categories)
+            if drop_idx is None or drop_idx[i] is None:
+                dropped.append(None)
+            else:
+                dropped.append(feature_categories[int(drop_idx[i])])
+
+    return CompiledPreprocessor(
+        {"mean": mean, "scale": scale},
+        {
+            "numeric_columns": numeric_columns,
+            "categorical_columns": categorical_columns,
+            "categories": categories,
+            "dropped": dropped,
+            "ignore_unknown": encoder is not None
+            and encoder.handle_unknown != "error",
+        },
+    )
+
+
+def _flatten_trees(trees: list, leaf_values: list) -> dict:
+    roots, left, right, feature, threshold = [], [], [], [], []
+    offset = 0
+    for tree in trees:
+        children_left = tree.children_left.astype(np.int64)
+        children_right = tree.children_right.astype(np.int64)
+        is_leaf = children_left == -1
+
+        roots.append(offset)
+        left.append(np.where(is_leaf, -1, children_left + offset))
+        right.append(np.where(is_leaf, -1, children_right + offset))
+        feature.append(np.where(is_leaf, 0, tree.feature).astype(np.int64))
+        threshold.append(tree.threshold.astype(np.float64))
+        offset += tree.node_count
+
+    return {
+        "roots": np.asarray(roots, dtype=np.int64),
+        "left": np.concatenate(left),
+        "right": np.concatenate(right),
+        "feature": np.concatenate(feature),
+        "threshold": np.concatenate(threshold),
+        "value": np.concatenate(leaf_values).astype(np.float64),
+    }
+
+
+def _compile_classifier(classifier, n_features: int):
+    if len(getattr(classifier, "classes_", ())) != 2:
+        raise ValueError("Only binary classifiers are supported")
+
+    if isinstance(classifier, LogisticRegression):
+        return CompiledLinear(
+            {"coef": np.asarray(classifier.coef_[0], dtype=np.float64)},
+            {"intercept": float(classifier.intercept_[0])},
+        )
+
+    if isinstance(classifier, RandomForestClassifier):
+        trees = [estimator.tree_ for estimator in classifier.estimators_]
+        leaf_values = []
+        for tree in trees:
+            value = tree.value[:, 0, :]
+            normalizer = value.sum(axis=1)
+            normalizer[normalizer == 0.0] = 1.0
+            leaf_values.append(value[:, 1] / normalizer)
+        return CompiledTrees(_flatten_trees(trees, leaf_values), {"kind": "forest"})
+
+    if isinstance(classifier, GradientBoostingClassifier):
+        trees = [estimator.tree_ for estimator in classifier.estimators_[:, 0]]
+        leaf_values = [
+            classifier.learning_rate * tree.value[:, 0, 0] for tree in trees
+        ]
+        init = classifier._raw_predict_init(
+            np.zeros((1, n_features), dtype=np.float32)
+        )
+        return CompiledTrees(
+            _flatten_trees(trees, leaf_values),
+            {"kind": "boosting", "init": float(init[0, 0])},
+        )
+
+    if isinstance(classifier, SVC):
+        if not classifier.probability or len(classifier.probA_) != 1:
+            raise ValueError("SVC must be fitted with probability=True")
+        if classifier.kernel not in ("rbf", "linear", "poly", "sigmoid"):
+            raise ValueError(f"Unsupported SVC kernel: {classifier.kernel!r}")
+        return CompiledSVC(
+            {
+                "support_vectors": np.asarray(
+                    classifier.support_vectors_, dtype=np.float64
+                ),
+                "dual_coef": np.asarray(classifier._dual_coef_[0], dtype=np.float64),
+            },
+            {
+                "kernel": classifier.kernel,
+                "gamma": float(classifier._gamma),
+                "coef0": float(classifier.coef0),
+                "degree": int(classifier.degree),
+                "intercept": float(classifier._intercept_[0]),
+                "prob_a": float(classifier.probA_[0]),
+                "prob_b": float(classifier.probB_[0]),
+            },
+        )
+
+    raise ValueError(f"Unsupported classifier: {type(classifier).__name__}")
+
+
+def compile_pipeline(pipeline) -> CompiledPipeline:
+    """
+        Компілює навчений sklearn Pipeline у CompiledPipeline на numpy.
+
+        Підтримує конвеєри з create_models.py:
+        Pipeline(ColumnTransformer(StandardScaler, OneHotEncoder), classifier),
+        де classifier - LogisticRegression, RandomForestClassifier,
+        GradientBoostingClassifier або SVC(probability=True).
+
+        Args:
+            pipeline (Pipeline): Навчений sklearn Pipeline
+
+        Returns:
+            CompiledPipeline: Скомпільований конвеєр з тим самим predict_proba
+
+        Raises:
+            ValueError: Якщо структура конвеєра або класифікатор не підтримуються
+
+        Example:
+            >>> model = joblib.load(MODEL_WITH_CH)
+            >>> fast_model = compile_pipeline(model)
+            >>> fast_model.predict_proba({"Gender": ["Male"], ...})[:, 1]
+    """
+    if not isinstance(pipeline, Pipeline) or len(pipeline.steps) != 2:
+        raise ValueError("Expected Pipeline(preprocessor, classifier)")
+
+    preprocessor = _compile_preprocessor(pipeline.steps[0][1])
+    classifier = _compile_classifier(pipeline.steps[1][1], preprocessor.n_outputs)
+    return CompiledPipeline(preprocessor, classifier)
+
+
+def artifact_version(*paths: str) -> str:
+    """
+        Обчислює версію набору артефактів моделей.
+
+        Версія - короткий хеш назви, розміру та часу модифікації кожного файлу,
+        тому будь-яка заміна pkl файлів дає нову версію без читання їх вмісту.
+
+        Args:
+            *paths (str): Шляхи до файлів моделей
+
+        Returns:
+            str: Версія артефактів (12 шістнадцяткових символів)
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        stat = os.stat(path)
+        name = os.path.basename(path)
+        digest.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()[:12]
+
+
+CLASSIFIERS = {
+    cls.__name__: cls for cls in (CompiledLinear, CompiledTrees, CompiledSVC)
+}
+
+
+def compiled_path(model_path: str) -> str:
+    """
+        Повертає шлях до директорії масивів скомпільованої моделі.
+
+        Масиви зберігаються поруч з pkl файлом моделі:
+        best_model_with_credit_history.pkl -> best_model_with_credit_history.arrays/
+
+        Args:
+            model_path (str): Шлях до pkl файлу моделі
+
+        Returns:
+            str: Шлях до директорії з масивами
+    """
+    return os.path.splitext(model_path)[0] + ".arrays"
+
+
+def save_compiled(compiled: CompiledPipeline, directory: str, source: str = None):
+    """
+        Зберігає скомпільовану модель як набір нестиснених .npy файлів.
+
+        Кожен масив записується окремим файлом, а параметри - у meta.json,
+        тому load_compiled може відкрити масиви через mmap без копіювання
+        в пам'ять процесу. Директорія замінюється атомарно.
+
+        Args:
+            compiled (CompiledPipeline): Скомпільована модель
+            directory (str): Цільова директорія (див. compiled_path)
+            source (str, optional): Версія pkl файлу, з якого зібрано масиви
+    """
+    parent = os.path.dirname(os.path.abspath(directory))
+    tmp_dir = tempfile.mkdtemp(dir=parent, prefix=".arrays-")
+
+    meta = {"source": source}
+    for part, component in (
+        ("preprocessor", compiled.preprocessor),
+        ("classifier", compiled.classifier),
+    ):
+        meta[part] = {
+            "type": type(component).__name__,
+            "params": component.params,
+            "arrays": sorted(component.arrays),
+        }
+        for name, array in component.arrays.items():
+            np.save(os.path.join(tmp_dir, f"{part}.{name}.npy"), np.asarray(array))
+
+    with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+        json.dump(meta, f)
+
+    old_dir = None
+    if os.path.exists(directory):
+        old_dir = tmp_dir + ".old"
+        os.replace(directory, old_dir)
+    os.replace(tmp_dir, directory)
+    if old_dir:
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+
+def load_compiled(directory: str, mmap_mode: str = "r", source: str = None):
+    """
+        Завантажує скомпільовану модель, збережену save_compiled.
+
+        З mmap_mode="r" масиви відображаються з page cache тільки для
+        читання, тому всі воркери gunicorn ділять одну фізичну копію вузлів
+        дерев та опорних векторів, а лічильники посилань Python не змінюють
+        ці сторінки.
+
+        Args:
+            directory (str): Директорія з масивами (див. compiled_path)
+            mmap_mode (str, optional): Режим np.load. За замовчуванням "r"
+            source (str, optional): Очікувана версія pkl файлу
+
+        Returns:
+            CompiledPipeline | None: Модель або None, якщо директорії немає
+                чи її зібрано з іншої версії pkl файлу
+    """
+    meta_path = os.path.join(directory, "meta.json")
+    if not os.path.exists(meta_path):
+        return None
+
+    with open(meta_path) as f:
+        meta = json.load(f)
+    if source is not None and meta.get("source") != source:
+        return None
+
+    def load_part(part):
+        arrays = {
+            name: np.load(
+                os.path.join(directory, f"{part}.{name}.npy"), mmap_mode=mmap_mode
+            )
+            for name in meta[part]["arrays"]
+        }
+        return arrays, meta[part]["params"]
+
+    preprocessor = CompiledPreprocessor(*load_part("preprocessor"))
+    classifier = CLASSIFIERS[meta["classifier"]["type"]](*load_part("classifier"))
+    return CompiledPipeline(preprocessor, classifier)
+
+
+def export_compiled(model_path: str, model=None) -> bool:
+    """
+        Компілює pkl модель і зберігає її масиви поруч з pkl файлом.
+
+        Args:
+            model_path (str): Шлях до pkl файлу моделі
+            model (Pipeline, optional): Уже завантажена модель з цього файлу
+
+        Returns:
+            bool: True, якщо масиви збережено, False, якщо модель не підтримується
+    """
+    if model is None:
+        model = joblib.load(model_path)
+    try:
+        compiled = compile_pipeline(model)
+    except ValueError:
+        return False
+
+    save_compiled(
+        compiled, compiled_path(model_path), source=artifact_version(model_path)
+    )
+    return True
+
+
+if __name__ == "__main__":
+    import sys
+
+    # python -m ml.compiled ml_data/*.pkl - масиви для вже навчених моделей
+    for path in sys.argv[1:]:
+        status = "saved" if export_compiled(path) else "not supported"
+        print(f"{compiled_path(path)}: {status}")
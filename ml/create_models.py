@@ -1,4 +1,5 @@
 import os
+import sys
 
 import pandas as pd
 import numpy as np
@@ -12,6 +13,11 @@ from sklearn.pipeline import Pipeline
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 csv_path = os.path.join(BASE_DIR, "loan_data.csv")
 
+sys.path.append(os.path.dirname(BASE_DIR))
+
+from ml.compiled import export_compiled
+from ml.registry import publish
+
 # ЗАВАНТАЖЕННЯ ДАНИХ
 df = pd.read_csv(csv_path)
 
@@ -432,12 +438,24 @@ model_without_path = os.path.join(models_dir, "best_model_without_credit_history
 joblib.dump(best_model_with, model_with_path)
 joblib.dump(best_model_without, model_without_path)
 
+# Нестиснені масиви скомпільованих моделей для mmap у воркерах
+compiled_with = export_compiled(model_with_path, best_model_with)
+compiled_without = export_compiled(model_without_path, best_model_without)
+
 print(f"Моделі збережені в: {models_dir}")
 
 
 print("Збережені файли:")
 print("   • best_model_with_credit_history.pkl")
 print("   • best_model_without_credit_history.pkl")
+if compiled_with:
+    print("   • best_model_with_credit_history.arrays/")
+if compiled_without:
+    print("   • best_model_without_credit_history.arrays/")
+
+# Нова незмінна версія в реєстрі - воркери підхоплять її без перезапуску
+model_version = publish(model_with_path, model_without_path)
+print(f"Активна версія моделей: {model_version}")
 
 print(f"\nНавчання завершено!")
 print(f"   Загальний час: {sum(r['Time'] for r in results_summary):.1f} секунд")
@@ -1,12 +1,30 @@
 from decimal import Decimal
 
+from .codes import CODES, encode
+
+# Поле форм Django -> колонка датасету ML моделі (loan_data.csv)
+FIELD_COLUMNS = {
+    "gender": "Gender",
+    "married": "Married",
+    "dependents": "Dependents",
+    "education": "Education",
+    "self_employed": "Self_Employed",
+    "applicant_income": "ApplicantIncome",
+    "coapplicant_income": "CoapplicantIncome",
+    "loan_amount": "LoanAmount",
+    "loan_amount_term": "Loan_Amount_Term",
+    "credit_history": "Credit_History",
+    "property_area": "Property_Area",
+}
+
 
 def transform_input(raw_data: dict) -> dict:
     """
         Перетворює вхідні дані з формату форм Django в формат для ML моделі.
 
         Функція виконує маппінг назв полів з snake_case (використовується у формах)
-        на назви колонок датасету ML моделі. Також конвертує Decimal значення в float.
+        на назви колонок датасету ML моделі. Також конвертує Decimal значення в float,
+        а рядкові значення категоріальних полів - у коди ml.codes.
 
         Args:
             raw_data (dict): Словник з даними у форматі форм Django
@@ -14,34 +32,24 @@ def transform_input(raw_data: dict) -> dict:
 
         Returns:
             dict: Словник з трансформованими назвами полів та значеннями
-                Приклад: {"Gender": "Male", "LoanAmount": 150000.0, ...}
+                Приклад: {"Gender": 1, "LoanAmount": 150000.0, ...}
 
         Note:
             - Ігнорує поля, які відсутні в маппінгу
             - Автоматично конвертує Decimal у float для сумісності з ML моделлю
+            - Категоріальні поля можуть бути передані як кодом, так і значенням
+              ("Male"); невідоме значення викликає ValueError
     """
-    mapping = {
-        "gender": "Gender",
-        "married": "Married",
-        "dependents": "Dependents",
-        "education": "Education",
-        "self_employed": "Self_Employed",
-        "applicant_income": "ApplicantIncome",
-        "coapplicant_income": "CoapplicantIncome",
-        "loan_amount": "LoanAmount",
-        "loan_amount_term": "Loan_Amount_Term",
-        "credit_history": "Credit_History",
-        "property_area": "Property_Area",
-    }
-
     transformed = {}
 
     for key, value in raw_data.items():
-        if key not in mapping:
+        if key not in FIELD_COLUMNS:
             continue
 
         if isinstance(value, Decimal):
             value = float(value)
-        transformed[mapping[key]] = value
+        elif isinstance(value, str) and key in CODES:
+            value = encode(key, value)
+        transformed[FIELD_COLUMNS[key]] = value
 
     return transformed
@@ -0,0 +1,387 @@
+"""
+    Клієнт та протокол локального сервера інференсу (див. ml.inference_server).
+
+    Кадр протоколу - 4 байти довжини тіла (big-endian) і тіло.
+
+    Запит:
+        opcode (uint8), mode (uint8, індекс у MODES), n_rows (uint32),
+        далі n_rows заявок по len(FEATURES) значень у порядку FEATURES.
+        Значення - байт типу і дані: NONE, FLOAT (float64), INT (int64)
+        або STR (uint16 довжина + utf-8).
+
+    Відповідь:
+        status (uint8), довжина версії (uint8), версія моделей (ascii), далі
+        при STATUS_OK - n_rows (uint32) і для кожної заявки пари
+        рішення (uint8) + ймовірність (float64): одна пара для PREDICT,
+        по одній на кожен режим MODES для PREDICT_ALL. При STATUS_ERROR -
+        текст помилки (utf-8).
+
+    Модуль не імпортує sklearn та pandas, тому веб-воркери в режимі
+    клієнта не завантажують ML бібліотеки.
+"""
+
+import os
+import socket
+import struct
+import threading
+from numbers import Integral, Real
+
+import numpy as np
+
+from .data_transform import transform_input
+
+# Порядок ознак заявки в кадрі (збігається з EnsemblePredictor.features_B)
+FEATURES = (
+    "Gender",
+    "Married",
+    "Dependents",
+    "Education",
+    "Self_Employed",
+    "ApplicantIncome",
+    "CoapplicantIncome",
+    "LoanAmount",
+    "Loan_Amount_Term",
+    "Credit_History",
+    "Property_Area",
+)
+MODES = ("mode1", "mode2", "mode3")
+
+OP_PREDICT = 1
+OP_PREDICT_ALL = 2
+OP_VERSION = 3
+
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+TAG_NONE = 0
+TAG_FLOAT = 1
+TAG_INT = 2
+TAG_STR = 3
+
+_LENGTH = struct.Struct("!I")
+_REQUEST = struct.Struct("!BBI")
+_RESPONSE = struct.Struct("!BB")
+_RESULT = struct.Struct("!Bd")
+_FLOAT = struct.Struct("!d")
+_INT = struct.Struct("!q")
+_STR = struct.Struct("!H")
+
+
+class InferenceError(RuntimeError):
+    """
+        Помилка, повернута сервером інференсу.
+    """
+
+
+def read_frame(sock: socket.socket):
+    """
+        Читає один кадр із сокета.
+
+        Args:
+            sock (socket.socket): З'єднаний сокет
+
+        Returns:
+            bytes | None: Тіло кадру або None, якщо з'єднання закрито
+    """
+    header = _read_exact(sock, _LENGTH.size)
+    if header is None:
+        return None
+    body = _read_exact(sock, _LENGTH.unpack(header)[0])
+    if body is None:
+        raise ConnectionError("Connection closed in the middle of a frame")
+    return body
+
+
+def _read_exact(sock: socket.socket, size: int):
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def write_frame(sock: socket.socket, body: bytes):
+    """
+        Надсилає тіло кадру з префіксом довжини.
+
+        Args:
+            sock (socket.socket): З'єднаний сокет
+            body (bytes): Тіло кадру
+    """
+    sock.sendall(_LENGTH.pack(len(body)) + body)
+
+
+def encode_request(opcode: int, mode: str, rows: list) -> bytes:
+    """
+        Кодує запит із трансформованими заявками.
+
+        Args:
+            opcode (int): OP_PREDICT, OP_PREDICT_ALL або OP_VERSION
+            mode (str): Режим прогнозування з MODES
+            rows (list): Трансформовані заявки (transform_input)
+
+        Returns:
+            bytes: Тіло кадру запиту
+
+        Raises:
+            TypeError: Якщо значення ознаки має непідтримуваний тип
+    """
+    out = bytearray(_REQUEST.pack(opcode, MODES.index(mode), len(rows)))
+    for row in rows:
+        for feature in FEATURES:
+            value = row.get(feature)
+            if value is None:
+                out.append(TAG_NONE)
+            elif isinstance(value, str):
+                data = value.encode()
+                out.append(TAG_STR)
+                out += _STR.pack(len(data)) + data
+            elif isinstance(value, Integral):
+                out.append(TAG_INT)
+                out += _INT.pack(int(value))
+            elif isinstance(value, Real):
+                out.append(TAG_FLOAT)
+                out += _FLOAT.pack(float(value))
+            else:
+                raise TypeError(f"Unsupported value for {feature}: {value!r}")
+    return bytes(out)
+
+
+def decode_request(body: bytes) -> tuple:
+    """
+        Декодує запит, закодований encode_request.
+
+        Args:
+            body (bytes): Тіло кадру запиту
+
+        Returns:
+            tuple: (opcode, режим, список заявок-словників)
+    """
+    opcode, mode_index, n_rows = _REQUEST.unpack_from(body)
+    offset = _REQUEST.size
+    rows = []
+    for _ in range(n_rows):
+        row = {}
+        for feature in FEATURES:
+            tag = body[offset]
+            offset += 1
+            if tag == TAG_NONE:
+                value = None
+            elif tag == TAG_FLOAT:
+                value = _FLOAT.unpack_from(body, offset)[0]
+                offset += _FLOAT.size
+            elif tag == TAG_INT:
+                value = _INT.unpack_from(body, offset)[0]
+                offset += _INT.size
+            elif tag == TAG_STR:
+                size = _STR.unpack_from(body, offset)[0]
+                offset += _STR.size
+                value = body[offset:offset + size].decode()
+                offset += size
+            else:
+                raise ValueError(f"Unknown value tag {tag}")
+            row[feature] = value
+        rows.append(row)
+    return opcode, MODES[mode_index], rows
+
+
+def encode_response(version: str, results=None, error: str = None) -> bytes:
+    """
+        Кодує відповідь сервера.
+
+        Args:
+            version (str): Версія моделей, якою оцінено запит
+            results (list, optional): Для кожної заявки список пар (рішення, ймовірність)
+            error (str, optional): Текст помилки замість результатів
+
+        Returns:
+            bytes: Тіло кадру відповіді
+    """
+    version_bytes = (version or "").encode()
+    if error is not None:
+        return (
+            _RESPONSE.pack(STATUS_ERROR, len(version_bytes))
+            + version_bytes
+            + error.encode()
+        )
+
+    out = bytearray(_RESPONSE.pack(STATUS_OK, len(version_bytes)) + version_bytes)
+    out += _LENGTH.pack(len(results))
+    for pairs in results:
+        for pred, prob in pairs:
+            out += _RESULT.pack(pred, prob)
+    return bytes(out)
+
+
+def decode_response(body: bytes, pairs_per_row: int) -> tuple:
+    """
+        Декодує відповідь сервера.
+
+        Args:
+            body (bytes): Тіло кадру відповіді
+            pairs_per_row (int): Кількість пар (рішення, ймовірність) на заявку
+
+        Returns:
+            tuple: (версія моделей, масив рішень, масив ймовірностей) - масиви
+                форми (n_rows, pairs_per_row)
+
+        Raises:
+            InferenceError: Якщо сервер повернув помилку
+    """
+    status, version_size = _RESPONSE.unpack_from(body)
+    offset = _RESPONSE.size
+    version = body[offset:offset + version_size].decode()
+    offset += version_size
+    if status != STATUS_OK:
+        raise InferenceError(body[offset:].decode())
+
+    n_rows = _LENGTH.unpack_from(body, offset)[0]
+    offset += _LENGTH.size
+    values = np.frombuffer(
+        body,
+        dtype=[("pred", "u1"), ("prob", ">f8")],
+        count=n_rows * pairs_per_row,
+        offset=offset,
+    ).reshape(n_rows, pairs_per_row)
+    return version, values["pred"].astype(int), values["prob"].astype(float)
+
+
+class InferenceClient:
+    """
+        Тонкий клієнт сервера інференсу з інтерфейсом EnsemblePredictor.
+
+        Кожен потік кожного процесу має власне з'єднання з сервером. Заявки
+        трансформуються на боці клієнта, а моделі виконуються лише на сервері.
+
+        Attributes:
+            socket_path (str): Шлях до Unix сокета сервера
+            timeout (float): Таймаут операцій сокета в секундах
+            cache: Завжди None (кеш предиктора на клієнті не використовується)
+            remote (bool): Ознака клієнта сервера інференсу
+    """
+
+    cache = None
+    remote = True
+
+    def __init__(self, socket_path: str, timeout: float = 30.0):
+        """
+            Ініціалізує клієнт. З'єднання відкривається при першому запиті.
+
+            Args:
+                socket_path (str): Шлях до Unix сокета сервера
+                timeout (float, optional): Таймаут у секундах. За замовчуванням 30
+        """
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._version = None
+
+    @property
+    def version(self) -> str:
+        """
+            Версія моделей, якою оцінено останній запит поточного потоку.
+        """
+        version = getattr(self._local, "version", None)
+        if version is None:
+            version = self._version or self._call(OP_VERSION, MODES[0], [], 0)[0]
+        return version
+
+    def _connect(self) -> socket.socket:
+        sock = getattr(self._local, "sock", None)
+        if sock is not None and self._local.pid == os.getpid():
+            return sock
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self._local.sock = sock
+        self._local.pid = os.getpid()
+        return sock
+
+    def _close(self):
+        sock = getattr(self._local, "sock", None)
+        self._local.sock = None
+        if sock is not None:
+            sock.close()
+
+    def _call(self, opcode: int, method: str, rows: list, pairs_per_row: int) -> tuple:
+        """
+            Надсилає запит і повертає декодовану відповідь.
+
+            Якщо збережене з'єднання виявилося закритим (наприклад, сервер
+            перезапущено), запит повторюється один раз через нове з'єднання.
+        """
+        body = encode_request(opcode, method, rows)
+        for attempt in range(2):
+            try:
+                sock = self._connect()
+                write_frame(sock, body)
+                response = read_frame(sock)
+                if response is None:
+                    raise ConnectionError("Inference server closed the connection")
+                break
+            except OSError:
+                self._close()
+                if attempt:
+                    raise
+
+        result = decode_response(response, pairs_per_row)
+        self._local.version = self._version = result[0]
+        return result
+
+    @staticmethod
+    def _check_method(method: str):
+        if method not in MODES:
+            raise ValueError("Method must be one of: 'mode1', 'mode2', 'mode3'")
+
+    def predict(self, raw_data: dict, method: str = "mode3", all_modes: bool = False):
+        """
+            Виконує прогнозування однієї заявки на сервері.
+
+            Args:
+                raw_data (dict): Сирі дані заявки у форматі Django форм
+                method (str, optional): Метод прогнозування. За замовчуванням "mode3"
+                all_modes (bool, optional): Повернути результати всіх режимів
+
+            Returns:
+                int | dict: Як EnsemblePredictor.predict
+
+            Raises:
+                ValueError: Якщо method не є одним з: 'mode1', 'mode2', 'mode3'
+                InferenceError: Якщо сервер повернув помилку
+                OSError: Якщо сервер недоступний
+        """
+        self._check_method(method)
+        row = transform_input(raw_data)
+        if not all_modes:
+            _, preds, _ = self._call(OP_PREDICT, method, [row], 1)
+            return int(preds[0, 0])
+
+        _, preds, probs = self._call(OP_PREDICT_ALL, method, [row], len(MODES))
+        return {
+            mode: {"probability": float(probs[0, i]), "prediction": int(preds[0, i])}
+            for i, mode in enumerate(MODES)
+        }
+
+    def predict_batch(self, records: list, method: str = "mode3") -> tuple:
+        """
+            Виконує пакетне прогнозування на сервері.
+
+            Args:
+                records (list): Список сирих даних заявок
+                method (str, optional): Метод прогнозування. За замовчуванням "mode3"
+
+            Returns:
+                tuple: Масиви predictions (0/1) та probabilities
+
+            Raises:
+                ValueError: Якщо method не є одним з: 'mode1', 'mode2', 'mode3'
+                InferenceError: Якщо сервер повернув помилку
+        """
+        self._check_method(method)
+        rows = [transform_input(record) for record in records]
+        _, preds, probs = self._call(OP_PREDICT, method, rows, 1)
+        return preds[:, 0], probs[:, 0]
@@ -0,0 +1,206 @@
+"""
+    Локальний сервер інференсу, спільний для всіх воркерів gunicorn.
+
+    Один довгоживучий процес завантажує активну версію моделей з реєстру
+    (ml.registry) і оцінює заявки, що надходять через Unix сокет у
+    бінарному форматі ml.inference_client. Одиночні заявки від усіх
+    воркерів об'єднуються мікробатчером (ml.batching) в спільні пакети.
+    Сервер періодично перевіряє покажчик реєстру і підміняє моделі без
+    розриву з'єднань.
+
+    Usage:
+        python -m ml.inference_server --socket /run/ml/inference.sock
+
+    Веб-воркери використовують сервер, якщо задано INFERENCE_SOCKET
+    (див. ml.services.get_ensemble).
+"""
+
+import argparse
+import logging
+import os
+import socketserver
+import threading
+import time
+
+from . import registry
+from .batching import MicroBatcher
+from .data_transform import transform_input
+from .inference_client import (
+    MODES,
+    OP_PREDICT,
+    OP_PREDICT_ALL,
+    OP_VERSION,
+    decode_request,
+    encode_response,
+    read_frame,
+    write_frame,
+)
+from .prediction import EnsemblePredictor
+from .services import WARMUP_RECORD
+
+logger = logging.getLogger(__name__)
+
+
+class ModelHolder:
+    """
+        Тримає поточний предиктор і підміняє його при зміні версії в реєстрі.
+
+        Attributes:
+            predictor (EnsemblePredictor): Поточний предиктор
+            reload_interval (float): Інтервал перевірки покажчика в секундах
+    """
+
+    def __init__(self, reload_interval: float):
+        """
+            Завантажує активну версію моделей.
+
+            Args:
+                reload_interval (float): Інтервал перевірки покажчика (0 - не перевіряти)
+
+            Raises:
+                FileNotFoundError: Якщо файли моделей не знайдено
+        """
+        self.reload_interval = reload_interval
+        self.predictor = self._load(*registry.resolve())
+
+    @staticmethod
+    def _load(version, model_with_ch_path, model_without_ch_path):
+        predictor = EnsemblePredictor(
+            model_with_ch_path, model_without_ch_path, version=version
+        )
+        row = transform_input(WARMUP_RECORD)
+        for mode in MODES:
+            predictor.predict_rows([row], mode)
+        logger.info("Inference server loaded model version %s", predictor.version)
+        return predictor
+
+    def watch(self):
+        """
+            Перевіряє покажчик реєстру у фоновому потоці.
+        """
+        if self.reload_interval <= 0:
+            return
+        threading.Thread(target=self._watch, name="model-watch", daemon=True).start()
+
+    def _watch(self):
+        while True:
+            time.sleep(self.reload_interval)
+            try:
+                version, *paths = registry.resolve()
+                if version is not None and version != self.predictor.version:
+                    self.predictor = self._load(version, *paths)
+            except Exception:
+                logger.exception("Model version is not reloaded")
+
+
+class InferenceHandler(socketserver.BaseRequestHandler):
+    """
+        Обробляє кадри одного з'єднання, доки клієнт його не закриє.
+    """
+
+    def handle(self):
+        while True:
+            try:
+                body = read_frame(self.request)
+            except OSError:
+                return
+            if body is None:
+                return
+            write_frame(self.request, self.server.respond(body))
+
+
+class InferenceServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+        Unix-socket сервер інференсу з потоком на кожне з'єднання.
+
+        Attributes:
+            models (ModelHolder): Поточні моделі
+            batcher (MicroBatcher | None): Мікробатчер одиночних заявок
+    """
+
+    daemon_threads = True
+    # Кожен потік кожного воркера відкриває власне з'єднання
+    request_queue_size = 128
+
+    def __init__(self, socket_path: str, models: ModelHolder, batcher=None):
+        """
+            Створює сокет сервера, замінюючи застарілий файл сокета.
+
+            Args:
+                socket_path (str): Шлях до Unix сокета
+                models (ModelHolder): Поточні моделі
+                batcher (MicroBatcher, optional): Мікробатчер одиночних заявок
+        """
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        self.models = models
+        self.batcher = batcher
+        super().__init__(socket_path, InferenceHandler)
+
+    def respond(self, body: bytes) -> bytes:
+        """
+            Виконує запит і формує тіло відповіді.
+
+            Усі помилки повертаються клієнту як STATUS_ERROR, тому з'єднання
+            залишається відкритим.
+
+            Args:
+                body (bytes): Тіло кадру запиту
+
+            Returns:
+                bytes: Тіло кадру відповіді
+        """
+        predictor = self.models.predictor
+        try:
+            opcode, mode, rows = decode_request(body)
+            if opcode == OP_VERSION:
+                results = []
+            elif opcode == OP_PREDICT_ALL:
+                modes = predictor.predict_rows_all(rows)
+                results = [
+                    [(int(modes[m][0][i]), float(modes[m][1][i])) for m in MODES]
+                    for i in range(len(rows))
+                ]
+            elif opcode == OP_PREDICT and len(rows) == 1 and self.batcher:
+                results = [[self.batcher.predict_row(predictor, rows[0], mode)]]
+            elif opcode == OP_PREDICT:
+                preds, probs = predictor.predict_rows(rows, mode)
+                results = [[(int(p), float(q))] for p, q in zip(preds, probs)]
+            else:
+                raise ValueError(f"Unknown opcode {opcode}")
+        except Exception as e:
+            logger.exception("Inference request failed")
+            return encode_response(predictor.version, error=str(e))
+        return encode_response(predictor.version, results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local ML inference server")
+    parser.add_argument("--socket", required=True, help="Unix socket path")
+    parser.add_argument("--batch-wait-ms", type=float, default=2.0)
+    parser.add_argument("--batch-max-size", type=int, default=64)
+    parser.add_argument("--queue-size", type=int, default=4096)
+    parser.add_argument("--reload-interval", type=float, default=5.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(name)s - %(message)s",
+    )
+
+    models = ModelHolder(args.reload_interval)
+    models.watch()
+    batcher = None
+    if args.batch_wait_ms > 0:
+        batcher = MicroBatcher(
+            args.batch_max_size, args.batch_wait_ms / 1000, args.queue_size
+        )
+
+    with InferenceServer(args.socket, models, batcher) as server:
+        os.chmod(args.socket, 0o660)
+        logger.info("Inference server listening on %s", args.socket)
+        server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
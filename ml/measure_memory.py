@@ -0,0 +1,102 @@
+"""
+    Вимірювання пам'яті воркерів для різних способів завантаження моделей.
+
+    Запускає N процесів (як воркери gunicorn без --preload), кожен з яких
+    незалежно завантажує ансамбль і виконує прогнози. Коли всі воркери
+    готові, кожен читає свою пам'ять, і скрипт друкує середні значення:
+    приріст RSS та приватної пам'яті після завантаження моделей і PSS
+    воркера, коли всі воркери працюють одночасно.
+
+    Режими:
+        - pickle: sklearn моделі з pkl файлів у купі кожного процесу
+        - mmap: скомпільовані масиви (.arrays), відкриті через mmap
+
+    Usage:
+        python -m ml.measure_memory --workers 2 8 16
+"""
+
+import argparse
+import multiprocessing
+
+from ml.prediction import MODEL_WITH_CH, MODEL_WITHOUT_CH, EnsemblePredictor
+from ml.services import WARMUP_RECORD, memory_usage
+
+
+def _worker(mode: str, barrier, results):
+    before = memory_usage()
+    if mode == "pickle":
+        predictor = EnsemblePredictor(
+            MODEL_WITH_CH, MODEL_WITHOUT_CH, compile_models=False
+        )
+    else:
+        predictor = EnsemblePredictor(MODEL_WITH_CH, MODEL_WITHOUT_CH)
+
+    for method in ("mode1", "mode2", "mode3"):
+        predictor.predict(dict(WARMUP_RECORD), method=method)
+
+    barrier.wait()
+    after = memory_usage()
+    results.put(
+        {
+            "rss": after["rss"] - before["rss"],
+            "private": after.get("private", 0) - before.get("private", 0),
+            "pss": after.get("pss", 0),
+        }
+    )
+    barrier.wait()
+
+
+def measure(mode: str, workers: int) -> dict:
+    """
+        Запускає воркери в заданому режимі та усереднює приріст пам'яті.
+
+        Args:
+            mode (str): "pickle" або "mmap"
+            workers (int): Кількість процесів
+
+        Returns:
+            dict: Середні rss, private (приріст) та pss на воркер (МБ),
+                сумарний pss усіх воркерів
+    """
+    ctx = multiprocessing.get_context("fork")
+    barrier = ctx.Barrier(workers)
+    results = ctx.Queue()
+    processes = [
+        ctx.Process(target=_worker, args=(mode, barrier, results))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    samples = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    summary = {
+        name: sum(sample[name] for sample in samples) / workers
+        for name in samples[0]
+    }
+    summary["pss_total"] = summary["pss"] * workers
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1].strip())
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 8, 16])
+    args = parser.parse_args()
+
+    print(
+        f"{'mode':<8}{'workers':>8}{'+rss':>8}{'+private':>10}"
+        f"{'pss':>8}{'pss total':>11}"
+    )
+    for workers in args.workers:
+        for mode in ("pickle", "mmap"):
+            result = measure(mode, workers)
+            print(
+                f"{mode:<8}{workers:>8}{result['rss']:>8.1f}"
+                f"{result['private']:>10.1f}{result['pss']:>8.1f}"
+                f"{result['pss_total']:>11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
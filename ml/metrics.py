@@ -0,0 +1,285 @@
+import threading
+import time
+from contextlib import contextmanager
+
+# Межі кошиків гістограм затримок у секундах (від 50 мкс до 5 с)
+LATENCY_BUCKETS = (
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+
+
+# Усі метрики процесу у порядку створення (див. render)
+REGISTRY = []
+
+
+def label(name: str, value) -> str:
+    """
+        Формує пару мітки name="value" у текстовому форматі Prometheus.
+
+        Зворотна коса риска, лапки та перенесення рядка у значенні
+        екрануються, як вимагає формат.
+
+        Args:
+            name (str): Назва мітки
+            value: Значення мітки
+
+        Returns:
+            str: Пара мітки, наприклад 'alias="default"'
+    """
+    value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return f'{name}="{value}"'
+
+
+def _format_labels(pairs: list) -> str:
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """
+        Потокобезпечний лічильник Prometheus без міток.
+
+        Attributes:
+            name (str): Назва метрики
+            documentation (str): Опис метрики (рядок HELP)
+            value (float): Поточне значення
+    """
+
+    def __init__(self, name: str, documentation: str):
+        """
+            Ініціалізує лічильник з нульовим значенням та реєструє його.
+
+            Args:
+                name (str): Назва метрики
+                documentation (str): Опис метрики
+        """
+        self.name = name
+        self.documentation = documentation
+        self.value = 0
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def inc(self, amount: float = 1):
+        """
+            Збільшує значення лічильника.
+
+            Args:
+                amount (float, optional): Приріст. За замовчуванням 1
+        """
+        with self._lock:
+            self.value += amount
+
+    def render(self) -> list:
+        """
+            Формує рядки метрики у текстовому форматі Prometheus.
+
+            Returns:
+                list: Рядки HELP, TYPE та значення
+        """
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} counter",
+            f"{self.name} {self.value}",
+        ]
+
+
+class Histogram:
+    """
+        Потокобезпечна гістограма Prometheus з мітками.
+
+        Значення зберігаються в пам'яті процесу: кожен воркер gunicorn має
+        власні лічильники, які віддаються ендпоінтом метрик цього воркера.
+
+        Attributes:
+            name (str): Назва метрики
+            documentation (str): Опис метрики (рядок HELP)
+            label_names (tuple): Назви міток
+            buckets (tuple): Верхні межі кошиків у порядку зростання
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: tuple,
+        buckets: tuple = LATENCY_BUCKETS,
+    ):
+        """
+            Ініціалізує порожню гістограму та реєструє її.
+
+            Args:
+                name (str): Назва метрики
+                documentation (str): Опис метрики
+                label_names (tuple): Назви міток
+                buckets (tuple, optional): Верхні межі кошиків. За замовчуванням LATENCY_BUCKETS
+        """
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def observe(self, value: float, *labels: str):
+        """
+            Додає спостереження до серії з заданими значеннями міток.
+
+            Args:
+                value (float): Значення (для затримок - секунди)
+                *labels (str): Значення міток у порядку label_names
+        """
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * len(self.buckets), 0, 0.0]
+            counts = series[0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            series[1] += 1
+            series[2] += value
+
+    def render(self) -> list:
+        """
+            Формує рядки метрики у текстовому форматі Prometheus.
+
+            Returns:
+                list: Рядки HELP, TYPE та значення _bucket/_sum/_count
+        """
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            series = sorted(
+                (labels, list(counts), count, total)
+                for labels, (counts, count, total) in self._series.items()
+            )
+
+        for labels, counts, count, total in series:
+            pairs = [
+                label(name, value) for name, value in zip(self.label_names, labels)
+            ]
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = _format_labels(pairs + [label("le", bound)])
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            le = _format_labels(pairs + [label("le", "+Inf")])
+            lines.append(f"{self.name}_bucket{le} {count}")
+            joined = _format_labels(pairs)
+            lines.append(f"{self.name}_sum{joined} {total}")
+            lines.append(f"{self.name}_count{joined} {count}")
+        return lines
+
+
+STAGE_LATENCY = Histogram(
+    "prediction_stage_seconds",
+    "Latency of prediction request stages in seconds",
+    ("stage", "mode"),
+)
+
+
+@contextmanager
+def timed(stage: str, mode: str):
+    """
+        Вимірює тривалість блоку коду і записує її в STAGE_LATENCY.
+
+        Args:
+            stage (str): Назва етапу
+            mode (str): Режим прогнозування
+
+        Example:
+            >>> with timed("transform", "mode1"):
+            ...     data = transform_input(raw_data)
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_LATENCY.observe(time.perf_counter() - started, stage, mode)
+
+
+class StageTimer:
+    """
+        Послідовний таймер етапів одного запиту.
+
+        Кожен виклик mark фіксує час від попередньої позначки. Режим
+        прогнозування часто стає відомим лише посередині запиту, тому
+        тривалості записуються в STAGE_LATENCY одним викликом observe.
+
+        Example:
+            >>> timer = StageTimer()
+            >>> data = request.data
+            >>> timer.mark("parse")
+            >>> timer.observe("mode1")
+    """
+
+    def __init__(self):
+        self.started = self._last = time.perf_counter()
+        self.stages = []
+
+    def mark(self, stage: str):
+        """
+            Завершує етап stage, що тривав від попередньої позначки.
+
+            Args:
+                stage (str): Назва етапу
+        """
+        now = time.perf_counter()
+        self.stages.append((stage, now - self._last))
+        self._last = now
+
+    def observe(self, mode: str):
+        """
+            Записує тривалості всіх етапів та запиту загалом (етап "total").
+
+            Args:
+                mode (str): Режим прогнозування
+        """
+        for stage, seconds in self.stages:
+            STAGE_LATENCY.observe(seconds, stage, mode)
+        STAGE_LATENCY.observe(self._last - self.started, "total", mode)
+
+
+def register(collector):
+    """
+        Реєструє колектор метрик, який формує рядки під час render.
+
+        Args:
+            collector: Об'єкт з методом render() -> list рядків метрик
+
+        Returns:
+            Зареєстрований колектор
+    """
+    REGISTRY.append(collector)
+    return collector
+
+
+def render() -> str:
+    """
+        Повертає всі метрики у текстовому форматі Prometheus.
+
+        Returns:
+            str: Текст для ендпоінту метрик
+    """
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
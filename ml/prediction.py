@@ -1,8 +1,20 @@
 import pandas as pd
 import numpy as np
 import joblib
+import logging
 import os
+import threading
+from . import codes
+from .compiled import (
+    artifact_version,
+    compile_pipeline,
+    compiled_path,
+    load_compiled,
+)
 from .data_transform import transform_input
+from .metrics import timed
+
+logger = logging.getLogger(__name__)
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 MODEL_DIR = os.path.join(BASE_DIR, "ml_data")
@@ -10,6 +22,22 @@ MODEL_DIR = os.path.join(BASE_DIR, "ml_data")
 MODEL_WITH_CH = os.path.join(MODEL_DIR, "best_model_with_credit_history.pkl")
 MODEL_WITHOUT_CH = os.path.join(MODEL_DIR, "best_model_without_credit_history.pkl")
 
+# Пороги схвалення для кожного режиму прогнозування
+THRESHOLDS = {
+    "mode1": 0.5,
+    "mode2": 0.35,
+    "mode3": 0.5,
+}
+
+# Найбільший пакет, який оцінюється скомпільованими моделями. На більших
+# пакетах накладні витрати sklearn амортизуються і його Cython-обхід дерев
+# швидший за векторний обхід numpy.
+COMPILED_MAX_ROWS = 256
+
+# Коди категорій для інженерної ознаки Is_Graduate_and_Employed (див. ml.codes)
+GRADUATE = codes.encode("education", "Graduate")
+NOT_SELF_EMPLOYED = codes.encode("self_employed", "No")
+
 
 class EnsemblePredictor:
     """
@@ -25,8 +53,12 @@ class EnsemblePredictor:
             - mode3: Ансамбль обох моделей (усереднення ймовірностей, поріг 0.5)
 
         Attributes:
-            model_B: Завантажена ML модель з кредитною історією
-            model_A: Завантажена ML модель без кредитної історії
+            model_B: ML модель з кредитною історією (завантажується при першому зверненні)
+            model_A: ML модель без кредитної історії (завантажується при першому зверненні)
+            fast_B (CompiledPipeline | None): Скомпільована model_B або None
+            fast_A (CompiledPipeline | None): Скомпільована model_A або None
+            version (str): Версія завантажених артефактів моделей
+            cache (PredictionCache | None): Кеш результатів predict або None
             features_B (list): Список ознак для model_B (11 ознак)
             features_A (list): Список ознак для model_A (10 базових ознак)
 
@@ -34,13 +66,32 @@ class EnsemblePredictor:
             FileNotFoundError: Якщо файли моделей не знайдено за вказаними шляхами
     """
 
-    def __init__(self, model_with_ch_path: str, model_without_ch_path: str):
+    def __init__(
+        self,
+        model_with_ch_path: str,
+        model_without_ch_path: str,
+        compile_models: bool = True,
+        cache=None,
+        version: str = None,
+    ):
         """
             Ініціалізує EnsemblePredictor та завантажує ML моделі.
 
+            Якщо compile_models увімкнено, кожна модель компілюється в
+            CompiledPipeline (див. ml.compiled) і прогнозування виконується
+            на numpy без pandas. Якщо поруч з pkl файлом є актуальні масиви
+            скомпільованої моделі (див. compiled_path), вони відкриваються
+            через mmap, а sklearn модель не завантажується, доки вона не
+            знадобиться для великого пакету. Моделі, які не вдалося
+            скомпілювати, використовуються через sklearn.
+
             Args:
                 model_with_ch_path (str): Шлях до pkl файлу моделі з кредитною історією
                 model_without_ch_path (str): Шлях до pkl файлу моделі без кредитної історії
+                compile_models (bool, optional): Чи компілювати моделі. За замовчуванням True
+                cache (PredictionCache, optional): Кеш результатів predict. За замовчуванням вимкнено
+                version (str, optional): Назва версії моделей (див. ml.registry).
+                    За замовчуванням - хеш файлів моделей
 
             Raises:
                 FileNotFoundError: Якщо будь-який з файлів моделей не існує
@@ -50,8 +101,13 @@ class EnsemblePredictor:
         if not os.path.exists(model_without_ch_path):
             raise FileNotFoundError(f"Model not found: {model_without_ch_path}")
 
-        self.model_B = joblib.load(model_with_ch_path)
-        self.model_A = joblib.load(model_without_ch_path)
+        self.model_paths = {"B": model_with_ch_path, "A": model_without_ch_path}
+        self._models = {}
+        self._lock = threading.Lock()
+        self.version = version or artifact_version(
+            model_with_ch_path, model_without_ch_path
+        )
+        self.cache = cache
 
         self.features_B = [
             "Gender",
@@ -68,39 +124,193 @@ class EnsemblePredictor:
         ]
         self.features_A = [f for f in self.features_B if f != "Credit_History"]
 
-    def _prepare_features_A(self, data: dict) -> pd.DataFrame:
+        self.fast_B = self._load_fast("B") if compile_models else None
+        self.fast_A = self._load_fast("A") if compile_models else None
+
+    @property
+    def model_B(self):
+        return self._load_model("B")
+
+    @property
+    def model_A(self):
+        return self._load_model("A")
+
+    def _load_model(self, name: str):
+        """
+            Повертає sklearn модель, завантажуючи її при першому зверненні.
+
+            Args:
+                name (str): "A" або "B"
+
+            Returns:
+                Pipeline: Завантажена sklearn модель
+        """
+        model = self._models.get(name)
+        if model is None:
+            with self._lock:
+                model = self._models.get(name)
+                if model is None:
+                    model = joblib.load(self.model_paths[name])
+                    self._models[name] = model
+        return model
+
+    def _load_fast(self, name: str):
+        """
+            Повертає скомпільовану модель або None.
+
+            Спочатку відкриває через mmap масиви, збережені поруч з pkl файлом
+            (ml/create_models.py), якщо вони зібрані з цієї ж версії файлу.
+            Інакше завантажує sklearn модель та компілює її в пам'яті.
+
+            Args:
+                name (str): "A" або "B"
+
+            Returns:
+                CompiledPipeline | None: Скомпільована модель або None, якщо
+                    структура моделі не підтримується компілятором
+        """
+        path = self.model_paths[name]
+        fast = load_compiled(compiled_path(path), source=artifact_version(path))
+        if fast is not None:
+            return fast
+
+        try:
+            return compile_pipeline(self._load_model(name))
+        except ValueError as e:
+            logger.warning("Model is not compiled, using sklearn: %s", e)
+            return None
+
+    def _build_columns(self, rows: list) -> dict:
+        """
+            Будує колонкове представлення базових ознак для пакету заявок.
+
+            Колонки збираються одразу цілими масивами numpy, тому вартість
+            побудови не залежить від кількості викликів pandas на кожен рядок.
+
+            Args:
+                rows (list): Список словників з трансформованими даними заявок
+
+            Returns:
+                dict: Назва ознаки features_B -> масив значень (по елементу на заявку)
+        """
+        return {
+            col: np.array([row.get(col) for row in rows]) for col in self.features_B
+        }
+
+    def _prepare_features_A(self, columns: dict) -> dict:
         """
             Підготовує ознаки для моделі A з додатковими інженерними ознаками.
 
-            Створює DataFrame з базовими ознаками та додає 4 нові розраховані ознаки:
+            Відбирає базові ознаки та додає 4 нові розраховані ознаки:
                 - Total_Income: Сумарний дохід заявника та співзаявника
                 - Income_to_Loan: Співвідношення доходу до суми кредиту
                 - Loan_per_Term: Сума кредиту на один місяць терміну
                 - Is_Graduate_and_Employed: Бінарна ознака (випускник і не самозайнятий)
 
             Args:
-                data (dict): Словник з трансформованими даними заявки
+                columns (dict): Колонки з базовими ознаками (див. _build_columns)
 
             Returns:
-                pd.DataFrame: DataFrame з базовими та додатковими ознаками для моделі A
+                dict: Колонки з базовими та додатковими ознаками для моделі A
         """
-        df = pd.DataFrame([data], columns=self.features_A)
+        df = {col: columns[col] for col in self.features_A}
 
         df["Total_Income"] = df["ApplicantIncome"] + df["CoapplicantIncome"]
         df["Income_to_Loan"] = df["Total_Income"] / (df["LoanAmount"] + 1)
         df["Loan_per_Term"] = df["LoanAmount"] / (df["Loan_Amount_Term"] + 1)
         df["Is_Graduate_and_Employed"] = np.where(
-            (df["Education"] == "Graduate") & (df["Self_Employed"] == "No"), 1, 0
+            (df["Education"] == GRADUATE) & (df["Self_Employed"] == NOT_SELF_EMPLOYED),
+            1,
+            0,
         )
 
         return df
 
-    def predict(self, raw_data: dict, method: str = "mode3") -> int:
+    def _score(self, name: str, columns: dict, mode: str = None) -> np.ndarray:
+        """
+            Повертає ймовірності схвалення однієї моделі для всіх рядків.
+
+            Використовує скомпільовану модель, якщо вона є і пакет не більший
+            за COMPILED_MAX_ROWS, інакше завантажує sklearn модель, будує
+            DataFrame (з кодів категорій - рядкові значення, див. ml.codes)
+            та викликає predict_proba.
+
+            Args:
+                name (str): Модель - "B" (з кредитною історією) або "A"
+                columns (dict): Колонки ознак для моделі
+                mode (str, optional): Режим прогнозування. Якщо задано, час
+                    виклику моделі записується в метрики як етап model_<name>
+
+            Returns:
+                np.ndarray: Ймовірності класу 1 для кожного рядка
+        """
+        if mode is not None:
+            with timed(f"model_{name}", mode):
+                return self._score(name, columns)
+
+        fast_model = self.fast_B if name == "B" else self.fast_A
+        n_rows = len(next(iter(columns.values())))
+        if fast_model is not None and n_rows <= COMPILED_MAX_ROWS:
+            return fast_model.predict_proba(columns)[:, 1]
+        model = self._load_model(name)
+        return model.predict_proba(pd.DataFrame(codes.decode_features(columns)))[:, 1]
+
+    def _predict_proba(
+        self, columns: dict, method: str, record: bool = False
+    ) -> np.ndarray:
+        """
+            Розраховує ймовірності схвалення для всіх рядків пакету.
+
+            Кожна потрібна модель викликається рівно один раз на весь пакет.
+
+            Args:
+                columns (dict): Колонки з базовими ознаками (див. _build_columns)
+                method (str): Метод прогнозування ("mode1", "mode2" або "mode3")
+                record (bool, optional): Чи записувати час кожної моделі в метрики
+
+            Returns:
+                np.ndarray: Ймовірності схвалення (клас 1) для кожного рядка
+        """
+        mode = method if record else None
+        if method == "mode1":
+            return self._score("B", columns, mode)
+        if method == "mode2":
+            return self._score("A", self._prepare_features_A(columns), mode)
+        return self._predict_all_proba(columns, mode)["mode3"]
+
+    def _predict_all_proba(self, columns: dict, mode: str = None) -> dict:
+        """
+            Розраховує ймовірності схвалення всіх режимів за один прохід.
+
+            Ознаки model_A виводяться з тих самих базових колонок, і кожна
+            модель викликається один раз, тому вартість дорівнює mode3.
+
+            Args:
+                columns (dict): Колонки з базовими ознаками (див. _build_columns)
+                mode (str, optional): Мітка режиму для метрик часу моделей
+
+            Returns:
+                dict: Ймовірності схвалення для кожного режиму ("mode1", "mode2", "mode3")
+        """
+        prob_A = self._score("A", self._prepare_features_A(columns), mode)
+        prob_B = self._score("B", columns, mode)
+        return {"mode1": prob_B, "mode2": prob_A, "mode3": (prob_A + prob_B) / 2}
+
+    def predict(self, raw_data: dict, method: str = "mode3", all_modes: bool = False):
         """
             Виконує прогнозування схвалення кредитної заявки.
 
             Трансформує вхідні дані, підготовує ознаки для моделей та повертає
             бінарне рішення (0 - відхилено, 1 - схвалено) залежно від обраного методу.
+            Якщо задано cache, повторні запити з тими самими ознаками, режимом
+            та версією моделей повертаються з кешу без виклику моделей.
+            Час етапів transform, frame, model_A та model_B записується в
+            метрики (див. ml.metrics).
+
+            Якщо all_modes=True, повертає результати всіх трьох режимів одразу:
+            базові ознаки будуються один раз, а кожна модель викликається
+            один раз, тобто запит коштує як один mode3. Дані мають містити
+            кредитну історію.
 
             Args:
                 raw_data (dict): Сирі дані заявки у форматі Django форм
@@ -108,11 +318,16 @@ class EnsemblePredictor:
                     - "mode1": Використовує тільки model_B (поріг 0.5)
                     - "mode2": Використовує тільки model_A (поріг 0.35)
                     - "mode3": Ансамбль обох моделей (поріг 0.5)
+                all_modes (bool, optional): Повернути результати всіх режимів.
+                    За замовчуванням False
 
             Returns:
                 int: Результат прогнозування (0 або 1)
                     - 0: Кредит відхилено
                     - 1: Кредит схвалено
+                dict: Якщо all_modes=True - ймовірність та рішення для кожного
+                    режиму, наприклад
+                    {"mode1": {"probability": 0.81, "prediction": 1}, ...}
 
             Raises:
                 ValueError: Якщо method не є одним з: 'mode1', 'mode2', 'mode3'
@@ -120,34 +335,122 @@ class EnsemblePredictor:
             Example:
                 >>> predictor = EnsemblePredictor(model_path1, model_path2)
                 >>> data = {
-                ...     "gender": "Male",
-                ...     "married": "Yes",
+                ...     "gender": 1,
+                ...     "married": 1,
                 ...     "loan_amount": 150000.0,
                 ...     ...
                 ... }
                 >>> result = predictor.predict(data, method="mode3")
                 >>> print(result)  # 1 або 0
+                >>> predictor.predict(data, all_modes=True)["mode2"]["prediction"]
+                0
         """
-        data = transform_input(raw_data)
+        if method not in THRESHOLDS:
+            raise ValueError("Method must be one of: 'mode1', 'mode2', 'mode3'")
 
-        df_B = pd.DataFrame([data], columns=self.features_B)
-        df_A = self._prepare_features_A(data)
+        # Результати всіх режимів мають окремі ключі кешу та мітку метрик
+        label = "all" if all_modes else method
+        with timed("transform", label):
+            data = transform_input(raw_data)
+        if self.cache is not None:
+            pred = self.cache.get(data, label, self.version)
+            if pred is not None:
+                return pred
 
-        if method == "mode1":
-            prob = self.model_B.predict_proba(df_B)[0][1]
-            pred = int(prob >= 0.5)
+        with timed("frame", label):
+            columns = self._build_columns([data])
+        if all_modes:
+            probs = self._predict_all_proba(columns, label)
+            pred = {
+                mode: {
+                    "probability": float(prob[0]),
+                    "prediction": int(prob[0] >= THRESHOLDS[mode]),
+                }
+                for mode, prob in probs.items()
+            }
+        else:
+            prob = self._predict_proba(columns, method, record=True)[0]
+            pred = int(prob >= THRESHOLDS[method])
 
-        elif method == "mode2":
-            prob = self.model_A.predict_proba(df_A)[0][1]
-            pred = int(prob >= 0.35)
+        if self.cache is not None:
+            self.cache.set(data, label, self.version, pred)
+        return pred
 
-        elif method == "mode3":
-            prob_A = self.model_A.predict_proba(df_A)[0][1]
-            prob_B = self.model_B.predict_proba(df_B)[0][1]
+    def predict_rows_all(self, rows: list) -> dict:
+        """
+            Виконує пакетне прогнозування всіх режимів для трансформованих заявок.
 
-            prob_final = (prob_A + prob_B) / 2
-            pred = int(prob_final >= 0.5)
-        else:
+            Кожна модель викликається один раз на весь пакет (див. predict
+            з all_modes=True).
+
+            Args:
+                rows (list): Список трансформованих даних заявок (transform_input)
+
+            Returns:
+                dict: Режим -> пара масивів (predictions, probabilities)
+        """
+        probs = self._predict_all_proba(self._build_columns(rows))
+        return {
+            mode: ((prob >= THRESHOLDS[mode]).astype(int), prob)
+            for mode, prob in probs.items()
+        }
+
+    def predict_batch(self, records: list, method: str = "mode3") -> tuple:
+        """
+            Виконує пакетне прогнозування для списку кредитних заявок.
+
+            Усі заявки трансформуються та збираються в одне колонкове
+            представлення на модель, після чого predict_proba кожної моделі
+            викликається один раз на весь пакет. Результати збігаються з
+            послідовними викликами predict для кожної заявки.
+
+            Args:
+                records (list): Список сирих даних заявок у форматі Django форм
+                method (str, optional): Метод прогнозування. За замовчуванням "mode3"
+
+            Returns:
+                tuple: Пара масивів numpy однакової довжини
+                    - predictions (np.ndarray): Рішення 0/1 для кожної заявки
+                    - probabilities (np.ndarray): Ймовірність схвалення для кожної заявки
+
+            Raises:
+                ValueError: Якщо method не є одним з: 'mode1', 'mode2', 'mode3'
+
+            Example:
+                >>> predictions, probabilities = predictor.predict_batch(
+                ...     [data1, data2, data3], method="mode1"
+                ... )
+                >>> predictions
+                array([1, 0, 1])
+        """
+        if method not in THRESHOLDS:
             raise ValueError("Method must be one of: 'mode1', 'mode2', 'mode3'")
 
-        return pred
+        rows = [transform_input(record) for record in records]
+        return self.predict_rows(rows, method)
+
+    def predict_rows(self, rows: list, method: str = "mode3") -> tuple:
+        """
+            Виконує пакетне прогнозування для вже трансформованих заявок.
+
+            Те саме, що predict_batch, але приймає результати transform_input,
+            тому трансформацію можна виконати заздалегідь (див. ml.batching).
+
+            Args:
+                rows (list): Список трансформованих даних заявок (transform_input)
+                method (str, optional): Метод прогнозування. За замовчуванням "mode3"
+
+            Returns:
+                tuple: Масиви predictions (0/1) та probabilities однакової довжини
+
+            Raises:
+                ValueError: Якщо method не є одним з: 'mode1', 'mode2', 'mode3'
+        """
+        if method not in THRESHOLDS:
+            raise ValueError("Method must be one of: 'mode1', 'mode2', 'mode3'")
+
+        if not rows:
+            return np.empty(0, dtype=int), np.empty(0, dtype=float)
+
+        probs = self._predict_proba(self._build_columns(rows), method)
+        return (probs >= THRESHOLDS[method]).astype(int), probs
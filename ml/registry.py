@@ -0,0 +1,210 @@
+"""
+    Версійований реєстр ML моделей у ml_data.
+
+    Структура:
+        ml_data/versions/<version>/best_model_with_credit_history.pkl
+        ml_data/versions/<version>/best_model_without_credit_history.pkl
+        ml_data/versions/<version>/*.arrays/  (див. ml.compiled)
+        ml_data/current                       (назва активної версії)
+
+    Директорії версій незмінні: нова версія спочатку повністю збирається
+    у тимчасовій директорії, а потім перейменовується. Покажчик current
+    замінюється атомарно через os.replace, тому воркери завжди бачать або
+    стару, або нову версію повністю.
+
+    Usage:
+        python -m ml.registry publish <with_ch.pkl> <without_ch.pkl> [--version V]
+        python -m ml.registry activate <version>
+        python -m ml.registry list
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+from datetime import datetime
+
+from .compiled import artifact_version, export_compiled
+from .prediction import MODEL_DIR, MODEL_WITH_CH, MODEL_WITHOUT_CH
+
+VERSIONS_DIR = os.path.join(MODEL_DIR, "versions")
+CURRENT_FILE = os.path.join(MODEL_DIR, "current")
+CURRENT_FILE_MODE = 0o644
+
+MODEL_FILES = (os.path.basename(MODEL_WITH_CH), os.path.basename(MODEL_WITHOUT_CH))
+
+
+def current_version():
+    """
+        Повертає назву активної версії з покажчика current.
+
+        Returns:
+            str | None: Назва версії або None, якщо реєстр ще не створено
+    """
+    try:
+        with open(CURRENT_FILE) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def version_paths(version: str) -> tuple:
+    """
+        Повертає шляхи до файлів моделей версії.
+
+        Args:
+            version (str): Назва версії
+
+        Returns:
+            tuple: (шлях до моделі з кредитною історією, шлях до моделі без неї)
+    """
+    directory = os.path.join(VERSIONS_DIR, version)
+    return tuple(os.path.join(directory, name) for name in MODEL_FILES)
+
+
+def resolve() -> tuple:
+    """
+        Визначає активну версію моделей та шляхи до її файлів.
+
+        Якщо покажчика current немає (моделі створено до появи реєстру),
+        використовуються файли безпосередньо в ml_data, а версією вважається
+        хеш цих файлів.
+
+        Returns:
+            tuple: (версія або None, шлях до моделі з кредитною історією,
+                шлях до моделі без неї)
+    """
+    version = current_version()
+    if version is not None:
+        return (version, *version_paths(version))
+
+    if os.path.exists(MODEL_WITH_CH) and os.path.exists(MODEL_WITHOUT_CH):
+        version = artifact_version(MODEL_WITH_CH, MODEL_WITHOUT_CH)
+    return version, MODEL_WITH_CH, MODEL_WITHOUT_CH
+
+
+def list_versions() -> list:
+    """
+        Повертає назви всіх опублікованих версій у порядку зростання.
+
+        Returns:
+            list: Назви версій
+    """
+    if not os.path.isdir(VERSIONS_DIR):
+        return []
+    return sorted(
+        name for name in os.listdir(VERSIONS_DIR) if not name.startswith(".")
+    )
+
+
+def activate(version: str):
+    """
+        Робить версію активною, атомарно замінюючи покажчик current.
+
+        Args:
+            version (str): Назва опублікованої версії
+
+        Raises:
+            FileNotFoundError: Якщо версія не опублікована
+    """
+    for path in version_paths(version):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Model not found: {path}")
+
+    fd, tmp_path = tempfile.mkstemp(dir=MODEL_DIR, prefix=".current-")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(version + "\n")
+        # mkstemp створює файл з правами 0600, а покажчик читають воркери,
+        # які можуть працювати від іншого користувача
+        os.chmod(tmp_path, CURRENT_FILE_MODE)
+        os.replace(tmp_path, CURRENT_FILE)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def publish(
+    model_with_ch_path: str,
+    model_without_ch_path: str,
+    version: str = None,
+    make_current: bool = True,
+) -> str:
+    """
+        Публікує пару моделей як нову незмінну версію реєстру.
+
+        Файли копіюються в тимчасову директорію разом зі скомпільованими
+        масивами, після чого директорія перейменовується у versions/<version>.
+
+        Args:
+            model_with_ch_path (str): pkl модель з кредитною історією
+            model_without_ch_path (str): pkl модель без кредитної історії
+            version (str, optional): Назва версії. За замовчуванням - час публікації
+            make_current (bool): Чи активувати версію одразу після публікації
+
+        Returns:
+            str: Назва опублікованої версії
+
+        Raises:
+            FileExistsError: Якщо версія з такою назвою вже існує
+    """
+    version = version or datetime.now().strftime("%Y%m%d-%H%M%S")
+    target = os.path.join(VERSIONS_DIR, version)
+    if os.path.exists(target):
+        raise FileExistsError(f"Model version already exists: {version}")
+
+    os.makedirs(VERSIONS_DIR, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=VERSIONS_DIR, prefix=".publish-")
+    try:
+        sources = (model_with_ch_path, model_without_ch_path)
+        for source, name in zip(sources, MODEL_FILES):
+            path = os.path.join(tmp_dir, name)
+            shutil.copy2(source, path)
+            export_compiled(path)
+        os.chmod(tmp_dir, 0o755)
+        os.rename(tmp_dir, target)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    if make_current:
+        activate(version)
+    return version
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ML model registry")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    publish_parser = commands.add_parser("publish")
+    publish_parser.add_argument("model_with_ch")
+    publish_parser.add_argument("model_without_ch")
+    publish_parser.add_argument("--version")
+    publish_parser.add_argument("--no-activate", action="store_true")
+
+    activate_parser = commands.add_parser("activate")
+    activate_parser.add_argument("version")
+
+    commands.add_parser("list")
+
+    args = parser.parse_args()
+    if args.command == "publish":
+        version = publish(
+            args.model_with_ch,
+            args.model_without_ch,
+            version=args.version,
+            make_current=not args.no_activate,
+        )
+        print(f"Published model version {version}")
+    elif args.command == "activate":
+        activate(args.version)
+        print(f"Active model version: {args.version}")
+    else:
+        active = current_version()
+        for version in list_versions():
+            print(f"{'*' if version == active else ' '} {version}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,357 @@
+import gc
+import logging
+import os
+import resource
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
 ensemble = None
+prediction_cache = None
+batcher = None
+
+# HTTP заголовок з версією моделей, якою отримано прогноз
+MODEL_VERSION_HEADER = "X-Model-Version"
+
+# Стан гарячого перезавантаження моделей (див. get_ensemble)
+_reload_lock = threading.Lock()
+_reload_checked_at = 0.0
+_reloading_version = None
+
+# Фіктивна заявка для прогріву моделей при старті сервера
+WARMUP_RECORD = {
+    "gender": "Male",
+    "married": "Yes",
+    "dependents": 0,
+    "education": "Graduate",
+    "self_employed": "No",
+    "applicant_income": 5000.0,
+    "coapplicant_income": 1500.0,
+    "loan_amount": 150.0,
+    "loan_amount_term": 360,
+    "credit_history": 1.0,
+    "property_area": "Urban",
+}
+
+
+def get_prediction_cache():
+    """
+        Повертає singleton кешу результатів прогнозування або None.
+
+        Кеш вмикається налаштуванням PREDICTION_CACHE_SIZE (кількість записів)
+        з часом життя PREDICTION_CACHE_TTL секунд. Якщо розмір дорівнює 0,
+        кеш вимкнено і функція повертає None. Статистика кешу віддається
+        ендпоінтом метрик (prediction_cache_*).
+
+        Returns:
+            PredictionCache | None: Кеш результатів predict або None
+    """
+    global prediction_cache
+    if prediction_cache is None:
+        from django.conf import settings
+        from ml import metrics
+        from ml.cache import PredictionCache, PredictionCacheMetrics
+
+        if settings.PREDICTION_CACHE_SIZE <= 0:
+            return None
+        prediction_cache = PredictionCache(
+            settings.PREDICTION_CACHE_SIZE, settings.PREDICTION_CACHE_TTL
+        )
+        metrics.register(PredictionCacheMetrics(prediction_cache))
+    return prediction_cache
+
+
+def _load_ensemble(version: str, model_with_ch_path: str, model_without_ch_path: str):
+    """
+        Створює EnsemblePredictor для версії моделей та прогріває його.
+
+        Кожен режим прогрівається одною заявкою (скомпільовані моделі) і
+        пакетом з COMPILED_MAX_ROWS + 1 заявок, тому sklearn моделі для
+        великих пакетів завантажуються тут, до gc.freeze() та fork воркерів
+        (див. preload_ensemble), а не окремо в кожному воркері.
+
+        Args:
+            version (str): Назва версії моделей
+            model_with_ch_path (str): Шлях до моделі з кредитною історією
+            model_without_ch_path (str): Шлях до моделі без кредитної історії
+
+        Returns:
+            EnsemblePredictor: Прогрітий предиктор
+    """
+    from ml.prediction import COMPILED_MAX_ROWS, THRESHOLDS, EnsemblePredictor
+
+    predictor = EnsemblePredictor(
+        model_with_ch_path,
+        model_without_ch_path,
+        cache=get_prediction_cache(),
+        version=version,
+    )
+    for mode in THRESHOLDS:
+        for size in (1, COMPILED_MAX_ROWS + 1):
+            predictor.predict_batch([WARMUP_RECORD] * size, mode)
+    return predictor
+
+
+def _reload_ensemble(version: str, model_with_ch_path: str, model_without_ch_path: str):
+    """
+        Завантажує нову версію моделей у фоновому потоці та підміняє ансамбль.
+
+        Запити, які вже отримали попередній предиктор, завершуються на ньому:
+        підміна лише змінює глобальне посилання. Якщо завантаження не вдалося,
+        продовжує працювати попередня версія.
+    """
+    global ensemble, _reloading_version
+    started = time.perf_counter()
+    try:
+        predictor = _load_ensemble(version, model_with_ch_path, model_without_ch_path)
+    except Exception:
+        logger.exception("Model version %s is not loaded", version)
+    else:
+        previous, ensemble = ensemble, predictor
+        logger.info(
+            "Model version %s loaded in pid %s in %.2fs (was %s)",
+            version,
+            os.getpid(),
+            time.perf_counter() - started,
+            previous.version if previous is not None else None,
+        )
+    finally:
+        with _reload_lock:
+            _reloading_version = None
+
+
+def _check_model_version():
+    """
+        Запускає фонове завантаження, якщо покажчик реєстру змінився.
+
+        Покажчик читається не частіше ніж раз на MODEL_RELOAD_INTERVAL секунд.
+    """
+    global _reload_checked_at, _reloading_version
+    from django.conf import settings
+    from ml import registry
+
+    interval = settings.MODEL_RELOAD_INTERVAL
+    now = time.monotonic()
+    if interval <= 0 or now - _reload_checked_at < interval:
+        return
+
+    with _reload_lock:
+        if now - _reload_checked_at < interval or _reloading_version is not None:
+            return
+        _reload_checked_at = now
+
+        version, *paths = registry.resolve()
+        if version is None or version == ensemble.version:
+            return
+        _reloading_version = version
+
+    threading.Thread(
+        target=_reload_ensemble,
+        args=(version, *paths),
+        name=f"model-reload-{version}",
+        daemon=True,
+    ).start()
 
 
 def get_ensemble():
     """
-        Повертає singleton екземпляр EnsemblePredictor для прогнозування.
+        Повертає поточний екземпляр EnsemblePredictor для прогнозування.
+
+        При першому виклику завантажує активну версію моделей з реєстру
+        (ml.registry) і зберігає її в глобальній змінній. Наступні виклики
+        повертають вже завантажений екземпляр і не частіше ніж раз на
+        MODEL_RELOAD_INTERVAL секунд перевіряють покажчик current. Якщо
+        активна версія змінилася, нова пара моделей завантажується у
+        фоновому потоці, а до завершення завантаження повертається попередня.
 
-        Реалізує патерн Singleton для ефективного використання пам'яті.
-        При першому виклику завантажує ML моделі з диску та зберігає їх
-        в глобальній змінній. При наступних викликах повертає вже
-        завантажений екземпляр без повторного читання файлів.
+        Якщо задано INFERENCE_SOCKET, моделі в процесі не завантажуються:
+        повертається InferenceClient з тим самим інтерфейсом, який надсилає
+        заявки на сервер інференсу (ml.inference_server).
 
         Returns:
-            EnsemblePredictor: Ініціалізований екземпляр предиктора з
-                завантаженими ML моделями
+            EnsemblePredictor | InferenceClient: Ініціалізований екземпляр
+                предиктора з завантаженими ML моделями або клієнт сервера
+
+        Raises:
+            FileNotFoundError: Якщо файли моделей ще не створено
 
         Note:
             - Перший виклик може зайняти час через завантаження моделей
             - Наступні виклики повертають результат миттєво
-            - Моделі завантажуються з шляхів MODEL_WITH_CH та MODEL_WITHOUT_CH
+            - Версія моделей доступна як атрибут version предиктора
+            - Запит має використовувати один предиктор від початку до кінця,
+              тому результат слід зберегти в локальній змінній
+            - Якщо увімкнено кеш (див. get_prediction_cache), predict
+              повертає повторні результати з кешу
 
         Example:
             >>> predictor = get_ensemble()
             >>> result = predictor.predict(data, method="mode1")
+            >>> predictor.version
+            '20250101-120000'
     """
-    global ensemble
+    global ensemble, _reload_checked_at
     if ensemble is None:
-        from ml.prediction import EnsemblePredictor, MODEL_WITH_CH, MODEL_WITHOUT_CH
+        from django.conf import settings
+
+        if settings.INFERENCE_SOCKET:
+            from ml.inference_client import InferenceClient
+
+            ensemble = InferenceClient(settings.INFERENCE_SOCKET)
+            return ensemble
 
-        ensemble = EnsemblePredictor(MODEL_WITH_CH, MODEL_WITHOUT_CH)
+        from ml import registry
+
+        with _reload_lock:
+            if ensemble is None:
+                version, *paths = registry.resolve()
+                ensemble = _load_ensemble(version, *paths)
+                _reload_checked_at = time.monotonic()
+    elif not getattr(ensemble, "remote", False):
+        _check_model_version()
     return ensemble
+
+
+def get_batcher():
+    """
+        Повертає singleton мікробатчера запитів прогнозування або None.
+
+        Батчер вмикається налаштуванням PREDICTION_BATCH_WAIT_MS (максимальне
+        очікування в мілісекундах). Якщо воно дорівнює 0, кожен запит
+        оцінюється окремо і функція повертає None.
+
+        Returns:
+            MicroBatcher | None: Мікробатчер або None
+    """
+    global batcher
+    if batcher is None:
+        from django.conf import settings
+        from ml.batching import MicroBatcher
+
+        # З сервером інференсу заявки об'єднуються в пакети на сервері
+        if settings.PREDICTION_BATCH_WAIT_MS <= 0 or settings.INFERENCE_SOCKET:
+            return None
+        batcher = MicroBatcher(
+            settings.PREDICTION_BATCH_MAX_SIZE,
+            settings.PREDICTION_BATCH_WAIT_MS / 1000,
+            settings.PREDICTION_BATCH_QUEUE_SIZE,
+        )
+    return batcher
+
+
+def predict(predictor, raw_data: dict, method: str, all_modes: bool = False):
+    """
+        Прогнозує одну заявку, за можливості через мікробатчер.
+
+        Має той самий результат, що й predictor.predict. Прогноз усіх режимів
+        завжди виконується напряму.
+
+        Args:
+            predictor (EnsemblePredictor): Предиктор (див. get_ensemble)
+            raw_data (dict): Сирі дані заявки
+            method (str): Метод прогнозування
+            all_modes (bool, optional): Повернути результати всіх режимів
+
+        Returns:
+            int | dict: Результат прогнозування (див. EnsemblePredictor.predict)
+
+        Example:
+            >>> predictor = get_ensemble()
+            >>> predict(predictor, data, "mode1")
+            1
+    """
+    micro_batcher = get_batcher()
+    if micro_batcher is None or all_modes:
+        return predictor.predict(raw_data, method, all_modes)
+    return micro_batcher.predict(predictor, raw_data, method)
+
+
+def memory_usage() -> dict:
+    """
+        Повертає використання пам'яті поточним процесом у мегабайтах.
+
+        На Linux читає /proc/self/smaps_rollup: RSS - резидентна пам'ять,
+        PSS - пропорційна частка (спільні сторінки діляться між процесами),
+        shared - сторінки, спільні з іншими процесами (наприклад, після fork),
+        private - сторінки, що належать лише цьому процесу.
+        На інших системах повертає лише пікове RSS з getrusage.
+
+        Returns:
+            dict: Ключі rss, pss, shared, private (МБ); на інших системах лише rss
+    """
+    try:
+        fields = {}
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                if value.strip().endswith("kB"):
+                    fields[name] = int(value.split()[0]) / 1024
+        return {
+            "rss": fields["Rss"],
+            "pss": fields["Pss"],
+            "shared": fields["Shared_Clean"] + fields["Shared_Dirty"],
+            "private": fields["Private_Clean"] + fields["Private_Dirty"],
+        }
+    except (OSError, KeyError):
+        return {"rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}
+
+
+def preload_ensemble():
+    """
+        Завантажує та прогріває ансамбль моделей до fork воркерів gunicorn.
+
+        Викликається з core/wsgi.py, який при запуску gunicorn з --preload
+        імпортується в master-процесі. Моделі (скомпільовані та sklearn)
+        завантажуються один раз, кожен режим прогнозування виконується на
+        фіктивних заявках (див. _load_ensemble), після чого
+        gc.freeze() переносить усі створені об'єкти в постійне покоління GC.
+        Завдяки цьому воркери після fork ділять сторінки моделей copy-on-write
+        і збирач сміття не змінює їх лічильники.
+
+        Час завантаження та використання пам'яті логуються, щоб порівнювати
+        споживання пам'яті при різній кількості воркерів.
+
+        Returns:
+            EnsemblePredictor | None: Завантажений предиктор або None, якщо
+                файли моделей ще не створено чи використовується сервер інференсу
+    """
+    from django.conf import settings
+
+    if settings.INFERENCE_SOCKET:
+        # Моделі на сервері інференсу, але імпортовані бібліотеки все одно
+        # варто заморозити до fork
+        gc.collect()
+        gc.freeze()
+        logger.info("Models are served by %s, preload skipped", settings.INFERENCE_SOCKET)
+        return None
+
+    before = memory_usage()
+    started = time.perf_counter()
+
+    try:
+        predictor = get_ensemble()
+    except FileNotFoundError as e:
+        logger.warning("Models are not preloaded: %s", e)
+        return None
+    loaded = time.perf_counter()
+
+    gc.collect()
+    gc.freeze()
+
+    after = memory_usage()
+    # PSS та shared доступні лише на Linux (/proc/self/smaps_rollup)
+    shared = ""
+    if "pss" in after:
+        shared = f", pss {after['pss']:.1f} MB, shared {after['shared']:.1f} MB"
+    logger.info(
+        "Models %s preloaded in pid %s: load and warmup %.2fs, "
+        "rss %.1f MB (+%.1f MB for ML libraries and models)%s",
+        predictor.version,
+        os.getpid(),
+        loaded - started,
+        after["rss"],
+        after["rss"] - before["rss"],
+        shared,
+    )
+    return predictor